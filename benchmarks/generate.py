@@ -0,0 +1,110 @@
+"""
+Générateur d'inventaires synthétiques pour les mesures de performance.
+
+Exemple :
+    python -m benchmarks.generate inventaire.csv --rows 1000000 --categories 50 --malformed-rate 0.001
+"""
+import argparse
+import csv
+import random
+
+FIELDNAMES = ["name", "category", "price", "quantity"]
+SYLLABLES = [
+    "ba", "ca", "de", "fi", "go", "lu", "ma", "ne", "po", "ri", "sa", "to", "va", "zo",
+    "bri", "cho", "fla", "gre", "pla", "stro", "tra", "vel", "mon", "sel",
+]
+NAME_LENGTH_MIN = 3
+NAME_LENGTH_MAX = 120
+BATCH_SIZE = 10_000
+
+
+def make_name(rng, mean, stddev):
+    """Construit un nom de produit dont la longueur suit une loi normale N(mean, stddev) bornée."""
+    length = min(max(int(rng.gauss(mean, stddev)), NAME_LENGTH_MIN), NAME_LENGTH_MAX)
+    words = []
+    size = 0
+    while size < length:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))).capitalize()
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length].rstrip()
+
+
+def malformed_row(rng, row):
+    """Altère une ligne valide : prix ou quantité non numérique, colonne manquante ou en trop."""
+    kind = rng.randrange(4)
+    if kind == 0:
+        row[2] = "n/a"
+    elif kind == 1:
+        row[3] = "beaucoup"
+    elif kind == 2:
+        row = row[:3]
+    else:
+        row = row + ["colonne en trop"]
+    return row
+
+
+def iter_rows(rows, categories=20, name_mean=18, name_stddev=6, malformed_rate=0.0, seed=0):
+    """
+    Produit `rows` lignes (listes de chaînes) reproductibles pour une même graine.
+    - `categories` : nombre de catégories distinctes (cardinalité).
+    - `name_mean` / `name_stddev` : distribution de la longueur des noms.
+    - `malformed_rate` : proportion de lignes invalides.
+    """
+    rng = random.Random(seed)
+    category_names = [f"Catégorie {index}" for index in range(max(categories, 1))]
+    for _ in range(rows):
+        row = [
+            make_name(rng, name_mean, name_stddev),
+            rng.choice(category_names),
+            f"{rng.uniform(0.1, 500):.2f}",
+            str(rng.randint(0, 1000)),
+        ]
+        if malformed_rate and rng.random() < malformed_rate:
+            row = malformed_row(rng, row)
+        yield row
+
+
+def generate_inventory(path, rows, **options):
+    """Écrit un inventaire synthétique dans `path` (par lots de lignes) et retourne le nombre de lignes."""
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(FIELDNAMES)
+        batch = []
+        for row in iter_rows(rows, **options):
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                writer.writerows(batch)
+                batch.clear()
+        writer.writerows(batch)
+    return rows
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Génère un inventaire CSV synthétique.")
+    parser.add_argument("output", help="Chemin du fichier CSV à créer")
+    parser.add_argument("--rows", type=int, default=100_000, help="Nombre de lignes (ex. : 10000 à 50000000)")
+    parser.add_argument("--categories", type=int, default=20, help="Nombre de catégories distinctes")
+    parser.add_argument("--name-mean", type=float, default=18, help="Longueur moyenne des noms")
+    parser.add_argument("--name-stddev", type=float, default=6, help="Écart type de la longueur des noms")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Proportion de lignes invalides (0 à 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur aléatoire")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    generate_inventory(
+        args.output,
+        args.rows,
+        categories=args.categories,
+        name_mean=args.name_mean,
+        name_stddev=args.name_stddev,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+    print(f"{args.rows} lignes écrites dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Mesures de performance de consolidate_files, search_data et generate_report.
+
+Chaque scénario est exécuté dans un processus neuf (débit en lignes/s, durée, pic de mémoire résidente).
+Les résultats sont comparés à une référence JSON : un écart au-delà du seuil est signalé comme une régression.
+
+Exemples :
+    python -m benchmarks.run --rows 1000000 --save-baseline
+    python -m benchmarks.run --rows 1000000 --threshold 0.1
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from benchmarks.generate import generate_inventory  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WORKDIR = os.path.join(BENCH_DIR, "data")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+
+@contextlib.contextmanager
+def commerce(files):
+    """Instance de `Commerce` du scénario ; les lignes invalides éventuelles vont dans la quarantaine de `files`."""
+    from module_perso.csv_manager import Commerce
+
+    instance = Commerce(quarantine=files.get("quarantine"))
+    try:
+        yield instance
+    finally:
+        instance.close()
+
+
+def bench_consolidate(files, jobs):
+    with commerce(files) as instance:
+        instance.consolidate_files(files["parts"], "bench_consolidated.csv", jobs=jobs)
+    return files["rows"]
+
+
+def bench_search(files, jobs):
+    with commerce(files) as instance:
+        instance.search_data(files["inventory"], "ba", category="Catégorie 1", jobs=jobs)
+    return files["rows"]
+
+
+def bench_report(files, jobs):
+    with commerce(files) as instance:
+        instance.generate_report(files["inventory"], "bench_report.txt", summary=True, group_by="category", jobs=jobs)
+    return files["rows"]
+
+
+SCENARIOS = {
+    "consolidate": bench_consolidate,
+    "search": bench_search,
+    "report": bench_report,
+}
+
+
+def peak_rss_kb():
+    """Pic de mémoire résidente du processus courant, en Kio."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(name, files, output_dir, jobs=1):
+    """Exécute un scénario (sortie standard ignorée) et retourne ses mesures."""
+    from module_perso.csv_manager import CSVManager
+
+    CSVManager.OUTPUT_DIR = output_dir
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        rows = SCENARIOS[name](files, jobs)
+        wall = time.perf_counter() - start
+    return {"rows": rows, "wall_s": wall, "rows_per_s": rows / wall if wall else 0.0, "peak_rss_kb": peak_rss_kb()}
+
+
+def prepare(workdir, rows, categories, malformed_rate, seed):
+    """
+    Génère (ou réutilise) les fichiers d'entrée des scénarios.
+    Avec `malformed_rate`, les scénarios écrivent les lignes invalides dans un fichier de quarantaine du répertoire
+    de travail au lieu de s'interrompre.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    stem = f"inventory-{rows}-{categories}-{malformed_rate}-{seed}"
+    options = {"categories": categories, "malformed_rate": malformed_rate}
+    files = {"rows": rows, "inventory": os.path.join(workdir, f"{stem}.csv"), "parts": []}
+    if malformed_rate > 0:
+        files["quarantine"] = os.path.join(workdir, f"{stem}.quarantine.csv")
+    if not os.path.exists(files["inventory"]):
+        generate_inventory(files["inventory"], rows, seed=seed, **options)
+    for part in range(2):
+        path = os.path.join(workdir, f"{stem}.part{part}.csv")
+        if not os.path.exists(path):
+            generate_inventory(path, rows // 2 + (rows % 2 if part == 0 else 0), seed=seed + part + 1, **options)
+        files["parts"].append(path)
+    return files
+
+
+def run(scenarios, files, workdir, repeat=3, jobs=1):
+    """
+    Exécute chaque scénario `repeat` fois, chacune dans un processus neuf et avec un répertoire de sortie vide
+    (sans index ni cache des exécutions précédentes). Garde la meilleure durée et le plus haut pic de mémoire.
+    """
+    output_dir = os.path.join(workdir, "output")
+    results = {}
+    for name in scenarios:
+        runs = []
+        for _ in range(repeat):
+            shutil.rmtree(output_dir, ignore_errors=True)
+            os.makedirs(output_dir)
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                runs.append(executor.submit(measure, name, files, output_dir, jobs).result())
+        best = min(runs, key=lambda result: result["wall_s"])
+        results[name] = dict(best, peak_rss_kb=max(result["peak_rss_kb"] for result in runs))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Retourne la liste des régressions (débit plus faible ou mémoire plus élevée au-delà de `threshold`)."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        if result["rows_per_s"] < reference["rows_per_s"] * (1 - threshold):
+            regressions.append(
+                f"{name} : débit {result['rows_per_s']:.0f} lignes/s < référence {reference['rows_per_s']:.0f} lignes/s"
+            )
+        if result["peak_rss_kb"] > reference["peak_rss_kb"] * (1 + threshold):
+            regressions.append(
+                f"{name} : pic mémoire {result['peak_rss_kb']} Kio > référence {reference['peak_rss_kb']} Kio"
+            )
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Mesure les performances des commandes principales.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Nombre de lignes de l'inventaire généré")
+    parser.add_argument("--categories", type=int, default=20, help="Nombre de catégories distinctes")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Proportion de lignes invalides")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS), help="Scénarios à exécuter")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre d'exécutions par scénario (la meilleure est gardée)")
+    parser.add_argument("--jobs", type=int, default=1, help="Nombre de processus passé aux commandes (0 = tous les cœurs)")
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help="Répertoire des fichiers générés")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Fichier JSON de référence")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Écart toléré avant de signaler une régression (0.10 = 10 %%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistrer les résultats comme nouvelle référence")
+    parser.add_argument("--output", help="Fichier JSON où écrire les résultats de cette exécution")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    files = prepare(args.workdir, args.rows, args.categories, args.malformed_rate, args.seed)
+    results = run(args.scenarios, files, args.workdir, args.repeat, args.jobs)
+    report = {
+        "meta": {
+            "rows": args.rows,
+            "categories": args.categories,
+            "malformed_rate": args.malformed_rate,
+            "jobs": args.jobs,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+    for name, result in results.items():
+        print(f"{name:<12} {result['wall_s']:>9.3f} s {result['rows_per_s']:>12.0f} lignes/s {result['peak_rss_kb']:>10} Kio")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Référence enregistrée : {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Aucune référence : relancer avec --save-baseline pour en créer une.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    if baseline.get("meta", {}).get("rows") != args.rows:
+        print(f"Attention : la référence a été mesurée sur {baseline['meta'].get('rows')} lignes.")
+    regressions = compare(results, baseline.get("results", {}), args.threshold)
+    for regression in regressions:
+        print(f"RÉGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,100 @@
-from module_perso.parser import secluded_parser
-from module_perso.csv_manager import Commerce , CSVError
 import sys
-from module_perso.logging_config import configure_logging
-import logging
+
+if "--profile-startup" in sys.argv:
+    # Doit précéder les autres imports pour pouvoir les chronométrer
+    from module_perso.startup import profiler
+    profiler.start()
+else:
+    profiler = None
+
+from module_perso.parser import secluded_parser  # noqa: E402
+from module_perso.csv_manager import Commerce , CSVError  # noqa: E402
+from module_perso.logging_config import configure_logging  # noqa: E402
+from module_perso.metrics import instrument  # noqa: E402
+import logging  # noqa: E402
+from contextlib import nullcontext  # noqa: E402
+
+
+def _phase(name):
+    return profiler.phase(name) if profiler else nullcontext()
+
+
+def run_command(commerce, args):
+    """Exécute la sous-commande demandée."""
+    if args.command == "consolidate":
+        options = dict(
+            jobs=args.jobs, key=args.key, policy=args.merge_policy, memory_limit=args.memory_limit,
+            sort_by=args.sort_by, compress_level=args.compress_level, incremental=args.incremental,
+        )
+        if args.input:
+            commerce.consolidate_input(args.input, args.output, **options)
+        else:
+            commerce.consolidate_files(args.files, args.output, **options)
+    elif args.command == "search" and args.files:
+        commerce.search_files(
+            args.files, args.query, args.category, args.price_range,
+            jobs=args.jobs, output_format=args.format, limit=args.limit,
+            sort_by=args.sort_by, descending=args.desc, top=args.top, offset=args.offset, where=args.where,
+        )
+    elif args.command == "search" and args.queries_file:
+        commerce.search_batch(
+            args.file, args.queries_file, args.category, args.price_range,
+            jobs=1 if args.jobs is None else args.jobs, output_format=args.format, limit=args.limit,
+            sort_by=args.sort_by, descending=args.desc, top=args.top, offset=args.offset,
+        )
+    elif args.command == "search":
+        commerce.search_data(
+            args.file, args.query, args.category, args.price_range,
+            jobs=1 if args.jobs is None else args.jobs, output_format=args.format, limit=args.limit,
+            sort_by=args.sort_by, descending=args.desc, top=args.top, offset=args.offset, where=args.where,
+        )
+    elif args.command == "serve":
+        from module_perso.server import InventoryServer
+
+        InventoryServer(args.files, use_cache=args.cache).run(args.socket)
+    elif args.command == "report":
+        commerce.generate_report(
+            args.file, args.output, args.summary, group_by=args.group_by, jobs=args.jobs, incremental=args.incremental
+        )
 
 
 def main():
     """Point d'entrée principal du script."""
-    configure_logging()
-    parser = secluded_parser()
-    args = parser.parse_args()
+    with _phase("parser"):
+        parser = secluded_parser()
+        args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
+    if args.command == "search" and args.files and args.queries_file:
+        parser.error("--queries-file ne peut pas être combiné avec --files")
+    with _phase("logging"):
+        configure_logging(
+            args.log_level,
+            async_logging=args.async_logging,
+            sample_every=args.log_sample,
+            rate_limit=args.log_rate_limit,
+        )
     logging.info("Application démarrée")
-    commerce = Commerce()
+    with _phase("Commerce"):
+        commerce = Commerce(use_cache=args.cache, quarantine=args.quarantine)
+    if profiler:
+        profiler.stop()
+        profiler.report()
 
     try:
-        if args.command == "consolidate":
-            commerce.consolidate_files(args.files, args.output)
-        elif args.command == "search":
-            commerce.search_data(args.file, args.query, args.category, args.price_range)
-        elif args.command == "report":
-            commerce.generate_report(args.file, args.output, args.summary)
+        with instrument(args.stats, args.metrics_file, args.profile, args.trace_memory):
+            run_command(commerce, args)
     except CSVError as e:
         print(f"Erreur : {e}", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
         print(f"Erreur imprévue : {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        commerce.close()
 
 
 if __name__ == "__main__":
-    configure_logging()
     main()
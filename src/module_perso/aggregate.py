@@ -0,0 +1,167 @@
+from array import array
+import logging
+
+from module_perso.inventory import DictionaryColumn
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+# Nombre minimal de lignes par morceau pour justifier l'envoi à un processus de travail
+PARALLEL_MIN_CHUNK = 100_000
+
+# Indices de l'état d'un groupe : [nombre, somme/min/max de la quantité, somme/min/max de la valeur]
+_COUNT, _QTY_SUM, _QTY_MIN, _QTY_MAX, _VAL_SUM, _VAL_MIN, _VAL_MAX = range(7)
+
+
+class Aggregator:
+    """
+    Agrégateur en une seule passe.
+    - Regroupe les lignes par clé (ou en un seul groupe `None`).
+    - Calcule nombre, somme, minimum, maximum et moyenne de la quantité et de la valeur du stock.
+    - Les résultats partiels de plusieurs agrégateurs peuvent être fusionnés avec `merge`.
+    """
+
+    def __init__(self, group_by=None):
+        self.group_by = group_by
+        self.groups = {}
+
+    def add(self, key, price, quantity):
+        value = price * quantity
+        state = self.groups.get(key)
+        if state is None:
+            self.groups[key] = [1, quantity, quantity, quantity, value, value, value]
+            return
+        state[_COUNT] += 1
+        state[_QTY_SUM] += quantity
+        state[_VAL_SUM] += value
+        if quantity < state[_QTY_MIN]:
+            state[_QTY_MIN] = quantity
+        elif quantity > state[_QTY_MAX]:
+            state[_QTY_MAX] = quantity
+        if value < state[_VAL_MIN]:
+            state[_VAL_MIN] = value
+        elif value > state[_VAL_MAX]:
+            state[_VAL_MAX] = value
+
+    def update(self, keys, prices, quantities):
+        """Ajoute des colonnes entières ; `keys` vaut None pour un agrégat global."""
+        add = self.add
+        if keys is None:
+            for price, quantity in zip(prices, quantities):
+                add(None, price, quantity)
+        else:
+            for key, price, quantity in zip(keys, prices, quantities):
+                add(key, price, quantity)
+        return self
+
+    def merge(self, other):
+        """Fusionne les résultats partiels d'un autre agrégateur dans celui-ci."""
+        for key, theirs in other.groups.items():
+            mine = self.groups.get(key)
+            if mine is None:
+                self.groups[key] = list(theirs)
+                continue
+            mine[_COUNT] += theirs[_COUNT]
+            mine[_QTY_SUM] += theirs[_QTY_SUM]
+            mine[_VAL_SUM] += theirs[_VAL_SUM]
+            mine[_QTY_MIN] = min(mine[_QTY_MIN], theirs[_QTY_MIN])
+            mine[_QTY_MAX] = max(mine[_QTY_MAX], theirs[_QTY_MAX])
+            mine[_VAL_MIN] = min(mine[_VAL_MIN], theirs[_VAL_MIN])
+            mine[_VAL_MAX] = max(mine[_VAL_MAX], theirs[_VAL_MAX])
+        return self
+
+    def rename(self, mapping):
+        """Remplace les clés de groupe (par ex. codes de dictionnaire) par leurs valeurs."""
+        self.groups = {mapping[key]: state for key, state in self.groups.items()}
+        return self
+
+    def merge_state(self, key, state):
+        partial = Aggregator(self.group_by)
+        partial.groups[key] = state
+        return self.merge(partial)
+
+    def total(self):
+        """Retourne les statistiques globales, tous groupes confondus."""
+        total = Aggregator()
+        for state in self.groups.values():
+            total.merge_state(None, state)
+        return total.stats(None)
+
+    def stats(self, key):
+        """Retourne les statistiques d'un groupe sous forme de dictionnaire."""
+        state = self.groups.get(key)
+        if state is None:
+            return {"count": 0, "quantity": _summary(0, 0, None, None), "value": _summary(0, 0, None, None)}
+        return {
+            "count": state[_COUNT],
+            "quantity": _summary(state[_COUNT], state[_QTY_SUM], state[_QTY_MIN], state[_QTY_MAX]),
+            "value": _summary(state[_COUNT], state[_VAL_SUM], state[_VAL_MIN], state[_VAL_MAX]),
+        }
+
+    def results(self):
+        """Retourne les statistiques de chaque groupe, triées par clé."""
+        return {key: self.stats(key) for key in sorted(self.groups, key=lambda key: (key is None, str(key)))}
+
+
+def _summary(count, total, minimum, maximum):
+    return {"sum": total, "min": minimum, "max": maximum, "mean": total / count if count else None}
+
+
+def _slice(column, start, stop):
+    """Extrait un morceau de colonne transmissible à un processus de travail."""
+    if column is None:
+        return None
+    if isinstance(column, memoryview):
+        chunk = array(column.format)
+        chunk.frombytes(column[start:stop])
+        return chunk
+    return column[start:stop]
+
+
+def _aggregate_chunk(group_by, keys, prices, quantities):
+    """Agrège un morceau de colonnes dans un processus de travail."""
+    return Aggregator(group_by).update(keys, prices, quantities)
+
+
+def aggregate_inventory(inventory, group_by=None, jobs=1, min_chunk=PARALLEL_MIN_CHUNK):
+    """
+    Agrège un inventaire en colonnes en une seule passe.
+    Avec `jobs` > 1, l'inventaire est découpé en morceaux agrégés en parallèle puis fusionnés.
+    """
+    prices = inventory.column("price")
+    quantities = inventory.column("quantity")
+    keys = mapping = None
+    if group_by:
+        column = inventory.column(group_by)
+        if isinstance(column, DictionaryColumn):
+            # On regroupe sur les codes entiers, puis on les traduit en valeurs à la fin
+            keys, mapping = column.codes, column.values
+        else:
+            keys = column
+
+    size = len(inventory)
+    chunk = max(-(-size // max(jobs, 1)), min_chunk)
+    if jobs > 1 and size > chunk:
+        from concurrent.futures import ProcessPoolExecutor
+
+        logger.info("Agrégation parallèle de %s lignes avec %s processus", size, jobs)
+        aggregator = Aggregator(group_by)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(
+                    _aggregate_chunk,
+                    group_by,
+                    _slice(keys, start, start + chunk),
+                    _slice(prices, start, start + chunk),
+                    _slice(quantities, start, start + chunk),
+                )
+                for start in range(0, size, chunk)
+            ]
+            for future in futures:
+                aggregator.merge(future.result())
+    else:
+        aggregator = Aggregator(group_by).update(keys, prices, quantities)
+
+    if mapping is not None:
+        aggregator.rename(mapping)
+    return aggregator
@@ -0,0 +1,220 @@
+from array import array
+from bisect import bisect_left
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+
+from module_perso.index import sidecar_path
+from module_perso.inventory import DictionaryColumn, Inventory
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+MAGIC = b"INVCACHE"
+_LENGTH = struct.Struct("<Q")
+_ALIGNMENT = 8
+
+
+class StringTable:
+    """
+    Colonne de chaînes lue directement dans un tampon (table de décalages + blob UTF-8).
+    Les chaînes ne sont décodées qu'à l'accès.
+    """
+
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+
+    @staticmethod
+    def encode(values):
+        """Retourne les tableaux (décalages, blob) représentant `values`."""
+        offsets = array("Q", [0])
+        blob = bytearray()
+        for value in values:
+            blob += value.encode("utf-8")
+            offsets.append(len(blob))
+        return offsets, blob
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        offsets = self._offsets
+        return str(self._blob[offsets[index]:offsets[index + 1]], "utf-8")
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+
+class SparseTexts:
+    """
+    Textes d'origine des valeurs numériques non canoniques d'une colonne, relus depuis le cache :
+    identifiants de lignes triés et table de chaînes, consultés par recherche dichotomique.
+    """
+
+    def __init__(self, rows, texts):
+        self._rows = rows
+        self._texts = texts
+
+    def get(self, index, default=None):
+        position = bisect_left(self._rows, index)
+        if position < len(self._rows) and self._rows[position] == index:
+            return self._texts[position]
+        return default
+
+    def items(self):
+        return zip(self._rows, self._texts)
+
+    def __len__(self):
+        return len(self._rows)
+
+
+class BinaryCache:
+    """
+    Cache binaire d'un inventaire en colonnes, projetable en mémoire (mmap).
+    - Les colonnes numériques sont stockées telles quelles (largeur fixe) et relues sans copie.
+    - Les colonnes de chaînes sont stockées dans une table de chaînes.
+    - Le texte d'origine des nombres non canoniques (« 10.50 », « 05 »…) est stocké à part : un inventaire
+      relu depuis le cache produit exactement les mêmes lignes que le fichier CSV.
+    - Le cache n'est utilisé que si l'empreinte du CSV source (chemin, taille, date) est inchangée.
+    """
+
+    SUFFIX = ".inventory.cache"
+    VERSION = 2
+
+    def __init__(self, fingerprint, output_dir):
+        self.fingerprint = tuple(fingerprint)
+        self.path = sidecar_path(self.fingerprint, self.SUFFIX, output_dir)
+
+    def load(self):
+        """Charge l'inventaire depuis le cache ; retourne None si le cache est absent, périmé ou illisible."""
+        try:
+            with open(self.path, "rb") as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        except OSError as e:
+            logger.warning("Cache binaire illisible : %s (%s)", self.path, e)
+            return None
+
+        try:
+            view = memoryview(buffer)
+            if bytes(view[:len(MAGIC)]) != MAGIC:
+                raise ValueError("signature invalide")
+            (header_size,) = _LENGTH.unpack_from(view, len(MAGIC))
+            start = len(MAGIC) + _LENGTH.size
+            header = json.loads(bytes(view[start:start + header_size]).decode("utf-8"))
+        except (ValueError, struct.error) as e:
+            logger.warning("Cache binaire corrompu, il sera reconstruit : %s (%s)", self.path, e)
+            return None
+
+        if (
+            header.get("version") != self.VERSION
+            or header.get("byteorder") != sys.byteorder
+            or tuple(header.get("fingerprint") or ()) != self.fingerprint
+        ):
+            logger.info("Cache binaire périmé : %s", self.path)
+            return None
+
+        base = _align(start + header_size)
+
+        def section(spec):
+            offset, length, typecode = spec
+            return view[base + offset:base + offset + length].cast(typecode)
+
+        columns = {}
+        texts = {}
+        for name, spec in header["columns"].items():
+            if spec["kind"] == "numeric":
+                columns[name] = section(spec["data"])
+                if "texts" in spec:
+                    texts_spec = spec["texts"]
+                    strings = StringTable(section(texts_spec["offsets"]), section(texts_spec["blob"]))
+                    texts[name] = SparseTexts(section(texts_spec["rows"]), strings)
+            elif spec["kind"] == "dictionary":
+                values = StringTable(section(spec["offsets"]), section(spec["blob"]))
+                columns[name] = DictionaryColumn.from_parts(section(spec["codes"]), list(values))
+            else:
+                columns[name] = StringTable(section(spec["offsets"]), section(spec["blob"]))
+
+        inventory = Inventory.from_columns(header["fieldnames"], columns, header["rows"], texts)
+        inventory.source = self.fingerprint
+        inventory.buffer = buffer  # Garde la projection ouverte tant que l'inventaire existe
+        logger.info("Inventaire chargé depuis le cache binaire : %s", self.path)
+        return inventory
+
+    def save(self, inventory):
+        """Écrit l'inventaire dans le cache (fichier temporaire puis remplacement atomique)."""
+        sections = []
+        size = 0
+
+        def add_section(data, typecode):
+            nonlocal size
+            payload = data.tobytes() if isinstance(data, array) else bytes(data)
+            sections.append(payload)
+            spec = [size, len(payload), typecode]
+            size += _align(len(payload))
+            sections.append(b"\0" * (_align(len(payload)) - len(payload)))
+            return spec
+
+        columns = {}
+        for name in inventory.fieldnames:
+            column = inventory.column(name)
+            if isinstance(column, DictionaryColumn):
+                offsets, blob = StringTable.encode(column.values)
+                columns[name] = {
+                    "kind": "dictionary",
+                    "codes": add_section(array("I", column.codes), "I"),
+                    "offsets": add_section(offsets, "Q"),
+                    "blob": add_section(blob, "B"),
+                }
+            elif isinstance(column, (array, memoryview)):
+                typecode = column.typecode if isinstance(column, array) else column.format
+                columns[name] = {"kind": "numeric", "data": add_section(array(typecode, column), typecode)}
+                originals = sorted(inventory.texts(name).items())
+                if originals:
+                    offsets, blob = StringTable.encode(text for _, text in originals)
+                    columns[name]["texts"] = {
+                        "rows": add_section(array("Q", (row_id for row_id, _ in originals)), "Q"),
+                        "offsets": add_section(offsets, "Q"),
+                        "blob": add_section(blob, "B"),
+                    }
+            else:
+                offsets, blob = StringTable.encode(column)
+                columns[name] = {"kind": "strings", "offsets": add_section(offsets, "Q"), "blob": add_section(blob, "B")}
+
+        header = json.dumps({
+            "version": self.VERSION,
+            "byteorder": sys.byteorder,
+            "fingerprint": list(self.fingerprint),
+            "fieldnames": inventory.fieldnames,
+            "rows": len(inventory),
+            "columns": columns,
+        }).encode("utf-8")
+        start = len(MAGIC) + _LENGTH.size
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                file.write(MAGIC)
+                file.write(_LENGTH.pack(len(header)))
+                file.write(header)
+                file.write(b"\0" * (_align(start + len(header)) - start - len(header)))
+                for payload in sections:
+                    file.write(payload)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        logger.info("Cache binaire enregistré : %s", self.path)
+
+
+def _align(size):
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
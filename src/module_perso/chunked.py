@@ -0,0 +1,147 @@
+from array import array
+from collections import deque
+import csv
+import io
+import logging
+import mmap
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+# Taille minimale d'un morceau : en dessous, le coût des processus dépasse le gain
+MIN_CHUNK_BYTES = 8 * 1024 * 1024
+# Taille des blocs utilisés pour compter les guillemets (ou les sauts de ligne) sans copier tout le fichier
+_SCAN_BLOCK = 16 * 1024 * 1024
+
+
+def _count(buffer, start, stop, needle=b'"'):
+    count = 0
+    for position in range(start, stop, _SCAN_BLOCK):
+        count += buffer[position:min(position + _SCAN_BLOCK, stop)].count(needle)
+    return count
+
+
+def numbered_rows(reader, first_line=1):
+    """
+    Produit (numéro de ligne, enregistrement) pour chaque enregistrement non vide de `reader` (`csv.reader`).
+    Le numéro est celui de la première ligne physique de l'enregistrement : les lignes vides et les sauts
+    de ligne à l'intérieur des champs entre guillemets sont comptés. `first_line` est le numéro de la
+    première ligne lue par `reader`.
+    """
+    line = first_line + reader.line_num
+    for row in reader:
+        if row:
+            yield line, row
+        line = first_line + reader.line_num
+
+
+def _record_end(buffer, position, quotes_before):
+    """
+    Retourne la position suivant le premier saut de ligne à partir de `position` qui termine un
+    enregistrement, c'est-à-dire qui n'est pas à l'intérieur d'un champ entre guillemets.
+    `quotes_before` est le nombre de guillemets entre le début du fichier et `position`.
+    """
+    size = len(buffer)
+    while position < size:
+        newline = buffer.find(b"\n", position)
+        if newline < 0:
+            return size
+        quotes_before += _count(buffer, position, newline)
+        position = newline + 1
+        if quotes_before % 2 == 0:
+            return position
+    return size
+
+
+def find_boundaries(buffer, parts, min_chunk=None):
+    """
+    Découpe le contenu d'un CSV en morceaux d'enregistrements complets.
+    Retourne la liste des bornes [(début, fin), ...] des morceaux de données, en-tête exclu.
+    Les sauts de ligne à l'intérieur de champs entre guillemets ne sont jamais pris comme bornes.
+    """
+    min_chunk = MIN_CHUNK_BYTES if min_chunk is None else min_chunk
+    size = len(buffer)
+    header_end = _record_end(buffer, 0, 0)
+    if header_end >= size:
+        return []
+    step = max((size - header_end) // max(parts, 1), min_chunk, 1)
+
+    boundaries = []
+    start = header_end
+    quotes = _count(buffer, 0, header_end)
+    while start < size:
+        target = start + step
+        if target >= size:
+            boundaries.append((start, size))
+            break
+        quotes_at_target = quotes + _count(buffer, start, target)
+        end = _record_end(buffer, target, quotes_at_target)
+        boundaries.append((start, end))
+        quotes += _count(buffer, start, end)
+        start = end
+    return boundaries
+
+
+def parse_range(file_path, start, stop, first_line=1):
+    """
+    Analyse les enregistrements entre les octets `start` et `stop` (qui commencent à la ligne `first_line`).
+    Retourne le couple (numéros de ligne, lignes), voir `numbered_rows`.
+    """
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            text = buffer[start:stop].decode("utf-8")
+    lines, rows = array("Q"), []
+    for line, row in numbered_rows(csv.reader(io.StringIO(text, newline="")), first_line):
+        lines.append(line)
+        rows.append(row)
+    return lines, rows
+
+
+def plan(file_path, parts, min_chunk=None):
+    """
+    Retourne les morceaux [(début, fin, première ligne), ...] d'un fichier CSV non compressé (voir `find_boundaries`),
+    avec le numéro de la première ligne de chacun, à passer à `parse_range`.
+    """
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            chunks, line, position = [], 1, 0
+            for start, stop in find_boundaries(buffer, parts, min_chunk):
+                line += _count(buffer, position, start, b"\n")
+                chunks.append((start, stop, line))
+                position = start
+    return chunks
+
+
+def iter_chunks(file_path, jobs, min_chunk=None):
+    """
+    Analyse un gros fichier CSV en parallèle et produit ses lignes par morceaux, dans l'ordre d'origine,
+    sous forme de couples (numéros de ligne, lignes) (voir `parse_range`).
+    Le fichier est projeté en mémoire (mmap) pour trouver les bornes et le numéro de la première ligne
+    de chaque morceau ; chaque processus relit son morceau. Au plus `jobs` morceaux sont en cours
+    de traitement à la fois.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = plan(file_path, jobs * 4, min_chunk)
+    logger.info("Analyse parallèle de %s : %s morceaux, %s processus", file_path, len(chunks), jobs)
+
+    ranges = iter(chunks)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque(executor.submit(parse_range, file_path, *chunk) for chunk in _take(ranges, jobs))
+        try:
+            while pending:
+                future = pending.popleft()
+                for chunk in _take(ranges, 1):
+                    pending.append(executor.submit(parse_range, file_path, *chunk))
+                yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _take(iterator, count):
+    for _ in range(count):
+        item = next(iterator, None)
+        if item is None:
+            return
+        yield item
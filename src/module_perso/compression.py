@@ -0,0 +1,198 @@
+import io
+import logging
+import os
+import queue
+import threading
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+# Extensions reconnues et signatures (premiers octets) des formats compressés
+EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma", ".lzma": "lzma"}
+MAGIC = {b"\x1f\x8b": "gzip", b"BZh": "bz2", b"\xfd7zXZ\x00": "lzma"}
+# Niveaux acceptés (gzip : 0 à 9, bz2 : 1 à 9, lzma : préréglage 0 à 9) et niveau par défaut de chaque format
+LEVELS = {"gzip": range(10), "bz2": range(1, 10), "lzma": range(10)}
+DEFAULT_LEVELS = {"gzip": 6, "bz2": 9, "lzma": 6}
+BLOCK_SIZE = 256 * 1024  # Taille des blocs échangés avec le thread de (dé)compression
+QUEUE_DEPTH = 8  # Nombre maximal de blocs en attente entre les deux threads
+
+
+def detect(path):
+    """
+    Retourne le format de compression du fichier (gzip, bz2 ou lzma), ou None pour un fichier texte.
+    Le format est déduit de l'extension, sinon des premiers octets d'un fichier existant.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in EXTENSIONS:
+        return EXTENSIONS[extension]
+    try:
+        with open(path, "rb") as file:
+            head = file.read(6)
+    except OSError:
+        return None
+    for magic, compression in MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def check_level(path, level):
+    """
+    Vérifie que le niveau `level` est accepté par le format de compression du fichier `path` (déduit de l'extension).
+    Lève `ValueError` sinon ; sans effet pour un fichier non compressé ou sans niveau.
+    """
+    compression = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if compression is None or level is None:
+        return
+    levels = LEVELS[compression]
+    if level not in levels:
+        raise ValueError(f"Niveau de compression {level} invalide pour {compression} : {levels[0]} à {levels[-1]}")
+
+
+def _open_binary(path, mode, compression, level):
+    if compression == "gzip":
+        import gzip
+
+        return gzip.open(path, mode, compresslevel=level) if mode != "rb" else gzip.open(path, mode)
+    if compression == "bz2":
+        import bz2
+
+        return bz2.open(path, mode, compresslevel=level) if mode != "rb" else bz2.open(path, mode)
+    import lzma
+
+    if mode == "rb":
+        return lzma.open(path, mode)
+    # Extension .lzma : ancien format « lzma-alone » ; .xz : format xz
+    file_format = lzma.FORMAT_ALONE if path.lower().endswith(".lzma") else lzma.FORMAT_XZ
+    return lzma.open(path, mode, format=file_format, preset=level)
+
+
+def open_text(path, mode="r", level=None, threaded=True, buffering=-1):
+    """
+    Ouvre un fichier CSV en texte (UTF-8, sans traduction des fins de ligne), compressé ou non.
+    - En lecture (`mode="r"`), le format est détecté par `detect` ; en écriture (`mode="w"`) ou en ajout
+      (`mode="a"`, un nouveau flux compressé est alors ajouté à la suite du fichier), par l'extension.
+    - `level` : niveau de compression en écriture (par défaut `DEFAULT_LEVELS`).
+    - `buffering` : taille du tampon d'un fichier non compressé (voir `open`).
+    - Avec `threaded`, la (dé)compression s'exécute dans un thread dédié, par blocs, en parallèle
+      de l'analyse ou de la production des lignes (zlib, bz2 et lzma libèrent le GIL).
+    """
+    compression = detect(path) if mode == "r" else EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if compression is None:
+        return open(path, mode, buffering, encoding="utf-8", newline="")
+
+    check_level(path, level)
+    level = DEFAULT_LEVELS[compression] if level is None else level
+    logger.debug("Fichier %s : %s (%s)", "lu" if mode == "r" else "écrit", path, compression)
+    binary = _open_binary(path, mode + "b", compression, level)
+    if threaded:
+        if mode == "r":
+            binary = io.BufferedReader(ThreadedReader(binary), BLOCK_SIZE)
+        else:
+            binary = io.BufferedWriter(ThreadedWriter(binary), BLOCK_SIZE)
+    return io.TextIOWrapper(binary, encoding="utf-8", newline="")
+
+
+class ThreadedReader(io.RawIOBase):
+    """Flux binaire alimenté par un thread qui décompresse `source` par blocs dans une file bornée."""
+
+    def __init__(self, source):
+        super().__init__()
+        self._source = source
+        self._queue = queue.Queue(QUEUE_DEPTH)
+        self._stop = threading.Event()
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._fill, name="decompress", daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        try:
+            while not self._stop.is_set():
+                block = self._source.read(BLOCK_SIZE)
+                self._put(block)
+                if not block:
+                    return
+        except Exception as e:
+            self._put(OSError(f"Données compressées invalides ou tronquées : {e}"))
+
+    def _put(self, item):
+        # Attente interruptible : la lecture peut être abandonnée (fermeture) alors que la file est pleine
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self._pending:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._pending = memoryview(item)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+class ThreadedWriter(io.RawIOBase):
+    """Flux binaire dont les blocs sont compressés dans `target` par un thread dédié (file bornée)."""
+
+    def __init__(self, target):
+        super().__init__()
+        self._target = target
+        self._queue = queue.Queue(QUEUE_DEPTH)
+        self._error = None
+        self._thread = threading.Thread(target=self._drain, name="compress", daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        while True:
+            block = self._queue.get()
+            if block is None:
+                return
+            if self._error is None:
+                try:
+                    self._target.write(block)
+                except Exception as e:
+                    self._error = e  # Les blocs suivants sont ignorés ; l'erreur est relancée par l'appelant
+
+    def _check(self):
+        if self._error is not None:
+            raise OSError(f"Erreur lors de la compression : {self._error}")
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._check()
+        self._queue.put(bytes(data))
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+            try:
+                self._target.close()
+            finally:
+                super().close()
+            self._check()
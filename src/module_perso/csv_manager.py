@@ -1,6 +1,17 @@
 import csv
+import heapq
+import itertools
 import os
 import logging
+import sys
+from collections import deque
+from operator import itemgetter
+from module_perso import compression, paths
+from module_perso.aggregate import aggregate_inventory
+from module_perso.index import InventoryIndexes
+from module_perso.inventory import Inventory
+from module_perso.logging_config import PER_ROW
+from module_perso.metrics import metrics
 
 # Initialisation du logger
 logger = logging.getLogger(__name__)
@@ -21,11 +32,71 @@ class DataProcessingError(CSVError):
     pass
 
 
+def _row_to_dict(fieldnames, row):
+    """Convertit une ligne en dictionnaire avec la même sémantique que `csv.DictReader`."""
+    size = len(fieldnames)
+    if len(row) == size:
+        return dict(zip(fieldnames, row))
+    record = dict(zip(fieldnames, row))
+    if len(row) > size:
+        record[None] = row[size:]
+    else:
+        for key in fieldnames[len(row):]:
+            record[key] = None
+    return record
+
+
+def _check_rows(parse, rows, source, quarantine=None):
+    """
+    Valide chaque ligne brute `rows` (couples (numéro de ligne, valeurs), voir `chunked.numbered_rows`)
+    avec `parse` (méthode du schéma compilé de l'en-tête, voir `schema.Schema`).
+    Une ligne invalide est écrite dans `quarantine` et la lecture continue ; sans quarantaine,
+    elle lève `DataProcessingError` avec son numéro de ligne dans le fichier.
+    """
+    before = quarantine.count if quarantine is not None else 0
+    try:
+        for line, values in rows:
+            try:
+                yield parse(values)
+            except ValueError as e:
+                if quarantine is None:
+                    logger.error("Ligne %s invalide dans %s : %s", line, source, e)
+                    raise DataProcessingError(f"Ligne {line} invalide dans '{source}' : {e}")
+                quarantine.add(source, line, e, values)
+                metrics.add("rows_quarantined")
+    finally:
+        if quarantine is not None and quarantine.count > before and quarantine.path is not None:
+            quarantine.flush()
+            logger.warning(
+                "%s ligne(s) invalide(s) de %s mise(s) en quarantaine dans %s",
+                quarantine.count - before, source, quarantine.path,
+            )
+
+
+def _search_file(file_path, query, category, price_range, where, use_cache, sort_by, descending, keep, quarantine):
+    """
+    Recherche dans un fichier, dans un processus de travail : les filtres sont évalués sur place et seuls
+    les résultats (au plus `keep`) sont renvoyés, avec leur valeur de tri (ou None sans tri).
+    Avec `quarantine`, les lignes invalides sont écartées et renvoyées avec les résultats : couple
+    (résultats, lignes rejetées), voir `schema.Quarantine.records`.
+    """
+    from module_perso import ranking
+    from module_perso.schema import Quarantine
+
+    commerce = Commerce(use_cache)
+    commerce._quarantine = Quarantine() if quarantine else None
+    inventory = commerce.load(file_path, 1)
+    row_ids = commerce.select(commerce.iter_find(query, category, price_range, where), sort_by, descending, keep)
+    key = ranking.sort_key(inventory, sort_by) if sort_by else None
+    results = [(key(row_id) if key else None, inventory.row(row_id)) for row_id in row_ids]
+    return results, commerce._quarantine.records if quarantine else []
+
+
 class CSVManager:
     """Classe utilitaire pour gérer les opérations sur les fichiers CSV."""
 
-    INPUT_DIR = os.path.join(os.path.dirname(__file__), "input")
-    OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
+    INPUT_DIR = paths.INPUT_DIR
+    OUTPUT_DIR = paths.OUTPUT_DIR
 
     def __init__(self, file_name, is_output=False):
         """
@@ -35,25 +106,26 @@ class CSVManager:
         """
         self._file_path = None
 
-        if is_output:
-            self._file_path = os.path.join(self.OUTPUT_DIR, file_name)
-        else:
-            # Priorité à output pour la recherche
-            potential_paths = [
-                os.path.join(self.OUTPUT_DIR, file_name),
-                os.path.join(self.INPUT_DIR, file_name),
-            ]
-            for path in potential_paths:
-                if os.path.exists(path):
-                    self._file_path = path
-                    break
+        with metrics.stage("resolve"):
+            if is_output:
+                self._file_path = os.path.join(self.OUTPUT_DIR, file_name)
+            else:
+                # Priorité à output pour la recherche
+                potential_paths = [
+                    os.path.join(self.OUTPUT_DIR, file_name),
+                    os.path.join(self.INPUT_DIR, file_name),
+                ]
+                for path in potential_paths:
+                    if os.path.exists(path):
+                        self._file_path = path
+                        break
 
         if not self._file_path:
-            logger.error(f"Fichier introuvable : {file_name}")
+            logger.error("Fichier introuvable : %s", file_name)
             raise CSV_FileNotFoundError(
                 f"Le fichier '{file_name}' est introuvable dans les répertoires 'input' ou 'output'."
             )
-        logger.info(f"Fichier CSV initialisé : {self._file_path}")
+        logger.info("Fichier CSV initialisé : %s", self._file_path)
 
     @property
     def file_path(self):
@@ -62,149 +134,856 @@ class CSVManager:
     @file_path.setter
     def file_path(self, new_path):
         if not os.path.exists(new_path):
-            logger.error(f"Chemin de fichier introuvable : {new_path}")
+            logger.error("Chemin de fichier introuvable : %s", new_path)
             raise CSV_FileNotFoundError(f"nouveau chemin {new_path} introuvable.")
         self._file_path = new_path
-        logger.info(f"Chemin de fichier mis à jour : {self._file_path}")
+        logger.info("Chemin de fichier mis à jour : %s", self._file_path)
 
-    def read_csv(self):
-        """Lit un fichier CSV et retourne une liste de dictionnaires."""
+    def fingerprint(self):
+        """Retourne l'empreinte (chemin absolu, taille, date de modification) du fichier."""
+        stat = os.stat(self._file_path)
+        return os.path.abspath(self._file_path), stat.st_size, stat.st_mtime_ns
+
+    def read_header(self):
+        """Lit uniquement l'en-tête du fichier CSV et retourne la liste des colonnes."""
+        try:
+            with compression.open_text(self._file_path, threaded=False) as file:
+                header = next(csv.reader(file), None)
+        except (csv.Error, OSError, EOFError) as e:
+            logger.error("Erreur lors de la lecture de l'en-tête : %s", e)
+            raise DataProcessingError(f"Erreur lors de la lecture de l'en-tête : {e}")
+        if not header:
+            logger.warning("Le fichier CSV est vide ou invalide : %s", self._file_path)
+            raise DataProcessingError("Le fichier CSV est vide ou invalide.")
+        return header
+
+    def iter_csv(self, jobs=1):
+        """
+        Lit un fichier CSV ligne par ligne et produit chaque ligne sous forme de dictionnaire.
+        - Une seule ligne est gardée en mémoire à la fois.
+        - Avec `jobs` > 1, un gros fichier est découpé en morceaux analysés en parallèle (ordre conservé).
+        - Lève une erreur si le fichier ne contient aucune donnée.
+        """
+        return self._read(self._iter_records(jobs))
+
+    def iter_checked(self, jobs=1, quarantine=None, convert=True):
+        """
+        Comme `iter_csv`, mais chaque ligne est validée par le schéma compilé de l'en-tête, en une seule passe.
+        - Avec `convert`, les lignes sont produites sous forme de listes dont les valeurs numériques sont déjà
+          converties ; sinon les chaînes d'origine sont conservées.
+        - Une ligne invalide est écrite dans `quarantine` (`schema.Quarantine`) et la lecture continue ;
+          sans quarantaine, elle lève `DataProcessingError` avec son numéro de ligne.
+        """
+        from module_perso.schema import Schema
+
+        schema = Schema(self.read_header())
+        parse = schema.parse if convert else schema.check
+        return self._read(_check_rows(parse, self._iter_values(jobs), self._file_path, quarantine))
+
+    def _iter_split(self, jobs=1, quarantine=None):
+        """Comme `iter_checked`, mais produit des couples (valeurs converties, chaînes d'origine)."""
+        from module_perso.schema import Schema
+
+        schema = Schema(self.read_header())
+        return self._read(_check_rows(schema.split, self._iter_values(jobs), self._file_path, quarantine))
+
+    def _read(self, rows):
+        """Produit `rows` en mesurant l'analyse et en convertissant les erreurs de lecture en `DataProcessingError`."""
         try:
-            logger.debug(f"Lecture du fichier CSV : {self._file_path}")
-            with open(self._file_path, mode='r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                data = [row for row in reader]
-                if not data:  # Vérifie si le fichier est vide ou mal formé
-                    logger.warning(f"Le fichier CSV est vide ou invalide : {self._file_path}")
-                    raise csv.Error("Le fichier CSV est vide ou invalide.")
-                logger.info(f"Fichier CSV lu avec succès : {self._file_path}")
-                return data
-        except (csv.Error, KeyError) as e:
-            logger.error(f"Erreur lors de la lecture du fichier CSV : {e}")
+            logger.debug("Lecture en flux du fichier CSV : %s", self._file_path)
+            if metrics.enabled:
+                metrics.add("bytes_read", os.path.getsize(self._file_path))
+            empty = True
+            for row in metrics.timed("parse", rows, "rows_parsed"):
+                empty = False
+                yield row
+            if empty:  # Vérifie si le fichier est vide ou mal formé
+                logger.warning("Le fichier CSV est vide ou invalide : %s", self._file_path)
+                raise csv.Error("Le fichier CSV est vide ou invalide.")
+            logger.info("Fichier CSV lu avec succès : %s", self._file_path)
+        except (csv.Error, KeyError, OSError) as e:
+            logger.error("Erreur lors de la lecture du fichier CSV : %s", e)
             raise DataProcessingError(f"Erreur lors de la lecture du fichier CSV : {e}")
+        except CSVError:
+            raise
         except Exception as e:
-            logger.critical(f"Erreur inconnue lors de la lecture du fichier CSV : {e}")
+            logger.critical("Erreur inconnue lors de la lecture du fichier CSV : %s", e)
             raise DataProcessingError(f"Erreur inconnue : {e}")
 
+    def _iter_records(self, jobs):
+        fieldnames = self.read_header()
+        for _, row in self._iter_values(jobs):
+            yield _row_to_dict(fieldnames, row)
+
+    def _iter_values(self, jobs):
+        """
+        Produit les lignes de données brutes (listes de chaînes), sans l'en-tête ni les lignes vides,
+        avec le numéro de leur première ligne dans le fichier : couples (numéro de ligne, valeurs).
+        Un fichier compressé est décompressé en flux (dans un thread dédié) ; il n'est jamais découpé
+        en morceaux, ses décalages en octets ne correspondant pas à ceux du texte.
+        """
+        from module_perso import chunked
+
+        if (
+            jobs > 1
+            and os.path.getsize(self._file_path) >= 2 * chunked.MIN_CHUNK_BYTES
+            and compression.detect(self._file_path) is None
+        ):
+            for lines, rows in chunked.iter_chunks(self._file_path, jobs):
+                yield from zip(lines, rows)
+        else:
+            with compression.open_text(self._file_path) as file:
+                reader = csv.reader(file)
+                next(reader, None)
+                yield from chunked.numbered_rows(reader)
+
+    def read_csv(self):
+        """Lit un fichier CSV et retourne une liste de dictionnaires."""
+        return list(self.iter_csv())
+
+    def read_inventory(self, use_cache=False, jobs=1, quarantine=None):
+        """
+        Lit le fichier CSV dans un inventaire en colonnes typées.
+        Avec `use_cache`, l'inventaire est relu depuis le cache binaire si le fichier n'a pas changé,
+        sinon il est analysé (en parallèle si `jobs` > 1) puis enregistré dans le cache.
+        Les lignes invalides sont écrites dans `quarantine` (voir `iter_checked`) ; le cache n'est alors
+        pas enregistré, pour qu'une lecture suivante les signale de nouveau.
+        """
+        from module_perso.binary_cache import BinaryCache
+
+        fingerprint = self.fingerprint()
+        cache = BinaryCache(fingerprint, self.OUTPUT_DIR) if use_cache else None
+        if cache is not None:
+            with metrics.stage("cache"):
+                inventory = cache.load()
+            if inventory is not None:
+                return inventory
+
+        quarantined = quarantine.count if quarantine is not None else 0
+        with metrics.stage("convert"):
+            inventory = Inventory.from_values(self.read_header(), self._iter_split(jobs, quarantine))
+        inventory.source = fingerprint
+
+        if quarantine is not None and quarantine.count > quarantined:
+            cache = None
+        if cache is not None:
+            try:
+                with metrics.stage("cache"):
+                    cache.save(inventory)
+            except Exception as e:  # Le cache n'est qu'une optimisation : son échec n'interrompt pas la lecture
+                logger.warning("Impossible d'enregistrer le cache binaire : %s", e)
+        return inventory
+
+    def iter_rows(self, use_cache=False, jobs=1, quarantine=None):
+        """
+        Produit les lignes du fichier sous forme de dictionnaires.
+        Avec `use_cache`, les lignes sont relues depuis le cache binaire s'il est à jour (avec le texte
+        d'origine des nombres, les lignes sont identiques à celles du fichier) ;
+        sinon le fichier est lu en flux et validé (voir `iter_checked`), sans construire le cache.
+        """
+        if use_cache:
+            from module_perso.binary_cache import BinaryCache
+
+            with metrics.stage("cache"):
+                inventory = BinaryCache(self.fingerprint(), self.OUTPUT_DIR).load()
+            if inventory is not None:
+                return inventory.rows()
+        fieldnames = self.read_header()
+        return (dict(zip(fieldnames, values)) for values in self.iter_checked(jobs, quarantine, convert=False))
+
     @staticmethod
-    def write_csv(file_name, data, fieldnames, output_dir=None):
-        """Écrit une liste de dictionnaires dans un fichier CSV."""
+    def write_csv(file_name, data, fieldnames, output_dir=None, compress_level=None, append=False):
+        """
+        Écrit des dictionnaires dans un fichier CSV et retourne le nombre de lignes écrites.
+        - Un nom se terminant par .gz, .bz2 ou .xz produit un fichier compressé en flux
+          (niveau `compress_level`, voir `compression.open_text`).
+        - `data` peut être une liste ou un itérateur : les lignes sont écrites au fil de l'eau.
+        - Chaque ligne doit avoir exactement les colonnes `fieldnames` : la vérification se fait
+          pendant l'extraction des valeurs, sans parcours supplémentaire des colonnes.
+        - Les lignes sont préparées dans le thread appelant et écrites par lots depuis un thread dédié
+          (`pipeline.WriterThread`), dans un tampon de grande taille.
+        - Le fichier est écrit sous un nom temporaire, synchronisé sur disque puis renommé atomiquement :
+          un lecteur ne voit jamais de fichier partiel et, en cas d'erreur, l'ancien fichier reste intact.
+        - Avec `append`, les lignes sont ajoutées à la fin du fichier existant, sans en-tête ; en cas d'erreur,
+          le fichier est ramené à sa taille initiale.
+        """
+        from module_perso import pipeline
+
         output_dir = output_dir or CSVManager.OUTPUT_DIR
-        os.makedirs(output_dir, exist_ok=True)  # Crée le répertoire s'il n'existe pas
         output_path = os.path.join(output_dir, file_name)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)  # Crée le répertoire s'il n'existe pas
+        initial_size = os.path.getsize(output_path) if append else 0
+        target = output_path if append else pipeline.temporary_path(output_path)
+        fieldnames = list(fieldnames)
+        width = len(fieldnames)
+        values = itemgetter(*fieldnames) if width > 1 else lambda row: (row[fieldnames[0]],)
+        count = 0
         try:
-            logger.debug(f"Écriture dans le fichier CSV : {output_path}")
-            # Vérifie si les colonnes sont valides
-            for row in data:
-                missing_columns = [col for col in fieldnames if col not in row]
-                if missing_columns:
-                    logger.error(f"Colonnes manquantes : {missing_columns}")
-                    raise ValueError(f"Colonnes manquantes : {missing_columns}")
-
-            with open(output_path, mode='w', encoding='utf-8', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(data)
-                logger.info(f"Fichier CSV écrit avec succès : {output_path}")
+            logger.debug("Écriture dans le fichier CSV : %s", output_path)
+            with metrics.stage("write"):
+                mode = "a" if append else "w"
+                with compression.open_text(target, mode, compress_level, buffering=pipeline.WRITE_BUFFER) as file:
+                    if not append:
+                        csv.writer(file).writerow(fieldnames)
+                    with pipeline.WriterThread(file) as writer:
+                        batch = []
+                        for row in data:
+                            try:
+                                if len(row) != width:
+                                    raise KeyError
+                                batch.append(values(row))
+                            except KeyError:
+                                raise CSVManager._column_error(row, fieldnames)
+                            if len(batch) >= pipeline.BATCH_SIZE:
+                                writer.put(batch)
+                                count += len(batch)
+                                batch = []
+                        writer.put(batch)
+                        count += len(batch)
+                if append:
+                    pipeline.fsync(target)
+                else:
+                    pipeline.commit(target, output_path)
+            metrics.add("rows_written", count)
+            logger.info("Fichier CSV écrit avec succès : %s (%s lignes)", output_path, count)
+            return count
         except (ValueError, KeyError) as e:
-            logger.error(f"Erreur lors de l'écriture du fichier CSV : {e}")
+            CSVManager._remove_partial(target, initial_size)
+            logger.error("Erreur lors de l'écriture du fichier CSV : %s", e)
             raise DataProcessingError(f"Erreur lors de l'écriture du fichier CSV : {e}")
+        except CSVError:
+            CSVManager._remove_partial(target, initial_size)
+            raise
         except Exception as e:
-            logger.critical(f"Erreur inconnue lors de l'écriture du fichier CSV : {e}")
+            CSVManager._remove_partial(target, initial_size)
+            logger.critical("Erreur inconnue lors de l'écriture du fichier CSV : %s", e)
             raise DataProcessingError(f"Erreur inconnue : {e}")
 
+    @staticmethod
+    def _column_error(row, fieldnames):
+        """Décrit les colonnes manquantes ou en trop d'une ligne à écrire."""
+        missing_columns = [col for col in fieldnames if col not in row]
+        if missing_columns:
+            logger.error("Colonnes manquantes : %s", missing_columns)
+            return ValueError(f"Colonnes manquantes : {missing_columns}")
+        extra_columns = [col for col in row if col not in fieldnames]
+        logger.error("Colonnes inattendues : %s", extra_columns)
+        return ValueError(f"Colonnes inattendues : {extra_columns}")
+
+    @staticmethod
+    def _remove_partial(output_path, initial_size=0):
+        """Supprime un fichier de sortie incomplet après une erreur d'écriture (ou retire les lignes ajoutées)."""
+        if initial_size:
+            os.truncate(output_path, initial_size)
+            logger.debug("Lignes ajoutées retirées : %s", output_path)
+        elif os.path.exists(output_path):
+            os.remove(output_path)
+            logger.debug("Fichier incomplet supprimé : %s", output_path)
+
 
 class Commerce:
     """Classe principale pour gérer les opérations commerciales."""
 
-    def __init__(self):
-        self._data = []
+    def __init__(self, use_cache=False, quarantine=None):
+        """
+        - `use_cache` : relit les fichiers depuis le cache binaire s'il est à jour.
+        - `quarantine` : chemin du fichier CSV où écrire les lignes invalides (avec leur fichier et leur
+          numéro de ligne) ; la commande continue alors sans elles au lieu de s'interrompre.
+        """
+        from module_perso.schema import Quarantine
+
+        self._use_cache = use_cache
+        self._quarantine = Quarantine(quarantine) if quarantine else None
+        self._data = Inventory()
+        self._indexes = InventoryIndexes(self._data)
         logger.info("Classe Commerce initialisée")
 
+    def close(self):
+        """Ferme le fichier de quarantaine, s'il a été ouvert."""
+        if self._quarantine is not None:
+            self._quarantine.close()
+
     @property
     def data(self):
+        """Inventaire en colonnes actuellement chargé."""
         return self._data
 
     @data.setter
     def data(self, value):
-        if not isinstance(value, list):
-            logger.error("Les données doivent être une liste.")
-            raise ValueError("Les données doivent être une liste.")
+        if isinstance(value, list):
+            value = Inventory.from_rows(value)
+        if not isinstance(value, Inventory):
+            logger.error("Les données doivent être une liste ou un inventaire.")
+            raise ValueError("Les données doivent être une liste ou un inventaire.")
         self._data = value
+        self._indexes = InventoryIndexes(value)
         logger.debug("Données mises à jour.")
 
-    def consolidate_files(self, file_paths, output_file):
-        """Consolide plusieurs fichiers CSV en un seul fichier."""
-        logger.info("Consolidation des fichiers CSV")
-        consolidated_data = []
-        for file_path in file_paths:
-            manager = CSVManager(file_path)
-            file_data = manager.read_csv()
-            consolidated_data.extend(file_data)
+    def load(self, file_path, jobs=1, use_cache=None):
+        """
+        Charge un fichier CSV dans `data` ; les colonnes numériques sont converties une seule fois.
+        `use_cache` remplace, pour ce chargement, le réglage de l'instance.
+        """
+        use_cache = self._use_cache if use_cache is None else use_cache
+        self._data = CSVManager(file_path).read_inventory(use_cache, jobs or os.cpu_count() or 1, self._quarantine)
+        self._indexes = InventoryIndexes(self._data, CSVManager.OUTPUT_DIR)
+        logger.info("Inventaire chargé : %s lignes", len(self._data))
+        return self._data
 
-        if not consolidated_data:
+    def consolidate_files(
+        self, file_paths, output_file, jobs=1, key=None, policy="sum", memory_limit=None, sort_by=None, compress_level=None,
+        incremental=False,
+    ):
+        """
+        Consolide plusieurs fichiers CSV en un seul fichier.
+        - Les en-têtes sont comparés avant toute lecture des données.
+        - Les lignes sont lues et écrites en flux, sans charger les fichiers en mémoire.
+        - Avec `jobs` > 1, les fichiers sont analysés en parallèle dans un pool de processus, quel que soit
+          leur nombre ; seuls les gros fichiers y sont découpés en plusieurs morceaux (voir `_iter_parallel`),
+          de même qu'un fichier unique. L'ordre de sortie reste celui de `file_paths`.
+        - Avec `key` (colonnes, ex. « name,category »), les lignes de même clé sont fusionnées selon `policy`
+          (sum, last ou min-price) ; au-delà de `memory_limit` octets, la fusion se poursuit sur disque.
+        - Avec `sort_by` (colonnes, ex. « category,name »), le fichier consolidé est trié par tri externe
+          (runs de `memory_limit` octets au plus, fusionnés par tas), en une seule lecture des fichiers
+          (en parallèle avec `jobs`) ; les runs déjà dans l'ordre ne sont pas triés de nouveau.
+        - Les fichiers d'entrée peuvent être compressés (gzip, bz2, xz) ; le fichier consolidé l'est si son nom
+          se termine par .gz, .bz2, .xz ou .lzma (niveau `compress_level`, vérifié avant toute lecture).
+        - Avec `incremental`, un manifeste (voir `manifest.Manifest`) permet de n'ajouter au fichier consolidé
+          existant que les fichiers apparus depuis la consolidation précédente (incompatible avec `key` et `sort_by`).
+        """
+        logger.info("Consolidation des fichiers CSV")
+        try:
+            compression.check_level(output_file, compress_level)
+        except ValueError as e:
+            raise DataProcessingError(str(e))
+        managers = [CSVManager(file_path) for file_path in file_paths]
+        if not managers:
             logger.warning("Aucune donnée n'a été consolidée.")
             raise DataProcessingError("Aucune donnée n'a été consolidée.")
 
+        fieldnames = self._check_headers(managers)
+        append = False
+        if incremental:
+            from module_perso.manifest import Manifest
+
+            if key or sort_by:
+                raise DataProcessingError("La consolidation incrémentale est incompatible avec la fusion par clé et le tri.")
+            manifest = Manifest(os.path.join(CSVManager.OUTPUT_DIR, output_file)).load()
+            paths, reason = manifest.plan([manager.file_path for manager in managers], fieldnames)
+            if reason:
+                logger.info("Consolidation complète (%s)", reason)
+                manifest.reset()
+            elif not paths:
+                manifest.record([], fieldnames)
+                logger.info("Aucun nouveau fichier depuis la dernière consolidation : %s", output_file)
+                return
+            else:
+                logger.info("Consolidation incrémentale : %s nouveau(x) fichier(s)", len(paths))
+                managers = [manager for manager in managers if manager.file_path in paths]
+                append = True
+        jobs = jobs or os.cpu_count() or 1
+        if jobs > 1 and len(managers) > 1:
+            if metrics.enabled:
+                metrics.add("bytes_read", sum(os.path.getsize(manager.file_path) for manager in managers))
+            rows = metrics.timed("parse", self._iter_parallel(managers, fieldnames, jobs, self._quarantine), "rows_parsed")
+        else:
+            rows = itertools.chain.from_iterable(
+                manager.iter_rows(self._use_cache, jobs, self._quarantine) for manager in managers
+            )
+
+        if key:
+            from module_perso.external import KeyMerger
+
+            key = self._columns(key)
+            try:
+                merger = KeyMerger(fieldnames, key, policy, memory_limit)
+            except ValueError as e:
+                logger.error("Fusion par clé impossible : %s", e)
+                raise DataProcessingError(f"Fusion par clé impossible : {e}")
+            logger.info("Fusion des lignes par clé %s (politique %s)", key, policy)
+            rows = metrics.timed("merge", merger.merge(rows))
+
+        if sort_by:
+            from module_perso.external import ExternalSorter
+
+            sort_by = self._columns(sort_by)
+            try:
+                sorter = ExternalSorter(fieldnames, sort_by, memory_limit)
+            except ValueError as e:
+                logger.error("Tri impossible : %s", e)
+                raise DataProcessingError(f"Tri impossible : {e}")
+            logger.info("Tri du fichier consolidé par %s", sort_by)
+            rows = metrics.timed("sort", sorter.sort(rows))
+
         # Écrire le fichier consolidé
-        fieldnames = consolidated_data[0].keys() if consolidated_data else []
-        CSVManager.write_csv(output_file, consolidated_data, fieldnames)
-        logger.info(f"Fichiers consolidés avec succès : {file_paths} -> {output_file}")
-
-    def search_data(self, file_path, query, category=None, price_range=None):
-        """Recherche les données dans un fichier CSV."""
-        logger.info(f"Recherche des données : {query}")
-        manager = CSVManager(file_path)
-        data = manager.read_csv()
-
-        # Filtrer les données
-        results = [row for row in data if query.lower() in row['name'].lower()]
-        if category:
-            results = [row for row in results if row['category'].lower() == category.lower()]
-        if price_range:
-            min_price, max_price = map(float, price_range.split(','))
-            results = [
-                row for row in results
-                if min_price <= float(row['price']) <= max_price
-            ]
-
-        for result in results:
-            logger.debug(f"Résultat trouvé : {result}")
-            print(result)
-
-    def generate_report(self, file_path, output_file, summary=False):
-        """Génère un rapport récapitulatif dans le répertoire 'report'."""
+        CSVManager.write_csv(output_file, rows, fieldnames, compress_level=compress_level, append=append)
+        if incremental:
+            manifest.record([manager.file_path for manager in managers], fieldnames)
+        logger.info("Fichiers consolidés avec succès : %s -> %s", file_paths, output_file)
+
+    def consolidate_input(self, pattern, output_file, **options):
+        """
+        Consolide tous les fichiers CSV (compressés ou non) d'un répertoire, ou ceux dont le nom correspond
+        à un motif glob (ex. : « fournisseurs/*.csv.gz »). Le répertoire est parcouru une seule fois ;
+        un chemin relatif est aussi cherché dans le répertoire 'input'. Options : voir `consolidate_files`.
+        """
+        from module_perso.manifest import scan
+
+        try:
+            paths = scan(pattern, [CSVManager.INPUT_DIR])
+        except OSError as e:
+            logger.error("Impossible de parcourir %s : %s", pattern, e)
+            raise CSV_FileNotFoundError(f"Impossible de parcourir '{pattern}' : {e}")
+        output_path = os.path.abspath(os.path.join(CSVManager.OUTPUT_DIR, output_file))
+        paths = [path for path in paths if path != output_path]
+        self.consolidate_files(paths, output_file, **options)
+
+    @staticmethod
+    def _columns(columns):
+        """Accepte une liste de colonnes ou une chaîne « col1,col2 »."""
+        if isinstance(columns, str):
+            return [column.strip() for column in columns.split(",") if column.strip()]
+        return list(columns)
+
+    @staticmethod
+    def _iter_parallel(managers, fieldnames, jobs, quarantine=None):
+        """
+        Analyse les fichiers dans un pool de processus et produit leurs lignes dans l'ordre d'entrée.
+        - Chaque fichier non compressé est découpé en morceaux d'environ `chunked.MIN_CHUNK_BYTES`
+          (un petit fichier forme un seul morceau) : un processus renvoie un morceau, jamais un fichier entier.
+        - Un fichier compressé est lu en flux dans le processus principal pendant que le pool analyse la suite.
+        - Au plus `jobs` morceaux sont en attente à la fois, ce qui borne la mémoire utilisée.
+        Les lignes sont validées dans le processus principal (voir `CSVManager.iter_checked`).
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from module_perso import chunked
+        from module_perso.schema import Schema
+
+        schema = Schema(fieldnames)
+        tasks = []
+        for manager in managers:
+            if compression.detect(manager.file_path):
+                tasks.append((manager, None))
+            else:
+                parts = max(os.path.getsize(manager.file_path) // chunked.MIN_CHUNK_BYTES, 1)
+                chunks = chunked.plan(manager.file_path, parts) or [(0, 0, 1)]  # Sans données : vérifié plus bas
+                tasks.extend((manager, chunk) for chunk in chunks)
+        logger.info("Analyse parallèle de %s fichiers (%s morceaux) avec %s processus", len(managers), len(tasks), jobs)
+
+        counts = {}
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(tasks)))
+
+        def submit(task):
+            manager, chunk = task
+            future = None if chunk is None else executor.submit(chunked.parse_range, manager.file_path, *chunk)
+            return manager, future
+
+        def finish(manager):
+            if not counts[manager.file_path]:
+                logger.warning("Le fichier CSV est vide ou invalide : %s", manager.file_path)
+                raise DataProcessingError("Erreur lors de la lecture du fichier CSV : Le fichier CSV est vide ou invalide.")
+            logger.info("Fichier CSV lu avec succès : %s", manager.file_path)
+
+        def tally(path, rows):
+            for item in rows:
+                counts[path] += 1
+                yield item
+
+        try:
+            remaining = iter(tasks)
+            pending = deque(submit(task) for task in itertools.islice(remaining, jobs))
+            current = None
+            while pending:
+                manager, future = pending.popleft()
+                pending.extend(submit(task) for task in itertools.islice(remaining, 1))
+                if manager is not current:
+                    if current is not None:
+                        finish(current)
+                    current = manager
+                    counts[manager.file_path] = 0
+                if future is None:
+                    rows = manager._iter_values(1)
+                else:
+                    lines, values = future.result()
+                    rows = zip(lines, values)
+                for values in _check_rows(schema.check, tally(manager.file_path, rows), manager.file_path, quarantine):
+                    yield dict(zip(fieldnames, values))
+            finish(current)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _check_headers(managers):
+        """Vérifie que tous les fichiers partagent le même en-tête et le retourne."""
+        fieldnames = managers[0].read_header()
+        for manager in managers[1:]:
+            header = manager.read_header()
+            if header != fieldnames:
+                logger.error("En-tête incompatible dans %s : %s != %s", manager.file_path, header, fieldnames)
+                raise DataProcessingError(
+                    f"L'en-tête de '{manager.file_path}' ne correspond pas à celui de "
+                    f"'{managers[0].file_path}' : {header} != {fieldnames}"
+                )
+        return fieldnames
+
+    def find(self, query, category=None, price_range=None, where=None):
+        """
+        Retourne les identifiants des lignes de `data` correspondant aux filtres.
+        Les filtres sont évalués à l'aide des index secondaires, conservés entre deux appels.
+        `where` est une expression de filtre (voir `filters.Filter`), par ex. « catégorie=Vêtements prix<50 » ;
+        une requête `query` qui est une telle expression est interprétée de la même façon.
+        """
+        return list(self.iter_find(query, category, price_range, where))
+
+    def iter_find(self, query, category=None, price_range=None, where=None):
+        """Comme `find`, mais produit les identifiants au fur et à mesure, sans construire la liste complète."""
+        from module_perso import filters
+
+        price_range = self._parse_price_range(price_range)
+        if where is None and query and filters.is_expression(query, self._data.fieldnames):
+            where, query = query, None
+        if where is None:
+            return self._indexes.iter_search(query, category, price_range)
+
+        # Les conditions simples de premier niveau sont confiées aux index, si le filtre correspondant est libre
+        free = [name for name, value in (("query", query), ("category", category), ("price_range", price_range)) if not value]
+        try:
+            compiled = filters.Filter(where, self._data, self._indexes, free)
+        except ValueError as e:
+            logger.error("Filtre invalide : %s", e)
+            raise DataProcessingError(f"Filtre invalide : {e}")
+        pushdown = compiled.pushdown
+        candidates = self._indexes.iter_search(
+            query or pushdown.get("query"), category or pushdown.get("category"), price_range or pushdown.get("price_range")
+        )
+        return filter(compiled.predicate, candidates)
+
+    @staticmethod
+    def _parse_price_range(price_range):
+        """Convertit une plage de prix « min,max » en tuple de flottants."""
+        if not price_range:
+            return None
+        if isinstance(price_range, str):
+            try:
+                min_price, max_price = map(float, price_range.split(','))
+            except ValueError:
+                raise DataProcessingError(f"Plage de prix invalide (format attendu : min,max) : {price_range}")
+            return min_price, max_price
+        return tuple(price_range)
+
+    def search_data(
+        self, file_path, query, category=None, price_range=None, jobs=1, output_format="text", limit=None,
+        sort_by=None, descending=False, top=None, offset=0, where=None,
+    ):
+        """
+        Recherche les données dans un fichier CSV.
+        - `query` (nom contenant), `category`, `price_range` et `where` (expression de filtre) : voir `find`.
+        - Les résultats sont écrits en flux, dès qu'ils sont trouvés, au format `output_format`
+          (text, csv, tsv ou jsonl).
+        - Avec `limit`, la recherche s'arrête après `limit` résultats.
+        - `sort_by`, `descending`, `top` et `offset` : voir `select`.
+        - Une recherche par nom (ou par expression) enregistre l'index de trigrammes du fichier, réutilisé
+          tant que le fichier ne change pas. Avec le cache binaire (`use_cache`, option `--cache`), les recherches
+          suivantes ne relisent pas non plus le CSV : l'inventaire est projeté en mémoire et seules les lignes
+          candidates de l'index sont lues.
+        """
+        from module_perso.formats import ResultWriter
+
+        logger.info("Recherche des données : %s", query or where)
+        self._check_count("Limite", limit)
+        inventory = self.load(file_path, jobs)
+        matches = metrics.timed("filter", self.iter_find(query, category, price_range, where), "rows_matched")
+        with metrics.stage("sort"):
+            row_ids = self.select(matches, sort_by, descending, top, offset)
+        if limit is not None:
+            row_ids = itertools.islice(row_ids, limit)
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        with metrics.stage("output"), ResultWriter(inventory.fieldnames, output_format) as writer:
+            for result in inventory.rows(row_ids):
+                if debug:
+                    logger.debug("Résultat trouvé : %s", result, extra=PER_ROW)
+                writer.write(result)
+        metrics.add("rows_written", writer.count)
+        logger.info("%s résultat(s) trouvé(s)", writer.count)
+
+    def search_files(
+        self, file_paths, query, category=None, price_range=None, jobs=None, output_format="text", limit=None,
+        sort_by=None, descending=False, top=None, offset=0, where=None,
+    ):
+        """
+        Recherche dans plusieurs fichiers de même en-tête sans les consolider (motifs glob acceptés).
+        - Les fichiers sont analysés en parallèle dans un pool de `jobs` processus (par défaut, un par cœur) ;
+          les filtres (dont l'expression `where`, compilée dans chaque processus) sont évalués sur place
+          et seuls les résultats en reviennent.
+        - Chaque résultat porte une colonne `source` (fichier d'origine).
+        - Sans tri, les résultats sont écrits au fur et à mesure que les fichiers sont traités (ordre de fin
+          de traitement) et la recherche s'arrête dès que `limit` (ou `offset` + `top`) résultats sont écrits.
+        - Avec `sort_by`, chaque processus ne renvoie que ses `offset + top` meilleurs résultats, fusionnés ensuite ;
+          à valeur égale, les résultats suivent l'ordre des fichiers puis celui des lignes.
+        """
+        from module_perso.formats import ResultWriter
+        from module_perso.ranking import SORT_KEYS
+
+        logger.info("Recherche fédérée des données : %s", query or where)
+        self._check_count("Limite", limit)
+        self._check_count("Top", top)
+        self._check_count("Décalage", offset)
+        managers = [CSVManager(path) for path in self._expand(file_paths)]
+        if not managers:
+            raise CSV_FileNotFoundError(f"Aucun fichier ne correspond à {file_paths}")
+        fieldnames = self._check_headers(managers)
+        if sort_by and sort_by not in SORT_KEYS:
+            raise DataProcessingError(f"Critère de tri inconnu : {sort_by} (attendu : {', '.join(SORT_KEYS)})")
+
+        offset = offset or 0
+        page = min((count for count in (limit, top) if count is not None), default=None)
+        keep = None if page is None else offset + page
+        price_range = self._parse_price_range(price_range)
+        paths = [manager.file_path for manager in managers]
+        searches = self._iter_search_files(
+            paths, (query, category, price_range, where, self._use_cache, sort_by, descending, keep, self._quarantine is not None),
+            jobs or os.cpu_count() or 1, self._quarantine,
+        )
+        if sort_by:
+            def ranked(item):
+                return -item[1][0] if descending else item[1][0]
+
+            # Les résultats sont replacés dans l'ordre des fichiers : à valeur égale, l'ordre de sortie ne dépend
+            # pas de l'ordre de fin des processus (pagination stable avec `offset`)
+            completed = dict(searches)
+            sources = [[(path, result) for result in completed[path]] for path in paths]
+            with metrics.stage("sort"):
+                batches = [list(itertools.islice(heapq.merge(*sources, key=ranked), offset, keep))]
+            skip = 0
+        else:
+            # Un lot par fichier, écrit dès que sa recherche est terminée
+            batches = ([(source, result) for result in results] for source, results in searches)
+            skip = offset
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        with metrics.stage("output"), ResultWriter(["source"] + fieldnames, output_format) as writer:
+            for batch in batches:
+                for source, (_, row) in batch:
+                    if skip:
+                        skip -= 1
+                        continue
+                    if page is not None and writer.count >= page:
+                        break
+                    result = {"source": source, **row}
+                    if debug:
+                        logger.debug("Résultat trouvé : %s", result, extra=PER_ROW)
+                    writer.write(result)
+                writer.flush()
+                if page is not None and writer.count >= page:
+                    break
+        searches.close()  # Annule les recherches encore en attente
+        metrics.add("rows_written", writer.count)
+        logger.info("%s résultat(s) trouvé(s) dans %s fichier(s)", writer.count, len(managers))
+
+    @staticmethod
+    def _iter_search_files(paths, arguments, jobs, quarantine=None):
+        """
+        Produit `(fichier, résultats)` dès que la recherche dans chaque fichier est terminée.
+        Les lignes rejetées par les processus de travail sont écrites dans `quarantine`.
+        """
+        def collect(path, outcome):
+            results, rejected = outcome
+            for record in rejected:
+                quarantine.add(*record)
+            if rejected:
+                quarantine.flush()
+                logger.warning("%s ligne(s) invalide(s) de %s mise(s) en quarantaine dans %s", len(rejected), path, quarantine.path)
+            metrics.add("rows_matched", len(results))
+            return path, results
+
+        if jobs == 1 or len(paths) == 1:
+            for path in paths:
+                yield collect(path, _search_file(path, *arguments))
+            return
+
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        logger.info("Recherche parallèle dans %s fichiers avec %s processus", len(paths), jobs)
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(paths)))
+        try:
+            futures = {executor.submit(_search_file, path, *arguments): path for path in paths}
+            for future in as_completed(futures):
+                yield collect(futures[future], future.result())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _expand(file_paths):
+        """Remplace les motifs glob (ex. : « magasins/*.csv ») par les fichiers correspondants."""
+        from module_perso.manifest import scan
+
+        paths = []
+        for path in file_paths:
+            if any(char in os.path.basename(path) for char in "*?["):
+                try:
+                    paths.extend(scan(path, [CSVManager.INPUT_DIR]))
+                except OSError as e:
+                    raise CSV_FileNotFoundError(f"Impossible de parcourir '{path}' : {e}")
+            else:
+                paths.append(path)
+        return paths
+
+    def search_batch(
+        self, file_path, queries_file, category=None, price_range=None, jobs=1, output_format="text", limit=None,
+        sort_by=None, descending=False, top=None, offset=0,
+    ):
+        """
+        Évalue plusieurs requêtes (une par ligne de `queries_file`, ou de l'entrée standard si '-')
+        en chargeant le fichier une seule fois et en un seul parcours des noms (Aho–Corasick).
+        Les résultats sont regroupés par requête, dans l'ordre du fichier de requêtes ; hors format
+        `text`, chaque résultat porte une colonne `query` supplémentaire. `limit`, le tri et la pagination
+        s'appliquent à chaque requête.
+        """
+        from module_perso.formats import ResultWriter
+
+        queries = self._read_queries(queries_file)
+        logger.info("Recherche groupée de %s requêtes", len(queries))
+        self._check_count("Limite", limit)
+        inventory = self.load(file_path, jobs)
+
+        price_range = self._parse_price_range(price_range)
+        from module_perso.matcher import AhoCorasick
+
+        with metrics.stage("filter"):
+            if category or price_range:
+                candidates = self._indexes.search(None, category, price_range)
+            else:
+                candidates = range(len(inventory))
+
+            matcher = AhoCorasick(queries)
+            names = self._indexes.names.names
+            results = [[] for _ in queries]
+            for row_id in candidates:
+                for match in matcher.find(names[row_id]):
+                    results[match].append(row_id)
+        metrics.add("rows_matched", sum(map(len, results)))
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        text = output_format == "text"
+        fieldnames = inventory.fieldnames if text else ["query"] + inventory.fieldnames
+        with metrics.stage("output"), ResultWriter(fieldnames, output_format) as writer:
+            for query, row_ids in zip(queries, results):
+                if text:
+                    writer.write_line(f"=== {query} ({len(row_ids)} résultat(s)) ===")
+                page = itertools.islice(self.select(row_ids, sort_by, descending, top, offset), limit)
+                for result in inventory.rows(page):
+                    if debug:
+                        logger.debug("Résultat trouvé : %s", result, extra=PER_ROW)
+                    writer.write(result if text else {"query": query, **result})
+        metrics.add("rows_written", writer.count)
+
+    def select(self, row_ids, sort_by=None, descending=False, top=None, offset=0):
+        """
+        Trie et pagine les identifiants de lignes `row_ids` de `data`.
+        - `sort_by` : price, quantity ou value (prix × quantité) ; ordre décroissant avec `descending`.
+        - `top` : nombre de résultats de la page ; avec un tri, seul un tas borné de `offset + top`
+          éléments est conservé, même si des millions de lignes correspondent.
+        - `offset` : nombre de résultats à sauter ; l'ordre est stable (identifiant de ligne en cas d'égalité).
+        """
+        from module_perso import ranking
+
+        self._check_count("Top", top)
+        self._check_count("Décalage", offset)
+        try:
+            key = ranking.sort_key(self._data, sort_by) if sort_by else None
+        except ValueError as e:
+            raise DataProcessingError(str(e))
+        return ranking.select(row_ids, key, descending, top, offset or 0)
+
+    @staticmethod
+    def _check_count(label, value):
+        if value is not None and value < 0:
+            raise DataProcessingError(f"{label} invalide (entier positif attendu) : {value}")
+
+    @staticmethod
+    def _read_queries(queries_file):
+        """Lit les requêtes non vides et sans doublons, une par ligne."""
+        try:
+            if queries_file == '-':
+                lines = sys.stdin.read().splitlines()
+            else:
+                with open(queries_file, 'r', encoding='utf-8') as file:
+                    lines = file.read().splitlines()
+        except OSError as e:
+            logger.error("Impossible de lire le fichier de requêtes : %s", e)
+            raise CSV_FileNotFoundError(f"Impossible de lire le fichier de requêtes '{queries_file}' : {e}")
+        queries = list(dict.fromkeys(line.strip() for line in lines if line.strip()))
+        if not queries:
+            raise DataProcessingError("Aucune requête fournie.")
+        return queries
+
+    def generate_report(self, file_path, output_file, summary=False, group_by=None, jobs=1, incremental=False):
+        """
+        Génère un rapport récapitulatif dans le répertoire 'report'.
+        - Les statistiques sont calculées en une seule passe sur l'inventaire.
+        - Avec `group_by`, le rapport contient le détail par valeur de cette colonne.
+        - Avec `incremental`, les agrégats sont mis en cache et seules les lignes ajoutées depuis
+          le dernier rapport sont analysées (ignoré avec `summary`, qui a besoin de toutes les lignes).
+        """
         logger.info("Génération du rapport")
         report_dir = os.path.join(CSVManager.OUTPUT_DIR, "report")
         os.makedirs(report_dir, exist_ok=True)
 
         report_path = os.path.join(report_dir, output_file)
 
-        # Lire les données depuis le fichier CSV
-        manager = CSVManager(file_path)
-        data = manager.read_csv()
-
         # Calculer les statistiques
-        total_products = len(data)
-        total_quantity = sum(int(row['quantity']) for row in data)
-        total_value = sum(float(row['price']) * int(row['quantity']) for row in data)
+        try:
+            source = CSVManager(file_path).file_path if incremental and not summary else None
+            if source and compression.detect(source):
+                logger.info("Rapport incrémental impossible sur un fichier compressé, analyse complète : %s", source)
+                source = None
+            if source:
+                from module_perso.incremental import ReportCache
+
+                with metrics.stage("aggregate"):
+                    aggregator = ReportCache(source, group_by, CSVManager.OUTPUT_DIR, self._quarantine).aggregate()
+            else:
+                # Lire les données depuis le fichier CSV
+                jobs = jobs or os.cpu_count() or 1
+                inventory = self.load(file_path, jobs)
+                with metrics.stage("aggregate"):
+                    aggregator = aggregate_inventory(inventory, group_by, jobs)
+        except KeyError as e:
+            logger.error("Colonne introuvable : %s", e)
+            raise DataProcessingError(f"Colonne introuvable : {e}")
+        except ValueError as e:
+            logger.error("Erreur lors du calcul du rapport : %s", e)
+            raise DataProcessingError(f"Erreur lors du calcul du rapport : {e}")
+        totals = aggregator.total()
 
         # Écrire le rapport
         try:
-            with open(report_path, 'w', encoding='utf-8') as file:
+            with metrics.stage("output"), open(report_path, 'w', encoding='utf-8') as file:
                 file.write(f"Rapport pour {file_path}\n")
-                file.write(f"Nombre de produits : {total_products}\n")
-                file.write(f"Quantité totale : {total_quantity}\n")
-                file.write(f"Valeur totale : {total_value:.2f}€\n")
+                file.write(f"Nombre de produits : {totals['count']}\n")
+                file.write(f"Quantité totale : {totals['quantity']['sum']}\n")
+                file.write(f"Valeur totale : {totals['value']['sum']:.2f}€\n")
+                if group_by:
+                    file.write(f"\nDétail par {group_by} :\n")
+                    for key, stats in aggregator.results().items():
+                        quantity, value = stats['quantity'], stats['value']
+                        file.write(
+                            f"- {key} : {stats['count']} produits, "
+                            f"quantité {quantity['sum']} (min {quantity['min']}, max {quantity['max']}, "
+                            f"moyenne {quantity['mean']:.2f}), "
+                            f"valeur {value['sum']:.2f}€ (min {value['min']:.2f}€, max {value['max']:.2f}€, "
+                            f"moyenne {value['mean']:.2f}€)\n"
+                        )
                 if summary:
                     file.write("\nDétail des produits :\n")
-                    for row in data:
+                    for row in inventory.rows():
                         file.write(
                             f"- {row['name']} (Catégorie : {row['category']}, Prix : {row['price']}€, "
                             f"Quantité : {row['quantity']})\n"
                         )
 
-            logger.info(f"Rapport généré avec succès dans : {report_path}")
+            logger.info("Rapport généré avec succès dans : %s", report_path)
         except Exception as e:
-            logger.error(f"Erreur lors de la génération du rapport : {e}")
+            logger.error("Erreur lors de la génération du rapport : %s", e)
             raise DataProcessingError(f"Erreur lors de la génération du rapport : {e}")
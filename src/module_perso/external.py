@@ -0,0 +1,273 @@
+import csv
+import heapq
+import itertools
+import logging
+import os
+from operator import itemgetter
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+MERGE_POLICIES = ("sum", "last", "min-price")
+PARTITIONS = 16
+MAX_DEPTH = 4
+SORT_MEMORY = 256 * 1024 ** 2  # Budget par défaut d'un run du tri externe
+MERGE_MEMORY = 256 * 1024 ** 2  # Budget par défaut de la table de la fusion par clé
+MAX_FANIN = 64  # Nombre maximal de runs fusionnés (fichiers ouverts) à la fois
+MIN_NATURAL_RUN = 64  # Longueur minimale (lignes) d'une suite déjà triée gardée telle quelle dans un run
+# Coût estimé (octets) d'une entrée de la table en plus de ses chaînes : tuple clé, liste, emplacement du dict
+ENTRY_OVERHEAD = 200
+
+
+class SpillFile:
+    """Fichier temporaire de lignes (listes de chaînes), écrit puis relu une fois en flux et supprimé."""
+
+    def __init__(self, directory, prefix):
+        import tempfile
+
+        fd, self.path = tempfile.mkstemp(prefix=prefix, suffix=".csv", dir=directory)
+        self._file = os.fdopen(fd, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self.count = 0
+
+    def write(self, row):
+        self._writer.writerow(row)
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def read(self):
+        """Relit les lignes écrites ; le fichier est supprimé une fois lu (ou si la lecture est abandonnée)."""
+        try:
+            with open(self.path, encoding="utf-8", newline="") as file:
+                yield from csv.reader(file)
+        finally:
+            os.remove(self.path)
+
+
+class KeyMerger:
+    """
+    Fusionne les lignes de même clé (dédoublonnage / mise à jour) en une seule passe de hachage.
+    Politiques de fusion :
+    - `sum` : les quantités sont additionnées, les autres colonnes (dont le prix) viennent de la dernière ligne.
+    - `last` : la dernière ligne remplace les précédentes.
+    - `min-price` : les quantités sont additionnées et le prix le plus bas est conservé.
+    Si la table dépasse `memory_limit` octets (estimation, `MERGE_MEMORY` par défaut), les lignes sont réparties par hachage de la clé
+    dans des fichiers temporaires, puis chaque partition est fusionnée séparément (et de nouveau répartie
+    si nécessaire). Les clés sortent toujours dans l'ordre de leur première apparition.
+    """
+
+    def __init__(self, fieldnames, key, policy="sum", memory_limit=None, tmp_dir=None):
+        self.fieldnames = list(fieldnames)
+        missing = [column for column in key if column not in self.fieldnames]
+        if not key or missing:
+            raise ValueError(f"Colonnes de clé introuvables : {missing or key}")
+        if policy not in MERGE_POLICIES:
+            raise ValueError(f"Politique de fusion inconnue : {policy} (attendu : {', '.join(MERGE_POLICIES)})")
+        numeric = {"sum": ["quantity"], "min-price": ["quantity", "price"]}.get(policy, [])
+        missing = [column for column in numeric if column not in self.fieldnames]
+        if missing:
+            raise ValueError(f"La politique {policy} nécessite les colonnes : {missing}")
+
+        self.policy = policy
+        self.memory_limit = memory_limit or MERGE_MEMORY
+        self.spills = 0
+        self._tmp_dir = tmp_dir
+        # Les enregistrements sont des listes [numéro de première apparition, valeurs…]
+        self._key = itemgetter(*(self.fieldnames.index(column) + 1 for column in key))
+        self._quantity = self.fieldnames.index("quantity") + 1 if numeric else None
+        self._price = self.fieldnames.index("price") + 1 if policy == "min-price" else None
+
+    def merge(self, rows):
+        """Produit les lignes fusionnées (dictionnaires) dans l'ordre de première apparition des clés."""
+        import tempfile
+
+        fieldnames, quantity = self.fieldnames, self._quantity
+        records = ([seq] + [row[name] for name in fieldnames] for seq, row in enumerate(rows))
+        with tempfile.TemporaryDirectory(prefix="consolidate-", dir=self._tmp_dir) as directory:
+            for record in self._reduce(records, directory, 0):
+                if quantity is not None:
+                    record[quantity] = str(record[quantity])
+                yield dict(zip(fieldnames, record[1:]))
+
+    def _reduce(self, records, directory, depth):
+        table = {}
+        size = 0
+        key_of = self._key
+        limit = self.memory_limit if depth < MAX_DEPTH else None
+        for record in records:
+            key = key_of(record)
+            state = table.get(key)
+            if state is None:
+                size += ENTRY_OVERHEAD + sum(len(value) for value in record[1:] if value)
+                table[key] = self._start(record)
+                if limit and size > limit:
+                    yield from self._spill(table, records, directory, depth)
+                    return
+            else:
+                self._combine(state, record)
+        yield from table.values()
+
+    def _start(self, record):
+        if self._quantity is not None:
+            record[self._quantity] = _number(int, record, self._quantity)
+        return record
+
+    def _combine(self, state, record):
+        quantity, price = self._quantity, self._price
+        if self.policy == "last":
+            state[1:] = record[1:]
+        elif self.policy == "sum":
+            total = state[quantity] + _number(int, record, quantity)
+            state[1:] = record[1:]
+            state[quantity] = total
+        else:
+            state[quantity] += _number(int, record, quantity)
+            if _number(float, record, price) < _number(float, state, price):
+                state[price] = record[price]
+
+    def _spill(self, table, records, directory, depth):
+        """Répartit la table et le reste des lignes en partitions, fusionne chacune puis les réunit dans l'ordre."""
+        logger.info(
+            "Budget mémoire dépassé (%s clés, niveau %s) : répartition en %s partitions sur disque",
+            len(table), depth, PARTITIONS,
+        )
+        self.spills += 1
+        key_of = self._key
+        partitions = [SpillFile(directory, f"partition-{depth}-{index}-") for index in range(PARTITIONS)]
+        for record in itertools.chain(table.values(), records):
+            partitions[hash((depth, key_of(record))) % PARTITIONS].write(record)
+        table.clear()
+
+        runs = []
+        for partition in partitions:
+            partition.close()
+            run = SpillFile(directory, f"run-{depth}-")
+            for record in self._reduce(_read_records(partition), directory, depth + 1):
+                run.write(record)
+            run.close()
+            runs.append(run)
+        yield from heapq.merge(*(_read_records(run) for run in runs), key=itemgetter(0))
+
+
+class ExternalSorter:
+    """
+    Tri externe de lignes (dictionnaires) selon une ou plusieurs colonnes.
+    - Les lignes sont accumulées en runs de taille bornée (`memory_limit` octets, estimation),
+      triés en mémoire puis écrits dans des fichiers temporaires.
+    - Les runs sont fusionnés avec un tas (k-way merge), au plus `MAX_FANIN` à la fois.
+    - Les colonnes numériques (price, quantity) sont comparées comme des nombres, les autres comme des chaînes.
+    - Le tri est stable : à clé égale, l'ordre d'entrée est conservé.
+    - Les suites de lignes déjà dans l'ordre (runs naturels, par ex. un fichier déjà trié) ne sont pas triées
+      de nouveau mais fusionnées directement (`presorted` en donne le nombre).
+    """
+
+    def __init__(self, fieldnames, columns, memory_limit=None, tmp_dir=None):
+        from module_perso.inventory import CONVERTERS, NUMERIC_COLUMNS
+
+        self.fieldnames = list(fieldnames)
+        missing = [column for column in columns if column not in self.fieldnames]
+        if not columns or missing:
+            raise ValueError(f"Colonnes de tri introuvables : {missing or columns}")
+        self.columns = list(columns)
+        self.memory_limit = memory_limit or SORT_MEMORY
+        self.runs = 0
+        self.presorted = 0
+        self._tmp_dir = tmp_dir
+        converters = [(column, CONVERTERS.get(NUMERIC_COLUMNS.get(column))) for column in self.columns]
+
+        def key(row):
+            try:
+                return tuple(convert(row[column]) if convert else (row[column] or "") for column, convert in converters)
+            except (TypeError, ValueError):
+                raise ValueError(f"Valeur invalide pour le tri sur {self.columns} : {[row.get(c) for c in self.columns]}")
+
+        self.key = key
+
+    def sort(self, rows):
+        """
+        Trie un flux de lignes en une seule passe.
+        L'ordre est vérifié pendant le découpage en runs : une suite d'au moins `MIN_NATURAL_RUN` lignes
+        déjà triées (par ex. issue d'un fichier déjà trié) est close dès qu'une clé recule et gardée telle quelle,
+        puis fusionnée avec les suivantes par le tas, sans tri.
+        """
+        import tempfile
+
+        with tempfile.TemporaryDirectory(prefix="sort-", dir=self._tmp_dir) as directory:
+            runs = self._runs(rows, directory, keep_last=True)
+            while len(runs) > MAX_FANIN:
+                runs = [self._spill_run(heapq.merge(*runs[start:start + MAX_FANIN], key=self.key), directory)
+                        for start in range(0, len(runs), MAX_FANIN)]
+            yield from runs[0] if len(runs) == 1 else heapq.merge(*runs, key=self.key)
+
+    def _runs(self, rows, directory, keep_last=False):
+        """
+        Découpe `rows` en runs triés ; les runs du dernier budget mémoire peuvent rester en mémoire (`keep_last`).
+        Dans un même budget mémoire, les lignes forment des segments : un segment déjà trié est clos dès qu'une clé
+        recule (run naturel) s'il compte au moins `MIN_NATURAL_RUN` lignes ; sinon il sera trié. Les segments
+        d'un budget plein sont fusionnés par le tas en un run sur disque.
+        """
+        key = self.key
+        runs, segments = [], []
+        buffer, keys = [], []
+        size = 0
+        ordered = True  # Le segment en cours est-il déjà dans l'ordre ?
+        for row in rows:
+            current = key(row)
+            if ordered and keys and current < keys[-1]:
+                if len(buffer) >= MIN_NATURAL_RUN:
+                    segments.append(self._ordered(buffer, keys, True))
+                    buffer, keys = [], []
+                else:
+                    ordered = False
+            buffer.append(row)
+            keys.append(current)
+            size += ENTRY_OVERHEAD + sum(len(value) for value in row.values() if value)
+            if size > self.memory_limit:
+                segments.append(self._ordered(buffer, keys, ordered))
+                runs.append(self._spill_run(self._merge(segments), directory))
+                segments, buffer, keys = [], [], []
+                size = 0
+                ordered = True
+        if buffer:
+            segments.append(self._ordered(buffer, keys, ordered))
+        if keep_last:
+            runs.extend(iter(segment) for segment in segments)
+        elif segments:
+            runs.append(self._spill_run(self._merge(segments), directory))
+        return runs
+
+    def _merge(self, segments):
+        return segments[0] if len(segments) == 1 else heapq.merge(*segments, key=self.key)
+
+    def _ordered(self, buffer, keys, ordered):
+        """Retourne les lignes du run triées selon leurs clés déjà calculées ; un run déjà dans l'ordre est gardé tel quel."""
+        if ordered:
+            self.presorted += 1
+            return buffer
+        order = sorted(range(len(buffer)), key=keys.__getitem__)
+        return [buffer[index] for index in order]
+
+    def _spill_run(self, rows, directory):
+        self.runs += 1
+        fieldnames = self.fieldnames
+        run = SpillFile(directory, "run-")
+        for row in rows:
+            run.write([row[name] for name in fieldnames])
+        run.close()
+        logger.debug("Run de tri écrit sur disque : %s lignes", run.count)
+        return (dict(zip(fieldnames, values)) for values in run.read())
+
+
+def _read_records(spill):
+    for record in spill.read():
+        record[0] = int(record[0])
+        yield record
+
+
+def _number(converter, record, index):
+    try:
+        return converter(record[index])
+    except (TypeError, ValueError):
+        raise ValueError(f"Valeur numérique invalide : {record[index]!r}")
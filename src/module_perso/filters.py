@@ -0,0 +1,363 @@
+import logging
+import math
+import re
+from array import array
+
+from module_perso.inventory import DictionaryColumn
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+# Noms de colonnes acceptés dans les expressions (insensibles à la casse)
+ALIASES = {
+    "nom": "name",
+    "catégorie": "category",
+    "categorie": "category",
+    "prix": "price",
+    "quantité": "quantity",
+    "quantite": "quantity",
+    "valeur": "value",
+}
+KEYWORDS = {
+    "and": "and", "et": "and", "&&": "and",
+    "or": "or", "ou": "or", "||": "or",
+    "not": "not", "non": "not",
+    "in": "in", "dans": "in",
+}
+OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "~", "^=", "in")
+# Coût estimé d'évaluation d'un prédicat, par type de colonne et d'opérateur
+COSTS = {"code": 1, "number": 1, "value": 2, "equal": 2, "prefix": 3, "substring": 4}
+SAMPLE_SIZE = 256  # Lignes évaluées pour estimer la sélectivité de chaque prédicat
+
+TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op><=|>=|!=|==|\^=|=|<|>|~)
+      | (?P<punct>[(),])
+      | (?P<word>[^\s()<>=!~^,"']+)
+    )""", re.VERBOSE)
+
+
+def tokenize(text):
+    """Découpe une expression en jetons `(type, valeur, position)`."""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"caractère inattendu à la position {position} : {text[position]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "string":
+            value = re.sub(r"\\(.)", r"\1", value[1:-1])
+        elif kind == "op" and value == "==":
+            value = "="
+        tokens.append((kind, value, match.start(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Analyseur descendant récursif. Grammaire (AND est implicite entre deux conditions juxtaposées) :
+        expression := terme (OR terme)*
+        terme      := facteur ([AND] facteur)*
+        facteur    := NOT facteur | "(" expression ")" | colonne opérateur valeur | colonne IN "(" valeur, … ")"
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("expression vide")
+        node = self._or()
+        if self.position < len(self.tokens):
+            self._fail("jeton inattendu")
+        return node
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None, len(self.text))
+
+    def _keyword(self):
+        kind, value, _ = self._peek()
+        return KEYWORDS.get(value.lower()) if kind == "word" else None
+
+    def _fail(self, message):
+        kind, value, position = self._peek()
+        found = f" : {value!r}" if value is not None else " : fin de l'expression"
+        raise ValueError(f"{message} à la position {position}{found}")
+
+    def _expect(self, kind, value=None):
+        token = self._peek()
+        if token[0] != kind or (value is not None and token[1] != value):
+            self._fail(f"« {value or kind} » attendu")
+        self.position += 1
+        return token[1]
+
+    def _or(self):
+        children = [self._and()]
+        while self._keyword() == "or":
+            self.position += 1
+            children.append(self._and())
+        return children[0] if len(children) == 1 else ("or", children)
+
+    def _and(self):
+        children = [self._not()]
+        while True:
+            kind, value, _ = self._peek()
+            if kind is None or value == ")" or self._keyword() == "or":
+                break
+            if self._keyword() == "and":
+                self.position += 1
+            children.append(self._not())
+        return children[0] if len(children) == 1 else ("and", children)
+
+    def _not(self):
+        if self._keyword() == "not":
+            self.position += 1
+            return ("not", self._not())
+        if self._peek()[1] == "(" and self._peek()[0] == "punct":
+            self.position += 1
+            node = self._or()
+            self._expect("punct", ")")
+            return node
+        return self._comparison()
+
+    def _comparison(self):
+        kind, column, _ = self._peek()
+        if kind not in ("word", "string") or self._keyword():
+            self._fail("nom de colonne attendu")
+        self.position += 1
+        if self._keyword() == "in":
+            self.position += 1
+            self._expect("punct", "(")
+            values = [self._value()]
+            while self._peek()[1] == ",":
+                self.position += 1
+                values.append(self._value())
+            self._expect("punct", ")")
+            return ("cmp", column, "in", values)
+        operator = self._expect("op")
+        return ("cmp", column, operator, self._value())
+
+    def _value(self):
+        kind, value, _ = self._peek()
+        if kind not in ("word", "string"):
+            self._fail("valeur attendue")
+        self.position += 1
+        return value
+
+
+def parse(text):
+    """Analyse une expression de filtre et retourne son arbre ; lève `ValueError` si elle est invalide."""
+    return _Parser(text).parse()
+
+
+def _comparisons(node):
+    if node[0] == "cmp":
+        yield node
+    elif node[0] == "not":
+        yield from _comparisons(node[1])
+    else:
+        for child in node[1]:
+            yield from _comparisons(child)
+
+
+def column_name(name, fieldnames):
+    """Retourne la colonne désignée par `name` (nom, alias français), ou None si elle est inconnue."""
+    known = list(fieldnames) + ["value"]
+    for candidate in (name, name.lower(), ALIASES.get(name.lower())):
+        if candidate in known:
+            return candidate
+    return None
+
+
+def is_expression(text, fieldnames):
+    """Indique si `text` est une expression de filtre valide portant sur des colonnes connues."""
+    try:
+        tree = parse(text)
+    except ValueError:
+        return False
+    return all(column_name(node[1], fieldnames) for node in _comparisons(tree))
+
+
+def _string_test(operator, value):
+    """Retourne le test (sur une chaîne en minuscules) correspondant à `operator`."""
+    if operator == "in":
+        return frozenset(item.lower() for item in value).__contains__
+    value = value.lower()
+    return {
+        "=": value.__eq__,
+        "!=": value.__ne__,
+        "<": value.__gt__,
+        "<=": value.__ge__,
+        ">": value.__lt__,
+        ">=": value.__le__,
+        "~": lambda text: value in text,
+        "^=": lambda text: text.startswith(value),
+    }[operator]
+
+
+class Filter:
+    """
+    Expression de filtre analysée une seule fois puis compilée en une fonction `predicate(row_id)`
+    évaluée sur les colonnes de l'inventaire (comme `Schema`, le code Python est généré puis compilé).
+    - Opérateurs : = (ou ==), !=, <, <=, >, >=, ~ (contient), ^= (commence par), IN (liste), AND, OR, NOT,
+      parenthèses ; AND est implicite entre deux conditions : « catégorie=Vêtements prix<50 ».
+    - Les chaînes sont comparées sans tenir compte de la casse ; `value` (ou `valeur`) vaut prix × quantité.
+    - Sur une colonne encodée par dictionnaire (catégorie), la condition est évaluée une fois par valeur
+      distincte : il ne reste qu'un test d'appartenance du code de chaque ligne.
+    - Les conditions d'un AND (ou d'un OR) sont réordonnées selon leur coût estimé et leur sélectivité,
+      mesurée sur un échantillon de lignes : les conditions peu coûteuses et qui éliminent le plus de lignes
+      sont évaluées d'abord.
+    - `pushdown` : conditions de premier niveau confiées aux index (catégorie exacte, nom contenant, bornes
+      de prix) parmi celles de `allowed` ; les conditions sur la catégorie et le nom sont alors retirées du prédicat.
+    """
+
+    def __init__(self, expression, inventory, indexes=None, allowed=("query", "category", "price_range")):
+        self.expression = expression
+        self._inventory = inventory
+        self._indexes = indexes
+        self._namespace = {}
+        size = len(inventory)
+        self._sample = range(0, size, max(size // SAMPLE_SIZE, 1))
+        self.pushdown = {}
+
+        tree = self._resolve(parse(expression))
+        tree = self._push_down(tree, allowed)
+        if tree is None:
+            self.source, self.cost, self.selectivity = "True", 0, 1.0
+        else:
+            self.source, self.cost, self.selectivity = self._compile(tree)
+        self.predicate = eval(f"lambda i: {self.source}", self._namespace)
+        logger.debug("Filtre compilé : %s (index : %s)", self.source, self.pushdown)
+
+    def _resolve(self, node):
+        if node[0] == "cmp":
+            column = column_name(node[1], self._inventory.fieldnames)
+            if column is None:
+                raise ValueError(f"colonne inconnue : {node[1]} (colonnes : {', '.join(self._inventory.fieldnames)})")
+            return ("cmp", column, node[2], node[3])
+        if node[0] == "not":
+            return ("not", self._resolve(node[1]))
+        return (node[0], [self._resolve(child) for child in node[1]])
+
+    def _push_down(self, tree, allowed):
+        conjuncts = tree[1] if tree[0] == "and" else [tree]
+        remaining = []
+        low, high = -math.inf, math.inf
+        for node in conjuncts:
+            _, column, operator, value = node if node[0] == "cmp" else (None, None, None, None)
+            if column == "category" and operator == "=" and "category" in allowed and "category" not in self.pushdown:
+                self.pushdown["category"] = value
+                continue
+            if column == "name" and operator == "~" and "query" in allowed and "query" not in self.pushdown:
+                self.pushdown["query"] = value
+                continue
+            if column == "price" and operator in ("=", "<", "<=", ">", ">=") and "price_range" in allowed:
+                bound = self._number(column, value)
+                if operator in ("=", "<", "<="):
+                    high = min(high, bound)
+                if operator in ("=", ">", ">="):
+                    low = max(low, bound)
+            remaining.append(node)  # Les bornes de prix sont inclusives : la condition exacte est conservée
+        if (low, high) != (-math.inf, math.inf):
+            self.pushdown["price_range"] = (low, high)
+        if not remaining:
+            return None
+        return remaining[0] if len(remaining) == 1 else ("and", remaining)
+
+    def _compile(self, node):
+        """Retourne `(code source, coût estimé, sélectivité estimée)` du nœud."""
+        kind = node[0]
+        if kind == "cmp":
+            source, cost = self._leaf(*node[1:])
+            return source, cost, self._estimate(source)
+        if kind == "not":
+            source, cost, selectivity = self._compile(node[1])
+            return f"not ({source})", cost, 1.0 - selectivity
+        children = [self._compile(child) for child in node[1]]
+        if kind == "and":
+            # Évaluer d'abord les conditions qui éliminent le plus de lignes pour le moindre coût
+            children.sort(key=lambda child: child[1] / max(1.0 - child[2], 1e-3))
+        else:
+            children.sort(key=lambda child: child[1] / max(child[2], 1e-3))
+        cost, reach, selectivity = 0.0, 1.0, 1.0
+        for _, child_cost, child_selectivity in children:
+            cost += reach * child_cost
+            passing = child_selectivity if kind == "and" else 1.0 - child_selectivity
+            reach *= passing
+            selectivity *= passing
+        if kind == "or":
+            selectivity = 1.0 - selectivity
+        return "(" + f" {kind} ".join(f"({source})" for source, _, _ in children) + ")", cost, selectivity
+
+    def _estimate(self, source):
+        """Sélectivité d'une condition, mesurée sur un échantillon de lignes."""
+        if not self._sample:
+            return 0.5
+        test = eval(f"lambda i: {source}", self._namespace)
+        matches = sum(1 for row_id in self._sample if test(row_id))
+        return (matches + 1) / (len(self._sample) + 2)
+
+    def _bind(self, prefix, value):
+        name = f"{prefix}{len(self._namespace)}"
+        self._namespace[name] = value
+        return name
+
+    @staticmethod
+    def _number(column, value):
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"valeur numérique attendue pour '{column}' : {value!r}")
+
+    def _leaf(self, column, operator, value):
+        """Retourne `(code source, coût)` d'une comparaison."""
+        if column == "value" or isinstance(self._inventory.column(column), array):
+            return self._numeric_leaf(column, operator, value)
+
+        data = self._inventory.column(column)
+        if isinstance(data, DictionaryColumn):
+            test = _string_test(operator, value)
+            wanted = frozenset(code for code, text in enumerate(data.values) if test(text.lower()))
+            if not wanted:
+                return "False", 0
+            if len(wanted) == len(data.values):
+                return "True", 0
+            return f"{self._bind('codes', data.codes)}[i] in {self._bind('wanted', wanted)}", COSTS["code"]
+
+        if column == "name" and self._indexes is not None:
+            text = f"{self._bind('names', self._indexes.names.names)}[i]"  # Noms déjà en minuscules
+            extra = 0
+        else:
+            text = f"{self._bind('column', data)}[i].lower()"
+            extra = 1
+        if operator == "in":
+            constant = self._bind("values", frozenset(item.lower() for item in value))
+            return f"{text} in {constant}", COSTS["equal"] + extra
+        constant = self._bind("text", value.lower())
+        if operator == "~":
+            return f"{constant} in {text}", COSTS["substring"] + extra
+        if operator == "^=":
+            return f"{text}.startswith({constant})", COSTS["prefix"] + extra
+        return f"{text} {'==' if operator == '=' else operator} {constant}", COSTS["equal"] + extra
+
+    def _numeric_leaf(self, column, operator, value):
+        if operator in ("~", "^="):
+            raise ValueError(f"l'opérateur {operator} ne s'applique pas à la colonne numérique '{column}'")
+        if column == "value":
+            prices = self._bind("prices", self._inventory.column("price"))
+            quantities = self._bind("quantities", self._inventory.column("quantity"))
+            operand, cost = f"{prices}[i] * {quantities}[i]", COSTS["value"]
+        else:
+            operand, cost = f"{self._bind('numbers', self._inventory.column(column))}[i]", COSTS["number"]
+        if operator == "in":
+            constant = self._bind("values", frozenset(self._number(column, item) for item in value))
+            return f"{operand} in {constant}", cost
+        constant = self._bind("number", self._number(column, value))
+        return f"{operand} {'==' if operator == '=' else operator} {constant}", cost
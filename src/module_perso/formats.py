@@ -0,0 +1,65 @@
+import csv
+import io
+import sys
+
+FORMATS = ("text", "csv", "tsv", "jsonl")
+BUFFER_SIZE = 64 * 1024
+
+
+class ResultWriter:
+    """
+    Écrit des résultats (dictionnaires) en flux, dans un format exploitable par d'autres outils.
+    - `text` : représentation Python des dictionnaires (format historique).
+    - `csv` / `tsv` : une ligne d'en-tête puis une ligne par résultat.
+    - `jsonl` : un objet JSON par ligne.
+    Les lignes sont accumulées en mémoire et écrites par blocs d'environ `buffer_size` caractères,
+    au lieu d'un appel d'écriture par ligne.
+    """
+
+    def __init__(self, fieldnames, output_format="text", stream=None, buffer_size=BUFFER_SIZE):
+        if output_format not in FORMATS:
+            raise ValueError(f"Format de sortie inconnu : {output_format}")
+        self.fieldnames = list(fieldnames)
+        self.output_format = output_format
+        self.count = 0
+        self._stream = stream or sys.stdout
+        self._buffer_size = buffer_size
+        self._buffer = io.StringIO()
+
+        if output_format in ("csv", "tsv"):
+            writer = csv.writer(self._buffer, delimiter="," if output_format == "csv" else "\t", lineterminator="\n")
+            writer.writerow(self.fieldnames)
+            fieldnames = self.fieldnames
+            self._write = lambda row: writer.writerow([row.get(name, "") for name in fieldnames])
+        elif output_format == "jsonl":
+            import json
+
+            encoder = json.JSONEncoder(ensure_ascii=False)
+            self._write = lambda row: self._buffer.write(encoder.encode(row) + "\n")
+        else:
+            self._write = lambda row: self._buffer.write(f"{row}\n")
+
+    def write(self, row):
+        """Ajoute un résultat ; le tampon est vidé dans le flux dès qu'il est plein."""
+        self._write(row)
+        self.count += 1
+        if self._buffer.tell() >= self._buffer_size:
+            self.flush()
+
+    def write_line(self, line):
+        """Ajoute une ligne de texte brut (titre de section…), qui n'est pas comptée comme un résultat."""
+        self._buffer.write(f"{line}\n")
+
+    def flush(self):
+        """Écrit le contenu du tampon dans le flux."""
+        if self._buffer.tell():
+            self._stream.write(self._buffer.getvalue())
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        self._stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
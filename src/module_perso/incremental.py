@@ -0,0 +1,205 @@
+import csv
+import hashlib
+import logging
+import os
+import pickle
+
+from module_perso.aggregate import Aggregator
+from module_perso.index import sidecar_path
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+# Nombre d'octets précédant le dernier décalage traité, hachés pour détecter une réécriture du fichier
+_TAIL_CHECK_SIZE = 4096
+
+
+class ReportCache:
+    """
+    Cache des agrégats d'un rapport pour les fichiers alimentés en ajout seul.
+    - L'état (agrégats, nombre de lignes, décalage en octets de la dernière ligne traitée) est enregistré
+      dans un fichier annexe, avec la taille, la date de modification et l'inode du fichier source.
+    - Une nouvelle exécution n'analyse que les lignes ajoutées depuis ce décalage.
+    - Si le fichier a été réécrit (inode différent, fichier raccourci ou contenu modifié avant le décalage),
+      les agrégats sont entièrement recalculés.
+    - Les lignes ajoutées sont validées par le schéma de l'en-tête, comme par l'analyse complète : une ligne
+      invalide est écrite dans `quarantine` (voir `schema.Quarantine`) avec son numéro de ligne dans le fichier,
+      ou interrompt le rapport sans quarantaine. L'état n'est alors pas enregistré, pour qu'une exécution
+      suivante la signale de nouveau.
+    """
+
+    SUFFIX = ".report.cache"
+    VERSION = 2
+
+    def __init__(self, file_path, group_by=None, output_dir=None, quarantine=None):
+        self.file_path = os.path.abspath(file_path)
+        self.group_by = group_by
+        self.quarantine = quarantine
+        suffix = f".{group_by or 'total'}{self.SUFFIX}"
+        self.cache_path = sidecar_path((self.file_path,), suffix, output_dir) if output_dir else None
+
+    def _load_state(self):
+        if not self.cache_path:
+            return None
+        try:
+            with open(self.cache_path, "rb") as file:
+                state = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Cache de rapport illisible, il sera reconstruit : %s (%s)", self.cache_path, e)
+            return None
+        if state.get("version") != self.VERSION or state.get("group_by") != self.group_by:
+            return None
+        return state
+
+    def _save_state(self, state):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "wb") as file:
+                pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning("Impossible d'enregistrer le cache de rapport : %s", e)
+
+    @staticmethod
+    def _tail_hash(file, offset):
+        start = max(0, offset - _TAIL_CHECK_SIZE)
+        file.seek(start)
+        return hashlib.sha1(file.read(offset - start)).hexdigest()
+
+    def aggregate(self):
+        """
+        Retourne l'agrégateur à jour pour le fichier source.
+        Lève `DataProcessingError` si une ligne est invalide (sans quarantaine), `KeyError` si une colonne manque.
+        """
+        with open(self.file_path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            state = self._load_state()
+            if state is not None and not self._is_append_of(state, file, stat):
+                logger.info("Fichier réécrit depuis le dernier rapport, reconstruction complète : %s", self.file_path)
+                state = None
+
+            if state is None:
+                state = self._initial_state(file)
+            elif state["size"] == stat.st_size and state["mtime_ns"] == stat.st_mtime_ns:
+                logger.info("Agrégats du rapport repris du cache : %s", self.file_path)
+                return self._aggregator(state)
+
+            start = state["offset"]
+            quarantined = self.quarantine.count if self.quarantine is not None else 0
+            processed = self._consume(file, state, stat.st_size)
+            if not state["rows"]:  # Même comportement que l'analyse complète d'un fichier sans données
+                raise ValueError("Le fichier CSV est vide ou invalide.")
+            logger.info("Rapport incrémental : %s nouvelles lignes analysées depuis l'octet %s", processed, start)
+            state["size"] = stat.st_size
+            state["mtime_ns"] = stat.st_mtime_ns
+            state["inode"] = stat.st_ino
+            state["tail_hash"] = self._tail_hash(file, state["offset"])
+
+        if self.quarantine is None or self.quarantine.count == quarantined:
+            self._save_state(state)
+        return self._aggregator(state)
+
+    def _aggregator(self, state):
+        aggregator = Aggregator(self.group_by)
+        aggregator.groups = state["groups"]
+        return aggregator
+
+    def _is_append_of(self, state, file, stat):
+        """Vérifie que le fichier n'a fait que grandir depuis l'état enregistré."""
+        if state["inode"] != stat.st_ino or stat.st_size < state["offset"]:
+            return False
+        return self._tail_hash(file, state["offset"]) == state["tail_hash"]
+
+    def _initial_state(self, file):
+        file.seek(0)
+        header_line = file.readline()
+        fieldnames = next(csv.reader([header_line.decode("utf-8")]), None)
+        if not fieldnames:
+            raise ValueError("Le fichier CSV est vide ou invalide.")
+        return {
+            "version": self.VERSION,
+            "group_by": self.group_by,
+            "fieldnames": fieldnames,
+            "offset": len(header_line),
+            "line": 2,  # Numéro de la ligne physique au décalage enregistré
+            "rows": 0,
+            "groups": {},
+        }
+
+    def _consume(self, file, state, size):
+        """
+        Analyse en flux les enregistrements complets entre le décalage enregistré et `size`, puis met l'état à jour.
+        Un enregistrement en cours d'ajout (dernière ligne sans saut de ligne, ou champ entre guillemets
+        sur plusieurs lignes pas encore refermé) est ignoré : le décalage enregistré reste à son début.
+        Retourne le nombre de lignes analysées.
+        """
+        offset = state["offset"]
+        end = self._last_line_end(file, offset, size)
+        if end <= offset:
+            return 0
+
+        from module_perso import chunked
+        from module_perso.csv_manager import _check_rows
+        from module_perso.schema import Schema
+
+        fieldnames = state["fieldnames"]
+        try:
+            price_pos, quantity_pos = fieldnames.index("price"), fieldnames.index("quantity")
+            key_pos = fieldnames.index(self.group_by) if self.group_by else None
+        except ValueError as e:
+            raise KeyError(str(e))
+
+        aggregator = self._aggregator(state)
+        add = aggregator.add
+        rows = state["rows"]
+        processed = 0
+        boundary = [offset]
+        reader = csv.reader(self._records(file, offset, end, boundary))
+        numbered = chunked.numbered_rows(reader, state["line"])
+        for row in _check_rows(Schema(fieldnames).parse, numbered, self.file_path, self.quarantine):
+            add(None if key_pos is None else row[key_pos], row[price_pos], row[quantity_pos])
+            processed += 1
+
+        state["rows"] = rows + processed
+        state["offset"] = boundary[0]
+        state["line"] += reader.line_num
+        return processed
+
+    @staticmethod
+    def _last_line_end(file, offset, size):
+        """Retourne la position suivant le dernier saut de ligne avant `size` (une ligne incomplète est ignorée)."""
+        position = size
+        while position > offset:
+            start = max(offset, position - _TAIL_CHECK_SIZE)
+            file.seek(start)
+            newline = file.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            position = start
+        return offset
+
+    @staticmethod
+    def _records(file, offset, end, boundary):
+        """
+        Produit les lignes décodées des enregistrements complets du fichier entre `offset` (début d'un
+        enregistrement) et `end`. Les lignes d'un enregistrement ne sont produites qu'une fois ses guillemets
+        équilibrés ; `boundary[0]` reçoit la position suivant le dernier enregistrement complet.
+        """
+        file.seek(offset)
+        position = offset
+        pending, quotes = [], 0
+        while position < end:
+            line = file.readline(end - position)
+            position += len(line)
+            pending.append(line)
+            quotes += line.count(b'"')
+            if quotes % 2 == 0:
+                boundary[0] = position
+                for line in pending:
+                    yield line.decode("utf-8")
+                pending, quotes = [], 0
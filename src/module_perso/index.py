@@ -0,0 +1,289 @@
+from array import array
+from bisect import bisect_left, bisect_right
+import logging
+import os
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+_EMPTY = array("I")
+
+
+def trigrams(text):
+    """Retourne l'ensemble des trigrammes d'une chaîne."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def sidecar_path(fingerprint, suffix, output_dir):
+    """
+    Construit le chemin d'un fichier annexe (index, cache…) pour le fichier source décrit par `fingerprint`.
+    Le nom contient un hachage du chemin absolu pour distinguer deux fichiers homonymes.
+    """
+    import hashlib
+
+    source_path = fingerprint[0]
+    digest = hashlib.sha1(source_path.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(output_dir, f"{os.path.basename(source_path)}.{digest}{suffix}")
+
+
+class TrigramIndex:
+    """
+    Index inversé de trigrammes sur une colonne de noms.
+    - Les noms sont mis en minuscules une seule fois, à la construction.
+    - Une recherche par sous-chaîne ne vérifie que les lignes candidates.
+    - Le fichier annexe ne contient que les listes de trigrammes : relu, l'index vérifie les candidats
+      directement dans la colonne des noms, sans mettre tous les noms en minuscules.
+    """
+
+    SUFFIX = ".trigram.idx"
+    VERSION = 2
+
+    def __init__(self, names, fingerprint=None):
+        self.fingerprint = fingerprint
+        self._column = names
+        self._names = [name.lower() for name in names]
+        self.size = len(self._names)
+        self.postings = {}
+        for row_id, name in enumerate(self._names):
+            for gram in trigrams(name):
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array("I")
+                posting.append(row_id)
+
+    @property
+    def names(self):
+        """Noms en minuscules (calculés à la première utilisation pour un index relu)."""
+        if self._names is None:
+            self._names = [name.lower() for name in self._column]
+        return self._names
+
+    def matcher(self, query):
+        """Retourne le test `row_id -> bool` « le nom contient `query` » (insensible à la casse)."""
+        needle = query.lower()
+        if self._names is not None:
+            names = self._names
+            return lambda row_id: needle in names[row_id]
+        column = self._column
+        return lambda row_id: needle in column[row_id].lower()
+
+    def candidates(self, query):
+        """Retourne les identifiants de lignes pouvant contenir `query` (triés)."""
+        grams = trigrams(query.lower())
+        if not grams:
+            return range(self.size)
+        postings = sorted((self.postings.get(gram, _EMPTY) for gram in grams), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result.intersection_update(posting)
+        return sorted(result)
+
+    def estimate(self, query):
+        """Estime le nombre de lignes candidates pour `query` (taille de la plus petite liste)."""
+        grams = trigrams(query.lower())
+        if not grams:
+            return self.size
+        return min(len(self.postings.get(gram, _EMPTY)) for gram in grams)
+
+    def search(self, query):
+        """Retourne les identifiants des lignes dont le nom contient `query` (insensible à la casse)."""
+        return list(filter(self.matcher(query), self.candidates(query)))
+
+    def save(self, path):
+        """Enregistre l'index dans un fichier annexe (sans les noms, déjà présents dans la source)."""
+        import pickle
+
+        payload = {
+            "version": self.VERSION,
+            "fingerprint": self.fingerprint,
+            "size": self.size,
+            "postings": self.postings,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        logger.info("Index de trigrammes enregistré : %s", path)
+
+    @classmethod
+    def load(cls, path, fingerprint, names):
+        """
+        Charge l'index depuis `path` ; retourne None s'il est absent, corrompu ou périmé.
+        `names` est la colonne des noms du fichier, consultée pour vérifier les candidats.
+        """
+        import pickle
+
+        try:
+            with open(path, "rb") as file:
+                payload = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Index de trigrammes illisible, il sera reconstruit : %s (%s)", path, e)
+            return None
+        if (
+            payload.get("version") != cls.VERSION
+            or tuple(payload.get("fingerprint") or ()) != tuple(fingerprint)
+            or payload.get("size") != len(names)
+        ):
+            logger.info("Index de trigrammes périmé : %s", path)
+            return None
+        index = cls.__new__(cls)
+        index.fingerprint = fingerprint
+        index._column = names
+        index._names = None
+        index.size = payload["size"]
+        index.postings = payload["postings"]
+        return index
+
+    @classmethod
+    def load_or_build(cls, fingerprint, names, output_dir):
+        """
+        Retourne l'index du fichier décrit par `fingerprint` (chemin, taille, date de modification).
+        L'index annexe est réutilisé s'il est à jour, sinon il est reconstruit à partir de `names` et enregistré.
+        """
+        if fingerprint is None or output_dir is None:
+            return cls(names)
+        path = sidecar_path(fingerprint, cls.SUFFIX, output_dir)
+        index = cls.load(path, fingerprint, names)
+        if index is not None:
+            logger.debug("Index de trigrammes réutilisé : %s", path)
+            return index
+
+        index = cls(names, fingerprint)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            index.save(path)
+        except OSError as e:
+            logger.warning("Impossible d'enregistrer l'index de trigrammes : %s", e)
+        return index
+
+
+class CategoryIndex:
+    """Index de hachage catégorie (insensible à la casse) -> identifiants de lignes triés."""
+
+    def __init__(self, column):
+        by_code = [array("I") for _ in column.values]
+        for row_id, code in enumerate(column.codes):
+            by_code[code].append(row_id)
+        self.postings = {}
+        for value, row_ids in zip(column.values, by_code):
+            key = value.lower()
+            existing = self.postings.get(key)
+            self.postings[key] = row_ids if existing is None else array("I", sorted(existing + row_ids))
+
+    def lookup(self, category):
+        return self.postings.get(category.lower(), _EMPTY)
+
+
+class PriceIndex:
+    """Index des prix triés, interrogé par recherche dichotomique."""
+
+    def __init__(self, prices):
+        order = sorted(range(len(prices)), key=prices.__getitem__)
+        self.row_ids = array("I", order)
+        self.prices = array("d", (prices[row_id] for row_id in order))
+
+    def _bounds(self, min_price, max_price):
+        return bisect_left(self.prices, min_price), bisect_right(self.prices, max_price)
+
+    def count(self, min_price, max_price):
+        start, stop = self._bounds(min_price, max_price)
+        return max(stop - start, 0)
+
+    def range(self, min_price, max_price):
+        """Retourne les identifiants des lignes dont le prix est dans [min_price, max_price]."""
+        start, stop = self._bounds(min_price, max_price)
+        return self.row_ids[start:stop]
+
+
+class InventoryIndexes:
+    """
+    Index secondaires d'un inventaire, construits à la demande puis conservés (index « chauds »).
+    Un petit planificateur part du filtre le plus sélectif et vérifie les autres sur les seules lignes candidates.
+    """
+
+    def __init__(self, inventory, output_dir=None):
+        self._inventory = inventory
+        self._output_dir = output_dir
+        self._names = None
+        self._categories = None
+        self._prices = None
+
+    @property
+    def names(self):
+        if self._names is None:
+            self._names = TrigramIndex.load_or_build(self._inventory.source, self._inventory.column("name"), self._output_dir)
+        return self._names
+
+    @property
+    def categories(self):
+        if self._categories is None:
+            self._categories = CategoryIndex(self._inventory.column("category"))
+        return self._categories
+
+    @property
+    def prices(self):
+        if self._prices is None:
+            self._prices = PriceIndex(self._inventory.column("price"))
+        return self._prices
+
+    def plan(self, query=None, category=None, price_range=None):
+        """
+        Retourne la liste des filtres (nom, estimation) triée du plus au moins sélectif.
+        L'index des prix n'est choisi comme point de départ que s'il est déjà construit
+        ou s'il s'agit du seul filtre : le construire coûte plus qu'un parcours des candidats.
+        """
+        steps = []
+        if category:
+            steps.append(("category", len(self.categories.lookup(category))))
+        if query:
+            steps.append(("name", self.names.estimate(query)))
+        if price_range:
+            if self._prices is not None or not steps:
+                steps.append(("price", self.prices.count(*price_range)))
+            else:
+                steps.append(("price", len(self._inventory)))
+        steps.sort(key=lambda step: step[1])
+        return steps
+
+    def search(self, query=None, category=None, price_range=None):
+        """Retourne les identifiants (triés) des lignes satisfaisant tous les filtres fournis."""
+        return list(self.iter_search(query, category, price_range))
+
+    def iter_search(self, query=None, category=None, price_range=None):
+        """
+        Produit, dans l'ordre croissant, les identifiants des lignes satisfaisant tous les filtres.
+        Les filtres secondaires ne sont évalués qu'au fur et à mesure de la consommation du générateur.
+        """
+        steps = self.plan(query, category, price_range)
+        logger.debug("Plan de recherche : %s", steps)
+        if not steps:
+            yield from range(len(self._inventory))
+            return
+
+        driver = steps[0][0]
+        if driver == "category":
+            candidates = self.categories.lookup(category)
+        elif driver == "name":
+            candidates = self.names.candidates(query)
+        else:
+            candidates = sorted(self.prices.range(*price_range))
+
+        predicates = []
+        if query:
+            predicates.append(self.names.matcher(query))
+        if category and driver != "category":
+            column = self._inventory.column("category")
+            codes, wanted = column.codes, column.codes_matching(category)
+            predicates.append(lambda row_id: codes[row_id] in wanted)
+        if price_range and driver != "price":
+            prices = self._inventory.column("price")
+            min_price, max_price = price_range
+            predicates.append(lambda row_id: min_price <= prices[row_id] <= max_price)
+
+        for row_id in candidates:
+            if all(predicate(row_id) for predicate in predicates):
+                yield row_id
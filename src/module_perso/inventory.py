@@ -0,0 +1,198 @@
+from array import array
+import operator
+
+# Colonnes numériques stockées dans des tampons typés (code de type `array`)
+NUMERIC_COLUMNS = {"price": "d", "quantity": "q"}
+# Colonnes de chaînes à faible cardinalité encodées par dictionnaire
+ENCODED_COLUMNS = ("category",)
+
+
+def _int64(text):
+    """Convertit en entier représentable dans une colonne `array("q")` ; lève `ValueError` sinon."""
+    value = int(text)
+    if not -0x8000000000000000 <= value <= 0x7FFFFFFFFFFFFFFF:
+        raise ValueError(f"entier hors limites (64 bits) : {text!r}")
+    return value
+
+
+CONVERTERS = {"d": float, "q": _int64}
+
+
+class DictionaryColumn:
+    """Colonne de chaînes encodée par dictionnaire : chaque valeur distincte n'est stockée qu'une fois."""
+
+    def __init__(self):
+        self.codes = array("I")
+        self.values = []
+        self._lookup = {}
+
+    @classmethod
+    def from_parts(cls, codes, values):
+        """Reconstruit une colonne à partir de ses codes et de ses valeurs distinctes."""
+        column = cls()
+        column.codes = codes
+        column.values = values
+        column._lookup = {value: code for code, value in enumerate(values)}
+        return column
+
+    def append(self, value):
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self._lookup[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def codes_matching(self, value, ignore_case=True):
+        """Retourne l'ensemble des codes dont la valeur correspond à `value`."""
+        if not ignore_case:
+            code = self._lookup.get(value)
+            return set() if code is None else {code}
+        value = value.lower()
+        return {code for code, candidate in enumerate(self.values) if candidate.lower() == value}
+
+    def __getitem__(self, index):
+        return self.values[self.codes[index]]
+
+    def __iter__(self):
+        values = self.values
+        return (values[code] for code in self.codes)
+
+    def __len__(self):
+        return len(self.codes)
+
+
+class Inventory:
+    """
+    Stockage en colonnes d'un inventaire.
+    - Les colonnes `price` et `quantity` sont converties une seule fois au chargement dans des tableaux typés.
+    - Les colonnes comme `category` sont encodées par dictionnaire.
+    - Les autres colonnes restent des listes de chaînes.
+    - Le texte d'origine d'une valeur numérique qui ne se réécrit pas à l'identique (« 10.50 », « 05 »…)
+      est conservé à part, pour que les lignes reconstruites reproduisent exactement le fichier.
+    """
+
+    def __init__(self, fieldnames=()):
+        self._fieldnames = list(fieldnames)
+        self._columns = {name: self._new_column(name) for name in self._fieldnames}
+        # Colonne numérique -> {identifiant de ligne: texte d'origine}, pour les seules valeurs non canoniques
+        self._texts = {name: {} for name in self._fieldnames if name in NUMERIC_COLUMNS}
+        self._size = 0
+        self.source = None  # Empreinte du fichier source, renseignée au chargement
+
+    @staticmethod
+    def _new_column(name):
+        if name in NUMERIC_COLUMNS:
+            return array(NUMERIC_COLUMNS[name])
+        if name in ENCODED_COLUMNS:
+            return DictionaryColumn()
+        return []
+
+    @classmethod
+    def from_rows(cls, rows, fieldnames=None):
+        """
+        Construit un inventaire à partir d'un itérable de dictionnaires.
+        Lève `ValueError` si une valeur numérique est invalide ou si une colonne manque.
+        """
+        rows = iter(rows)
+        if fieldnames is None:
+            first = next(rows, None)
+            if first is None:
+                return cls()
+            inventory = cls(first.keys())
+            inventory.append(first)
+        else:
+            inventory = cls(fieldnames)
+        for row in rows:
+            inventory.append(row)
+        return inventory
+
+    @classmethod
+    def from_values(cls, fieldnames, rows):
+        """
+        Construit un inventaire à partir de couples (valeurs converties, chaînes d'origine) déjà validés
+        (listes dans l'ordre de `fieldnames`, voir `schema.Schema.split`) : chaque valeur est ajoutée
+        directement à sa colonne.
+        """
+        inventory = cls(fieldnames)
+        appenders = [inventory._columns[name].append for name in inventory._fieldnames]
+        numeric = [(index, inventory._texts[name]) for index, name in enumerate(inventory._fieldnames) if name in NUMERIC_COLUMNS]
+        size = 0
+        for values, texts in rows:
+            for append, value in zip(appenders, values):
+                append(value)
+            for index, originals in numeric:
+                if str(values[index]) != texts[index]:
+                    originals[size] = texts[index]
+            size += 1
+        inventory._size = size
+        return inventory
+
+    @classmethod
+    def from_columns(cls, fieldnames, columns, size, texts=None):
+        """
+        Construit un inventaire à partir de colonnes déjà typées (par ex. projetées depuis un cache).
+        `texts` : textes d'origine des valeurs numériques non canoniques, par colonne.
+        """
+        inventory = cls()
+        inventory._fieldnames = list(fieldnames)
+        inventory._columns = dict(columns)
+        inventory._texts = {name: {} for name in inventory._fieldnames if name in NUMERIC_COLUMNS}
+        inventory._texts.update(texts or {})
+        inventory._size = size
+        return inventory
+
+    @property
+    def fieldnames(self):
+        return list(self._fieldnames)
+
+    def append(self, row):
+        """Ajoute une ligne (dictionnaire de chaînes) en convertissant ses valeurs numériques."""
+        line = self._size + 2  # Numéro de ligne dans le fichier, en-tête compris
+        for name in self._fieldnames:
+            column = self._columns[name]
+            try:
+                value = row[name]
+            except KeyError:
+                raise ValueError(f"Colonne '{name}' manquante à la ligne {line}")
+            if name in NUMERIC_COLUMNS:
+                try:
+                    number = CONVERTERS[NUMERIC_COLUMNS[name]](value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Valeur invalide pour '{name}' à la ligne {line} : {value!r}")
+                if isinstance(value, str) and str(number) != value:
+                    self._texts[name][self._size] = value
+                value = number
+            column.append(value)
+        self._size += 1
+
+    def column(self, name):
+        """Retourne la colonne `name` (tableau typé, colonne encodée ou liste)."""
+        return self._columns[name]
+
+    def texts(self, name):
+        """Retourne les textes d'origine non canoniques de la colonne numérique `name` ({ligne: texte})."""
+        return self._texts[name]
+
+    def row(self, index):
+        """Reconstruit la ligne `index` sous forme de dictionnaire de chaînes, telles qu'elles figurent dans le fichier."""
+        row = {name: str(self._columns[name][index]) for name in self._fieldnames}
+        for name, originals in self._texts.items():
+            text = originals.get(index)
+            if text is not None:
+                row[name] = text
+        return row
+
+    def rows(self, indices=None):
+        """Produit les lignes demandées (toutes par défaut) sous forme de dictionnaires."""
+        indices = range(self._size) if indices is None else indices
+        return (self.row(index) for index in indices)
+
+    def total_quantity(self):
+        return sum(self._columns["quantity"])
+
+    def total_value(self):
+        return sum(map(operator.mul, self._columns["price"], self._columns["quantity"]))
+
+    def __len__(self):
+        return self._size
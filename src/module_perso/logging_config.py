@@ -1,12 +1,13 @@
-import logging
-import logging.config
 import os
+import threading
 
 LOG_DIR = os.path.join(os.path.dirname(__file__), "../logs")
-os.makedirs(LOG_DIR, exist_ok=True)  # Crée le répertoire des logs s'il n'existe pas
 
 LOG_FILE = os.path.join(LOG_DIR, "application.log")
 
+# À passer en `extra` des messages émis pour chaque ligne traitée : ils sont soumis à l'échantillonnage
+PER_ROW = {"sampled": True}
+
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -18,17 +19,25 @@ LOGGING_CONFIG = {
             "format": "%(asctime)s - %(name)s - [%(levelname)s] - %(filename)s:%(lineno)d - %(message)s",
         },
     },
+    "filters": {
+        "sampling": {
+            "()": "module_perso.logging_config.SamplingFilter",
+        },
+    },
     "handlers": {
         "console": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
             "formatter": "default",
+            "filters": ["sampling"],
         },
         "file": {
             "level": "INFO",
             "class": "logging.FileHandler",
             "filename": LOG_FILE,
             "formatter": "detailed",
+            "delay": True,  # Le fichier n'est ouvert qu'au premier message écrit
+            "filters": ["sampling"],
         },
     },
     "root": {
@@ -37,6 +46,93 @@ LOGGING_CONFIG = {
     },
 }
 
+_listener = None
+
+
+class SamplingFilter:
+    """
+    Échantillonne les messages émis pour chaque ligne (marqués avec `extra=PER_ROW`).
+    - `every` : ne garde qu'un message sur N pour un même événement (même gabarit de message).
+    - `per_second` : au plus N messages par seconde pour un même événement.
+    Les autres messages ne sont jamais filtrés. La décision est mémorisée sur l'enregistrement,
+    de sorte que tous les gestionnaires partageant ce filtre voient le même échantillon.
+    """
+
+    def __init__(self, every=1, per_second=None):
+        self.every = max(int(every or 1), 1)
+        self.per_second = per_second
+        self._counts = {}
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if not getattr(record, "sampled", False):
+            return True
+        keep = getattr(record, "sample_keep", None)
+        if keep is None:
+            keep = record.sample_keep = self._decide(record.msg, int(record.created))
+        return keep
+
+    def _decide(self, key, second):
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+            if count % self.every:
+                return False
+            if self.per_second:
+                window, emitted = self._windows.get(key, (second, 0))
+                if window != second:
+                    window, emitted = second, 0
+                if emitted >= self.per_second:
+                    return False
+                self._windows[key] = (window, emitted + 1)
+            return True
+
+
+def configure_logging(level="DEBUG", async_logging=False, sample_every=1, rate_limit=None):
+    """
+    Configure la journalisation ; le répertoire des logs n'est créé qu'à ce moment-là.
+    - `level` : niveau du logger racine.
+    - `async_logging` : les messages passent par une file (QueueHandler) et sont écrits par un
+      thread dédié (QueueListener), sans bloquer le traitement sur les entrées/sorties.
+    - `sample_every` / `rate_limit` : échantillonnage des messages émis pour chaque ligne.
+    Retourne le QueueListener démarré en mode asynchrone, sinon None.
+    """
+    import copy
+    import logging
+    import logging.config
+
+    global _listener
+    stop_listener()
+
+    config = copy.deepcopy(LOGGING_CONFIG)
+    config["root"]["level"] = level
+    config["handlers"]["file"]["filename"] = LOG_FILE
+    config["filters"]["sampling"].update(every=sample_every, per_second=rate_limit)
+
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)  # Crée le répertoire des logs s'il n'existe pas
+    logging.config.dictConfig(config)
+
+    if async_logging:
+        import atexit
+        import logging.handlers
+        import queue
+
+        root = logging.getLogger()
+        handlers = list(root.handlers)
+        queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        for log_filter in {id(f): f for handler in handlers for f in handler.filters}.values():
+            queue_handler.addFilter(log_filter)  # Les messages écartés ne sont même pas mis en file
+        root.handlers = [queue_handler]
+        _listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_listener)
+    return _listener
+
 
-def configure_logging():
-    logging.config.dictConfig(LOGGING_CONFIG)
+def stop_listener():
+    """Vide la file de messages et arrête le thread d'écriture (sans effet en mode synchrone)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,145 @@
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+
+from module_perso.pipeline import TMP_PREFIX
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+# Fichiers retenus lorsqu'un répertoire est donné sans motif
+CSV_SUFFIXES = (".csv", ".csv.gz", ".csv.bz2", ".csv.xz", ".csv.lzma")
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def scan(pattern, search_dirs=()):
+    """
+    Liste les fichiers d'un répertoire (fichiers CSV, compressés ou non) ou correspondant à un motif glob
+    sur le nom de fichier (ex. : « fournisseurs/*.csv.gz »), en un seul parcours `os.scandir`.
+    Un chemin relatif est cherché tel quel, puis dans chacun des `search_dirs`.
+    Les fichiers temporaires laissés par une écriture interrompue (préfixe `TMP_PREFIX`) sont ignorés.
+    Retourne les chemins absolus, triés par nom. Lève `FileNotFoundError` si le répertoire est introuvable.
+    """
+    if os.path.isdir(pattern) or not any(char in os.path.basename(pattern) for char in "*?["):
+        directory, name_pattern = pattern, None
+    else:
+        directory, name_pattern = os.path.split(pattern)
+    directory = directory or "."
+    candidates = [directory]
+    if not os.path.isabs(directory):
+        candidates += [os.path.join(search_dir, directory) for search_dir in search_dirs]
+    found = next((candidate for candidate in candidates if os.path.isdir(candidate)), None)
+    if found is None:
+        raise FileNotFoundError(f"Répertoire introuvable : {directory}")
+
+    with os.scandir(found) as entries:
+        paths = [
+            os.path.abspath(entry.path)
+            for entry in entries
+            if entry.is_file() and not entry.name.startswith(TMP_PREFIX) and (
+                fnmatch.fnmatch(entry.name, name_pattern) if name_pattern else entry.name.lower().endswith(CSV_SUFFIXES)
+            )
+        ]
+    logger.info("%s fichier(s) trouvé(s) pour %s dans %s", len(paths), pattern, found)
+    return sorted(paths)
+
+
+def file_hash(path):
+    """Empreinte SHA-1 du contenu d'un fichier, lu par blocs."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    Manifeste d'un fichier consolidé : en-tête, taille et date de modification du fichier consolidé,
+    et, pour chaque fichier d'entrée déjà consolidé, sa taille, sa date de modification et l'empreinte
+    de son contenu. Il permet de n'ajouter que les nouveaux fichiers lors d'une nouvelle consolidation.
+    - Un fichier dont seule la date a changé (même contenu) n'est pas relu.
+    - Un fichier modifié ou supprimé, un en-tête différent ou un fichier consolidé modifié entre-temps
+      imposent une reconstruction complète.
+    """
+
+    SUFFIX = ".manifest.json"
+    VERSION = 1
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.path = output_path + self.SUFFIX
+        self.fieldnames = None
+        self.files = {}
+        self.output = None
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return self
+        except (OSError, ValueError) as e:
+            logger.warning("Manifeste illisible, la consolidation sera reconstruite : %s (%s)", self.path, e)
+            return self
+        if state.get("version") == self.VERSION:
+            self.fieldnames = state["fieldnames"]
+            self.files = state["files"]
+            self.output = state["output"]
+        return self
+
+    def plan(self, paths, fieldnames):
+        """
+        Compare les fichiers d'entrée au manifeste.
+        Retourne `(fichiers à lire, motif)` : sans motif, les fichiers à lire sont les seuls nouveaux fichiers
+        à ajouter au fichier consolidé ; sinon, le motif explique pourquoi tout doit être reconstruit.
+        """
+        if self.output is None:
+            return paths, "aucun manifeste"
+        if self.fieldnames != list(fieldnames):
+            return paths, "en-tête différent"
+        try:
+            stat = os.stat(self.output_path)
+        except OSError:
+            return paths, "fichier consolidé absent"
+        if [stat.st_size, stat.st_mtime_ns] != self.output:
+            return paths, "fichier consolidé modifié depuis la dernière consolidation"
+        removed = set(self.files).difference(map(os.path.abspath, paths))
+        if removed:
+            return paths, f"{len(removed)} fichier(s) retiré(s) : {sorted(removed)[0]}…"
+
+        new = []
+        for path in paths:
+            entry = self.files.get(os.path.abspath(path))
+            if entry is None:
+                new.append(path)
+                continue
+            stat = os.stat(path)
+            if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+                continue
+            if stat.st_size == entry["size"] and file_hash(path) == entry["sha1"]:
+                entry["mtime_ns"] = stat.st_mtime_ns  # Date modifiée, contenu identique
+                continue
+            return paths, f"fichier modifié : {path}"
+        return new, None
+
+    def record(self, paths, fieldnames):
+        """Enregistre les fichiers consolidés et l'état du fichier consolidé (écriture atomique)."""
+        for path in paths:
+            stat = os.stat(path)
+            self.files[os.path.abspath(path)] = {
+                "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": file_hash(path),
+            }
+        stat = os.stat(self.output_path)
+        self.fieldnames = list(fieldnames)
+        self.output = [stat.st_size, stat.st_mtime_ns]
+        state = {"version": self.VERSION, "fieldnames": self.fieldnames, "output": self.output, "files": self.files}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(state, file, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def reset(self):
+        self.files = {}
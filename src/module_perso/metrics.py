@@ -0,0 +1,151 @@
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+COUNTERS = ("bytes_read", "rows_parsed", "rows_matched", "rows_written")
+
+
+class Metrics:
+    """
+    Minuteurs par étape et compteurs d'une exécution (options --stats et --metrics-file).
+    - Les étapes imbriquées sont décomptées de l'étape englobante : chaque durée est un temps propre
+      et la somme des étapes ne compte jamais deux fois le même intervalle.
+    - Désactivées par défaut : chaque point d'instrumentation ne coûte alors qu'un test de `enabled`.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.enabled = False
+        self.counters = {}
+        self.timings = {}
+        self._stack = []
+        self._started = None
+
+    def enable(self):
+        self.enabled = True
+        self._started = time.perf_counter()
+
+    def add(self, name, value=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def _record(self, stage, elapsed, children):
+        self.timings[stage] = self.timings.get(stage, 0.0) + elapsed - children
+        if self._stack:
+            self._stack[-1] += elapsed
+
+    def stage(self, name):
+        """Chronomètre un bloc `with` ; les durées d'une même étape sont cumulées."""
+        return self._stage(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _stage(self, name):
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._record(name, elapsed, self._stack.pop())
+
+    def timed(self, stage, iterable, counter=None):
+        """
+        Chronomètre le seul temps passé à produire les éléments de `iterable` (pas celui du consommateur)
+        et compte les éléments produits dans `counter`.
+        """
+        return self._timed(stage, iterable, counter) if self.enabled else iterable
+
+    def _timed(self, stage, iterable, counter):
+        iterator = iter(iterable)
+        clock = time.perf_counter
+        count = 0
+        try:
+            while True:
+                self._stack.append(0.0)
+                start = clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    self._record(stage, clock() - start, self._stack.pop())
+                count += 1
+                yield item
+        finally:
+            if counter:
+                self.add(counter, count)
+
+    def as_dict(self):
+        wall = time.perf_counter() - self._started if self._started else 0.0
+        counters = dict.fromkeys(COUNTERS, 0)
+        counters.update(self.counters)
+        return {"wall_s": wall, "stages_s": dict(self.timings), "counters": counters}
+
+    def report(self, stream=None):
+        """Écrit un résumé lisible (par défaut sur la sortie d'erreur)."""
+        stream = stream or sys.stderr
+        data = self.as_dict()
+        wall = data["wall_s"] or 1.0
+        stream.write("Statistiques d'exécution :\n")
+        for name, seconds in sorted(data["stages_s"].items(), key=lambda item: item[1], reverse=True):
+            stream.write(f"  {name:<20} {seconds * 1000:>12.2f} ms {seconds / wall:>7.1%}\n")
+        stream.write(f"  {'total':<20} {data['wall_s'] * 1000:>12.2f} ms\n")
+        for name, value in data["counters"].items():
+            stream.write(f"  {name:<20} {value:>12}\n")
+        parse_time = data["stages_s"].get("parse")
+        if parse_time:
+            stream.write(f"  {'débit analyse':<20} {data['counters']['rows_parsed'] / parse_time:>12.0f} lignes/s\n")
+
+    def save(self, path):
+        """Enregistre les mesures au format JSON."""
+        import json
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.as_dict(), file, indent=2)
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def instrument(stats=False, metrics_file=None, profile=None, trace_memory=0, stream=None):
+    """
+    Instrumente le bloc `with` selon les options de la ligne de commande :
+    - `stats` / `metrics_file` : active `metrics`, puis écrit le résumé sur la sortie d'erreur et/ou le fichier JSON.
+    - `profile` : profil cProfile enregistré dans ce fichier (lisible avec pstats ou snakeviz).
+    - `trace_memory` : suit les allocations avec tracemalloc et affiche les N plus gros sites d'allocation.
+    """
+    stream = stream or sys.stderr
+    if stats or metrics_file:
+        metrics.enable()
+    profiler = None
+    if profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    if trace_memory:
+        import tracemalloc
+
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(profile)
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            metrics.add("memory_peak_bytes", peak)
+            stream.write(f"Mémoire allouée (pic) : {peak / 1024:.1f} Kio\n")
+            for statistic in snapshot.statistics("lineno")[:trace_memory]:
+                stream.write(f"  {statistic}\n")
+        if stats:
+            metrics.report(stream)
+        if metrics_file:
+            metrics.save(metrics_file)
@@ -1,5 +1,20 @@
 import argparse
-from module_perso.csv_manager import CSVManager
+from module_perso.external import MERGE_POLICIES
+from module_perso.formats import FORMATS
+from module_perso.paths import INPUT_DIR, OUTPUT_DIR
+from module_perso.ranking import SORT_KEYS
+
+
+def parse_size(value):
+    """Convertit une taille (« 512M », « 2G », « 1024 ») en octets."""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = value.strip().upper().removesuffix("B")
+    try:
+        if text and text[-1] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"taille invalide : {value}")
 
 
 def secluded_parser():
@@ -8,38 +23,162 @@ def secluded_parser():
     parser = argparse.ArgumentParser(
         description="Un outil pour consolider, rechercher et générer des rapports à partir de fichiers CSV.",
         epilog=f"Répertoires par défaut :\n"
-        f"  - Entrée : {CSVManager.INPUT_DIR}\n"
-        f"  - Sortie : {CSVManager.OUTPUT_DIR}",
+        f"  - Entrée : {INPUT_DIR}\n"
+        f"  - Sortie : {OUTPUT_DIR}",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
 
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Utiliser un cache binaire des fichiers CSV (réutilisé tant que le fichier source est inchangé)",
+    )
+
+    parser.add_argument(
+        "--quarantine",
+        metavar="FICHIER",
+        help="Écrire les lignes invalides dans ce fichier CSV (fichier source, numéro de ligne, motif) "
+        "et poursuivre la commande au lieu de l'interrompre",
+    )
+
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Afficher sur la sortie d'erreur le temps d'import et d'initialisation de chaque module",
+    )
+
+    parser.add_argument(
+        "--log-level",
+        default="DEBUG",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        help="Niveau de journalisation",
+    )
+    parser.add_argument(
+        "--async-logging",
+        action="store_true",
+        help="Écrire les logs depuis un thread dédié (QueueHandler/QueueListener)",
+    )
+    parser.add_argument(
+        "--log-sample",
+        type=int,
+        default=1,
+        help="Ne garder qu'un message sur N parmi les messages émis pour chaque ligne",
+    )
+    parser.add_argument(
+        "--log-rate-limit",
+        type=int,
+        help="Nombre maximal par seconde de messages émis pour chaque ligne",
+    )
+
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Afficher sur la sortie d'erreur le temps passé dans chaque étape et les compteurs (octets lus, lignes…)",
+    )
+    parser.add_argument(
+        "--metrics-file", help="Enregistrer les temps par étape et les compteurs dans ce fichier JSON"
+    )
+    parser.add_argument(
+        "--profile", metavar="FICHIER", help="Profiler l'exécution avec cProfile et enregistrer le profil dans ce fichier"
+    )
+    parser.add_argument(
+        "--trace-memory",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Suivre les allocations avec tracemalloc et afficher les N plus gros sites d'allocation",
+    )
+
     subparsers = parser.add_subparsers(dest="command", help="Sous-commandes disponibles")
 
     # Commande "consolidate"
     consolidate_parser = subparsers.add_parser(
         "consolidate", help="Consolider plusieurs fichiers CSV en un seul fichier"
     )
-    consolidate_parser.add_argument(
+    input_group = consolidate_parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument(
         "--files",
         nargs="+",
-        required=True,
         help="Liste des noms de fichiers CSV dans le répertoire 'input'",
     )
+    input_group.add_argument(
+        "--input",
+        help="Répertoire dont tous les fichiers CSV sont consolidés, ou motif glob (ex. : fournisseurs/*.csv.gz)",
+    )
     consolidate_parser.add_argument(
         "--output",
         default="consolidated.csv",
         help="Nom du fichier CSV consolidé dans le répertoire 'output'",
     )
+    consolidate_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Nombre de processus pour analyser les fichiers en parallèle (0 = tous les cœurs)",
+    )
+    consolidate_parser.add_argument(
+        "--key",
+        help="Colonnes identifiant un produit (ex. : name,category) : les lignes de même clé sont fusionnées",
+    )
+    consolidate_parser.add_argument(
+        "--merge-policy",
+        default="sum",
+        choices=MERGE_POLICIES,
+        help="Fusion des doublons : sum (quantités additionnées, dernier prix), last (dernière ligne) "
+        "ou min-price (quantités additionnées, prix le plus bas)",
+    )
+    consolidate_parser.add_argument(
+        "--memory-limit",
+        type=parse_size,
+        help="Budget mémoire de la fusion par clé et des runs du tri (ex. : 512M, 2G ; par défaut : 256M chacun) ; "
+        "au-delà, le travail se poursuit sur disque",
+    )
+    consolidate_parser.add_argument(
+        "--sort-by",
+        help="Trier le fichier consolidé par ces colonnes (ex. : category,name), par tri externe si nécessaire",
+    )
+    consolidate_parser.add_argument(
+        "--compress-level",
+        type=int,
+        choices=range(10),
+        metavar="0-9",
+        help="Niveau de compression du fichier consolidé si son nom se termine par .gz, .bz2, .xz ou .lzma "
+        "(0-9, 1-9 pour bz2 ; par défaut : 6 pour gzip et xz, 9 pour bz2)",
+    )
+    consolidate_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="N'ajouter au fichier consolidé existant que les fichiers apparus depuis la dernière consolidation "
+        "(manifeste : taille, date et empreinte de chaque fichier)",
+    )
 
     # Commande "search"
     search_parser = subparsers.add_parser(
         "search", help="Rechercher des informations dans un fichier CSV"
     )
-    search_parser.add_argument(
-        "--file", required=True, help="Nom du fichier CSV dans le répertoire 'input'"
+    file_group = search_parser.add_mutually_exclusive_group(required=True)
+    file_group.add_argument(
+        "--file", help="Nom du fichier CSV dans le répertoire 'input'"
     )
-    search_parser.add_argument(
-        "--query", required=True, help="Critère de recherche (nom du produit, catégorie, etc.)"
+    file_group.add_argument(
+        "--files",
+        nargs="+",
+        help="Rechercher dans plusieurs fichiers de même en-tête (motifs glob acceptés, ex. : 'magasins/*.csv'), "
+        "en parallèle et sans consolidation ; chaque résultat indique son fichier d'origine",
+    )
+    query_group = search_parser.add_mutually_exclusive_group(required=True)
+    query_group.add_argument(
+        "--query", help="Critère de recherche (nom du produit, catégorie, etc.)"
+    )
+    query_group.add_argument(
+        "--queries-file",
+        help="Fichier contenant une requête par ligne ('-' pour l'entrée standard), évaluées en une seule passe",
+    )
+    query_group.add_argument(
+        "--where",
+        help="Expression de filtre sur n'importe quelle colonne, ex. : \"catégorie=Vêtements prix<50\", "
+        "\"nom^=Pomme OR (prix>=10 AND quantité IN (1,2))\" ; opérateurs = != < <= > >= ~ (contient) ^= (commence par) "
+        "IN, AND/OR/NOT (ou ET/OU/NON). --query accepte aussi une expression",
     )
     search_parser.add_argument(
         "--category", help="Filtrer les résultats par catégorie spécifique"
@@ -47,6 +186,43 @@ def secluded_parser():
     search_parser.add_argument(
         "--price-range", type=str, help="Filtrer par une plage de prix (format : min,max)"
     )
+    search_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Nombre de processus pour analyser un gros fichier par morceaux, ou les fichiers de --files "
+        "(0 = tous les cœurs ; par défaut : 1 avec --file, tous les cœurs avec --files)",
+    )
+    search_parser.add_argument(
+        "--format",
+        default="text",
+        choices=FORMATS,
+        help="Format de sortie des résultats (text : dictionnaires Python, csv, tsv ou jsonl)",
+    )
+    search_parser.add_argument(
+        "--limit",
+        type=int,
+        help="Nombre maximal de résultats (par requête avec --queries-file) ; la recherche s'arrête dès qu'il est atteint",
+    )
+    search_parser.add_argument(
+        "--sort-by",
+        choices=SORT_KEYS,
+        help="Trier les résultats par prix, quantité ou valeur du stock (prix × quantité)",
+    )
+    search_parser.add_argument(
+        "--desc", action="store_true", help="Trier par ordre décroissant"
+    )
+    search_parser.add_argument(
+        "--top",
+        type=int,
+        help="Ne garder que les K premiers résultats (tas borné : la mémoire reste proportionnelle à K)",
+    )
+    search_parser.add_argument(
+        "--offset",
+        type=int,
+        default=0,
+        help="Nombre de résultats à sauter (pagination, ordre stable)",
+    )
 
     # Commande "report"
     report_parser = subparsers.add_parser(
@@ -61,5 +237,30 @@ def secluded_parser():
     report_parser.add_argument(
         "--summary", action="store_true", help="Inclure un résumé dans le rapport"
     )
+    report_parser.add_argument(
+        "--group-by", help="Colonne de regroupement pour le détail des statistiques (ex. : category)"
+    )
+    report_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Nombre de processus pour l'analyse et l'agrégation (0 = tous les cœurs)",
+    )
+    report_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Réutiliser les agrégats en cache et n'analyser que les lignes ajoutées depuis le dernier rapport",
+    )
+
+    # Commande "serve"
+    serve_parser = subparsers.add_parser(
+        "serve", help="Garder des inventaires en mémoire et répondre aux requêtes search/report (JSON par ligne)"
+    )
+    serve_parser.add_argument(
+        "--files", nargs="+", required=True, help="Fichiers CSV à charger au démarrage"
+    )
+    serve_parser.add_argument(
+        "--socket", help="Chemin du socket Unix d'écoute (par défaut : entrée et sortie standard)"
+    )
 
     return parser
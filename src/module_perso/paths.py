@@ -0,0 +1,5 @@
+import os
+
+# Répertoires par défaut, définis sans dépendance pour rester légers à importer
+INPUT_DIR = os.path.join(os.path.dirname(__file__), "input")
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
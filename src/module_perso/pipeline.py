@@ -0,0 +1,94 @@
+import csv
+import logging
+import os
+import queue
+import threading
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 2048  # Lignes par lot transmis au thread d'écriture
+QUEUE_DEPTH = 16  # Nombre maximal de lots en attente (borne la mémoire si le disque est plus lent)
+WRITE_BUFFER = 1024 * 1024  # Taille du tampon du fichier de sortie : écritures par grands blocs
+TMP_PREFIX = ".tmp-"  # Préfixe des fichiers temporaires (voir `temporary_path`)
+
+
+class WriterThread:
+    """
+    Écrit des lots de lignes (listes de valeurs) dans un fichier CSV depuis un thread dédié.
+    Le thread appelant continue d'analyser et de préparer les lignes pendant que les précédentes
+    sont écrites (et compressées) ; la file bornée le ralentit si l'écriture ne suit pas.
+    Une erreur d'écriture est relancée dans le thread appelant (au lot suivant ou à `close`).
+    """
+
+    def __init__(self, file, depth=QUEUE_DEPTH):
+        self._writer = csv.writer(file)
+        self._queue = queue.Queue(depth)
+        self._error = None
+        self._thread = threading.Thread(target=self._drain, name="csv-writer", daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            if self._error is None:
+                try:
+                    self._writer.writerows(batch)
+                except Exception as e:
+                    self._error = e  # Les lots suivants sont ignorés jusqu'à `close`
+
+    def _check(self):
+        if self._error is not None:
+            raise self._error
+
+    def put(self, batch):
+        self._check()
+        if batch:
+            self._queue.put(batch)
+
+    def close(self):
+        """Attend l'écriture des lots en attente et relance l'éventuelle erreur du thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._check()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+            return
+        # Une exception est déjà en cours : elle est conservée, l'erreur d'écriture n'est que journalisée
+        try:
+            self.close()
+        except Exception as e:
+            logger.error("Erreur d'écriture ignorée (une autre erreur est en cours) : %s", e)
+
+
+def temporary_path(path):
+    """Chemin temporaire dans le même répertoire que `path` (même système de fichiers), extension conservée."""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f"{TMP_PREFIX}{os.getpid()}-{name}")
+
+
+def fsync(path, directory=False):
+    """Force l'écriture sur disque du contenu d'un fichier, ou des entrées d'un répertoire."""
+    fd = os.open(path, os.O_RDONLY | (os.O_DIRECTORY if directory and hasattr(os, "O_DIRECTORY") else 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def commit(tmp_path, path):
+    """Remplace atomiquement `path` par `tmp_path` une fois son contenu sur disque."""
+    fsync(tmp_path)
+    os.replace(tmp_path, path)
+    try:
+        fsync(os.path.dirname(path) or ".", directory=True)
+    except OSError:
+        pass  # Certains systèmes de fichiers ne permettent pas la synchronisation d'un répertoire
@@ -0,0 +1,37 @@
+import heapq
+import itertools
+
+SORT_KEYS = ("price", "quantity", "value")
+
+
+def sort_key(inventory, sort_by):
+    """Retourne la fonction identifiant de ligne -> valeur de tri (`value` = prix × quantité)."""
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Critère de tri inconnu : {sort_by} (attendu : {', '.join(SORT_KEYS)})")
+    if sort_by == "value":
+        prices, quantities = inventory.column("price"), inventory.column("quantity")
+        return lambda row_id: prices[row_id] * quantities[row_id]
+    return inventory.column(sort_by).__getitem__
+
+
+def select(row_ids, key=None, descending=False, top=None, offset=0):
+    """
+    Retourne un itérateur sur la page [offset, offset + top) des identifiants `row_ids`.
+    - Sans `key`, l'ordre d'entrée est conservé et la lecture s'arrête à la fin de la page.
+    - Avec `key`, les lignes sont classées par valeur puis par identifiant (ordre stable d'une page à l'autre).
+      Avec `top`, seul un tas borné de `offset + top` éléments est conservé : O(n log k) en temps, O(k) en mémoire.
+    """
+    stop = None if top is None else offset + top
+    if key is None:
+        return itertools.islice(row_ids, offset, stop)
+    if descending:
+        def ranked(row_id):
+            return -key(row_id), row_id
+    else:
+        def ranked(row_id):
+            return key(row_id), row_id
+    if stop is None:
+        ordered = sorted(row_ids, key=ranked)
+    else:
+        ordered = heapq.nsmallest(stop, row_ids, key=ranked)
+    return iter(ordered[offset:])
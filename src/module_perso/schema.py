@@ -0,0 +1,105 @@
+import csv
+import logging
+
+from module_perso.inventory import CONVERTERS, NUMERIC_COLUMNS
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+
+class Schema:
+    """
+    Schéma d'un fichier CSV, compilé une seule fois à partir de son en-tête.
+    Le convertisseur généré transforme une ligne (liste de chaînes) en une seule expression :
+    chaque valeur est convertie une fois, et la conversion sert aussi de validation.
+    """
+
+    def __init__(self, fieldnames):
+        self.fieldnames = list(fieldnames)
+        self.width = len(self.fieldnames)
+        self._numeric = [
+            (index, name, CONVERTERS[NUMERIC_COLUMNS[name]])
+            for index, name in enumerate(self.fieldnames)
+            if name in NUMERIC_COLUMNS
+        ]
+        self._convert = self._compile()
+
+    def _compile(self):
+        """Génère `lambda values: [values[0], float(values[2]), …]` pour l'en-tête du fichier."""
+        namespace = {f"convert_{typecode}": converter for typecode, converter in CONVERTERS.items()}
+        items = [
+            f"convert_{NUMERIC_COLUMNS[name]}(values[{index}])" if name in NUMERIC_COLUMNS else f"values[{index}]"
+            for index, name in enumerate(self.fieldnames)
+        ]
+        return eval(f"lambda values: [{', '.join(items)}]", namespace)
+
+    def parse(self, values):
+        """Retourne la ligne avec ses valeurs numériques converties ; lève `ValueError` si elle est invalide."""
+        if len(values) != self.width:
+            raise ValueError(f"{len(values)} colonne(s) au lieu de {self.width}")
+        try:
+            return self._convert(values)
+        except (TypeError, ValueError):
+            raise ValueError(self._describe(values))
+
+    def split(self, values):
+        """Retourne le couple (valeurs converties, chaînes d'origine), pour conserver le texte exact des nombres."""
+        return self.parse(values), values
+
+    def check(self, values):
+        """Valide la ligne et la retourne telle quelle (chaînes d'origine)."""
+        self.parse(values)
+        return values
+
+    def _describe(self, values):
+        for index, name, convert in self._numeric:
+            try:
+                convert(values[index])
+            except (TypeError, ValueError):
+                return f"valeur invalide pour '{name}' : {values[index]!r}"
+        return "valeur invalide"
+
+
+class Quarantine:
+    """
+    Fichier CSV des lignes rejetées : fichier source, numéro de ligne, motif, puis les valeurs d'origine.
+    Le fichier n'est créé qu'au premier rejet ; une même ligne n'est enregistrée qu'une fois,
+    même si son fichier est relu.
+    Sans `path`, les rejets sont seulement conservés dans `records` : un processus de travail les renvoie
+    ainsi au processus principal, qui les ajoute à sa propre quarantaine.
+    """
+
+    HEADER = ["source", "line", "error", "values"]
+
+    def __init__(self, path=None):
+        self.path = path
+        self.count = 0
+        self.records = []
+        self._file = None
+        self._writer = None
+        self._seen = set()
+
+    def add(self, source, line, reason, values):
+        if (source, line) in self._seen:
+            return
+        self._seen.add((source, line))
+        if self.path is None:
+            self.records.append((source, line, str(reason), list(values)))
+            self.count += 1
+            return
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.HEADER)
+        self._writer.writerow([source, line, str(reason), *values])
+        self.count += 1
+        logger.warning("Ligne %s de %s mise en quarantaine : %s", line, source, reason)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
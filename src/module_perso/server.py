@@ -0,0 +1,171 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+
+from module_perso.aggregate import aggregate_inventory
+from module_perso.csv_manager import Commerce, CSVError, CSV_FileNotFoundError, CSVManager
+
+# Initialisation du logger
+logger = logging.getLogger(__name__)
+
+
+class InventoryServer:
+    """
+    Serveur résident qui garde les inventaires chargés en mémoire avec leurs index.
+    - Les requêtes sont des objets JSON, une par ligne, reçus sur un socket Unix ou sur l'entrée standard.
+    - Chaque fichier est rechargé automatiquement lorsque son empreinte (taille, date) change sur le disque.
+
+    - Les requêtes sont traitées hors de la boucle d'événements (pool de threads) : un rechargement lent
+      ne bloque que les requêtes portant sur le même fichier.
+    - Une requête invalide ou une erreur inattendue produit une réponse `{"ok": false, "error": ...}`,
+      sans arrêter le serveur.
+
+    Exemple de requête : {"id": 1, "command": "search", "file": "products1.csv", "query": "apple"}
+    Les recherches acceptent aussi "category", "price_range" ([min, max] ou "min,max"), "limit", "offset",
+    "sort_by" (price, quantity, value) et "desc" pour paginer.
+    """
+
+    def __init__(self, files, use_cache=False):
+        self._use_cache = use_cache
+        self._entries = {}
+        self._aliases = {}
+        self._locks = {}
+        for file_name in files:
+            self._load(file_name)
+
+    def _load(self, file_name):
+        path = CSVManager(file_name).file_path
+        commerce = Commerce(use_cache=self._use_cache)
+        commerce.load(path)
+        self._entries[path] = commerce
+        self._aliases[file_name] = path
+        self._locks.setdefault(path, threading.Lock())
+        logger.info("Inventaire servi : %s (%s lignes)", path, len(commerce.data))
+        return commerce
+
+    def _get(self, file_name):
+        """Retourne l'inventaire demandé, rechargé s'il a changé sur le disque."""
+        path = self._aliases.get(file_name, file_name)
+        commerce = self._entries.get(path)
+        if commerce is None:
+            raise CSVError(f"Fichier non servi : {file_name}")
+        try:
+            if CSVManager(path).fingerprint() != tuple(commerce.data.source):
+                with self._locks[path]:  # Un seul rechargement à la fois par fichier
+                    commerce = self._entries[path]
+                    if CSVManager(path).fingerprint() != tuple(commerce.data.source):
+                        logger.info("Fichier modifié, rechargement : %s", path)
+                        commerce = self._load(path)
+        except OSError as e:
+            logger.error("Fichier servi inaccessible : %s (%s)", path, e)
+            raise CSV_FileNotFoundError(f"Fichier servi inaccessible : {file_name} ({e})")
+        return commerce
+
+    @staticmethod
+    def _field(request, name, types, required=False):
+        """Retourne le champ `name` de la requête après vérification de son type (None s'il est absent)."""
+        value = request.get(name)
+        if value is None:
+            if required:
+                raise ValueError(f"champ '{name}' manquant")
+            return None
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            raise ValueError(f"champ '{name}' invalide : {value!r}")
+        return value
+
+    def _price_range(self, request):
+        """Accepte une plage de prix [min, max] ou « min,max »."""
+        price_range = self._field(request, "price_range", (list, str))
+        if isinstance(price_range, list) and (
+            len(price_range) != 2 or not all(isinstance(bound, (int, float)) and not isinstance(bound, bool) for bound in price_range)
+        ):
+            raise ValueError(f"champ 'price_range' invalide (attendu : [min, max]) : {price_range!r}")
+        return price_range
+
+    def handle(self, request):
+        """Traite une requête (dictionnaire) et retourne la réponse (dictionnaire)."""
+        response = {"id": request.get("id")}
+        try:
+            command = request.get("command")
+            if command == "search":
+                query = self._field(request, "query", str)
+                category = self._field(request, "category", str)
+                price_range = self._price_range(request)
+                sort_by = self._field(request, "sort_by", str)
+                limit = self._field(request, "limit", int)
+                offset = self._field(request, "offset", int) or 0
+                commerce = self._get(self._field(request, "file", str, required=True))
+                row_ids = commerce.select(
+                    commerce.iter_find(query, category, price_range), sort_by, bool(request.get("desc")), limit, offset,
+                )
+                response["results"] = list(commerce.data.rows(row_ids))
+            elif command == "report":
+                group_by = self._field(request, "group_by", str)
+                commerce = self._get(self._field(request, "file", str, required=True))
+                aggregator = aggregate_inventory(commerce.data, group_by)
+                response["totals"] = aggregator.total()
+                if group_by:
+                    response["groups"] = {str(key): stats for key, stats in aggregator.results().items()}
+            elif command == "files":
+                response["files"] = sorted(self._entries)
+            else:
+                raise CSVError(f"Commande inconnue : {command}")
+            response["ok"] = True
+        except (CSVError, KeyError, ValueError) as e:
+            response.update(ok=False, error=str(e))
+        except Exception as e:
+            logger.exception("Erreur inattendue lors du traitement de la requête %s", response["id"])
+            response.update(ok=False, error=f"Erreur inattendue : {e}")
+        return response
+
+    def handle_line(self, line):
+        """Traite une ligne JSON et retourne la réponse encodée (terminée par un saut de ligne)."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("la requête doit être un objet JSON")
+        except ValueError as e:
+            response = {"id": None, "ok": False, "error": f"Requête invalide : {e}"}
+        else:
+            response = self.handle(request)
+        return json.dumps(response, ensure_ascii=False) + "\n"
+
+    async def _client(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    response = await loop.run_in_executor(None, self.handle_line, line)
+                    writer.write(response.encode("utf-8"))
+                    await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve_unix(self, socket_path):
+        """Sert les requêtes sur un socket Unix ; plusieurs clients peuvent être connectés en même temps."""
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = await asyncio.start_unix_server(self._client, path=socket_path)
+        logger.info("Serveur à l'écoute sur %s", socket_path)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self, stdin=None, stdout=None):
+        """Sert les requêtes lues sur l'entrée standard, les réponses sont écrites sur la sortie standard."""
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+        loop = asyncio.get_running_loop()
+        while line := await loop.run_in_executor(None, stdin.readline):
+            if line.strip():
+                stdout.write(await loop.run_in_executor(None, self.handle_line, line))
+                stdout.flush()
+
+    def run(self, socket_path=None):
+        """Lance le serveur jusqu'à interruption (socket Unix si `socket_path`, sinon entrée standard)."""
+        try:
+            asyncio.run(self.serve_unix(socket_path) if socket_path else self.serve_stdio())
+        except KeyboardInterrupt:
+            logger.info("Serveur arrêté")
@@ -0,0 +1,66 @@
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """
+    Mesure le temps de démarrage de la CLI.
+    - Chaque premier import d'un module est chronométré (temps cumulé et temps propre, hors sous-imports).
+    - Les étapes d'initialisation (parser, logging, Commerce…) sont chronométrées avec `phase`.
+    """
+
+    def __init__(self):
+        self.imports = []
+        self.phases = []
+        self._original_import = None
+        self._stack = []
+        self._started = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def stop(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            self.imports.append((name, elapsed, elapsed - children))
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report(self, stream=None, limit=20):
+        """Écrit le rapport de démarrage (par défaut sur la sortie d'erreur)."""
+        stream = stream or sys.stderr
+        total = time.perf_counter() - self._started if self._started else 0.0
+        stream.write("Profil de démarrage :\n")
+        stream.write(f"  {'module':<40} {'cumulé (ms)':>12} {'propre (ms)':>12}\n")
+        for name, elapsed, own in sorted(self.imports, key=lambda item: item[1], reverse=True)[:limit]:
+            stream.write(f"  {name:<40} {elapsed * 1000:>12.2f} {own * 1000:>12.2f}\n")
+        for name, elapsed in self.phases:
+            stream.write(f"  étape {name:<34} {elapsed * 1000:>12.2f}\n")
+        stream.write(f"  {'total':<40} {total * 1000:>12.2f}\n")
+
+
+profiler = StartupProfiler()
@@ -0,0 +1,51 @@
+import pytest
+from module_perso.aggregate import Aggregator, aggregate_inventory
+from module_perso.inventory import Inventory
+
+
+@pytest.fixture
+def inventory():
+    """Inventaire d'exemple sur deux catégories."""
+    rows = [
+        {"name": "Product A", "category": "Category 1", "price": "10.0", "quantity": "5"},
+        {"name": "Product B", "category": "Category 2", "price": "20.0", "quantity": "3"},
+        {"name": "Product C", "category": "Category 1", "price": "2.0", "quantity": "10"},
+    ]
+    return Inventory.from_rows(rows)
+
+
+def test_aggregate_global(inventory):
+    """Teste l'agrégat global en une passe."""
+    totals = aggregate_inventory(inventory).total()
+    assert totals["count"] == 3
+    assert totals["quantity"] == {"sum": 18, "min": 3, "max": 10, "mean": 6}
+    assert totals["value"]["sum"] == pytest.approx(130.0)
+    assert totals["value"]["min"] == pytest.approx(20.0)
+    assert totals["value"]["max"] == pytest.approx(60.0)
+
+
+def test_aggregate_group_by(inventory):
+    """Teste le regroupement par catégorie."""
+    results = aggregate_inventory(inventory, group_by="category").results()
+    assert list(results) == ["Category 1", "Category 2"]
+    assert results["Category 1"]["count"] == 2
+    assert results["Category 1"]["quantity"]["sum"] == 15
+    assert results["Category 1"]["value"]["mean"] == pytest.approx(35.0)
+    assert results["Category 2"]["value"]["sum"] == pytest.approx(60.0)
+
+
+def test_aggregate_merge_matches_single_pass(inventory):
+    """Teste que la fusion de résultats partiels équivaut à une seule passe."""
+    prices = list(inventory.column("price"))
+    quantities = list(inventory.column("quantity"))
+    keys = list(inventory.column("category"))
+    left = Aggregator("category").update(keys[:1], prices[:1], quantities[:1])
+    right = Aggregator("category").update(keys[1:], prices[1:], quantities[1:])
+    single = Aggregator("category").update(keys, prices, quantities)
+    assert left.merge(right).results() == single.results()
+
+
+def test_aggregate_parallel(inventory):
+    """Teste l'agrégation répartie sur plusieurs processus."""
+    parallel = aggregate_inventory(inventory, group_by="category", jobs=2, min_chunk=1)
+    assert parallel.results() == aggregate_inventory(inventory, group_by="category").results()
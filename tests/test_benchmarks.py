@@ -0,0 +1,61 @@
+import csv
+from benchmarks.generate import generate_inventory, iter_rows
+from benchmarks.run import compare, measure, prepare
+from module_perso.csv_manager import CSVManager
+
+
+def test_generator_is_reproducible():
+    """Teste que le générateur produit les mêmes lignes pour une même graine."""
+    assert list(iter_rows(50, seed=3)) == list(iter_rows(50, seed=3))
+    assert list(iter_rows(50, seed=3)) != list(iter_rows(50, seed=4))
+
+
+def test_generator_options(tmp_path):
+    """Teste la cardinalité des catégories, la longueur des noms et le taux de lignes invalides."""
+    rows = list(iter_rows(2000, categories=5, name_mean=10, name_stddev=0, malformed_rate=0.1, seed=1))
+    valid = [row for row in rows if len(row) == 4 and row[2] != "n/a" and row[3] != "beaucoup"]
+    assert len({row[1] for row in rows}) == 5
+    assert all(len(row[0]) <= 10 for row in valid)
+    assert 100 < len(rows) - len(valid) < 300
+
+    path = tmp_path / "inventaire.csv"
+    generate_inventory(path, 25, seed=1)
+    with open(path, encoding="utf-8", newline="") as file:
+        lines = list(csv.reader(file))
+    assert lines[0] == ["name", "category", "price", "quantity"]
+    assert len(lines) == 26
+
+
+def test_measure_scenarios(tmp_path, monkeypatch):
+    """Teste l'exécution des scénarios sur un petit inventaire."""
+    monkeypatch.setattr(CSVManager, "OUTPUT_DIR", CSVManager.OUTPUT_DIR)  # Restauré après le test
+    files = prepare(str(tmp_path), 101, 3, 0.0, 0)
+    assert len(files["parts"]) == 2
+    for name in ("consolidate", "search", "report"):
+        result = measure(name, files, str(tmp_path / "output"))
+        assert result["rows"] == 101 and result["wall_s"] > 0 and result["peak_rss_kb"] > 0
+    with open(tmp_path / "output" / "bench_consolidated.csv", encoding="utf-8") as file:
+        assert sum(1 for _ in file) == 102
+
+
+def test_measure_scenarios_with_malformed_rows(tmp_path, monkeypatch):
+    """Teste que les scénarios mettent les lignes invalides en quarantaine au lieu de s'interrompre."""
+    monkeypatch.setattr(CSVManager, "OUTPUT_DIR", CSVManager.OUTPUT_DIR)  # Restauré après le test
+    files = prepare(str(tmp_path), 400, 3, 0.05, 0)
+    for name in ("consolidate", "search", "report"):
+        assert measure(name, files, str(tmp_path / "output"))["rows"] == 400
+    with open(files["quarantine"], encoding="utf-8", newline="") as file:
+        assert len(list(csv.reader(file))) > 1
+
+
+def test_compare_flags_regressions():
+    """Teste la détection des régressions de débit et de mémoire au-delà du seuil."""
+    baseline = {"search": {"rows_per_s": 1000.0, "peak_rss_kb": 100}, "report": {"rows_per_s": 1000.0, "peak_rss_kb": 100}}
+    results = {
+        "search": {"rows_per_s": 950.0, "peak_rss_kb": 105},
+        "report": {"rows_per_s": 800.0, "peak_rss_kb": 150},
+        "consolidate": {"rows_per_s": 1.0, "peak_rss_kb": 1},
+    }
+    regressions = compare(results, baseline, threshold=0.1)
+    assert len(regressions) == 2
+    assert all(regression.startswith("report") for regression in regressions)
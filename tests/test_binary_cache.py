@@ -0,0 +1,118 @@
+import os
+import pytest
+from module_perso.binary_cache import BinaryCache, StringTable
+from module_perso.csv_manager import Commerce, CSVManager
+from module_perso.inventory import Inventory
+
+
+@pytest.fixture
+def sample_csv(tmp_path):
+    """Crée un fichier CSV d'exemple."""
+    file_path = tmp_path / "products.csv"
+    file_path.write_text(
+        "name,category,price,quantity,supplier\n"
+        "Product A,Category 1,10.5,5,Fournisseur é\n"
+        "Product B,Category 2,20.0,3,Fournisseur B\n"
+        "Product C,Category 1,1.0,10,\n",
+        encoding="utf-8",
+    )
+    return file_path
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    """Redirige le répertoire de sortie (où sont écrits les caches) vers un dossier temporaire."""
+    output_dir = tmp_path / "output"
+    monkeypatch.setattr(CSVManager, "OUTPUT_DIR", str(output_dir))
+    return output_dir
+
+
+def test_string_table():
+    """Teste l'encodage et la relecture d'une table de chaînes."""
+    offsets, blob = StringTable.encode(["a", "", "éé"])
+    table = StringTable(memoryview(offsets), memoryview(bytes(blob)))
+    assert list(table) == ["a", "", "éé"]
+    assert table[1:] == ["", "éé"]
+
+
+def test_binary_cache_roundtrip(sample_csv, output_dir):
+    """Teste qu'un inventaire relu depuis le cache est identique à l'original sans copie des colonnes numériques."""
+    manager = CSVManager(str(sample_csv))
+    original = manager.read_inventory(use_cache=True)
+    cache = BinaryCache(manager.fingerprint(), str(output_dir))
+    assert os.path.exists(cache.path)
+
+    cached = cache.load()
+    assert isinstance(cached.column("price"), memoryview)
+    assert list(cached.rows()) == list(original.rows())
+    assert cached.total_value() == pytest.approx(original.total_value())
+    assert cached.column("category").codes_matching("category 1") == {0}
+
+
+def test_binary_cache_invalidated_on_change(sample_csv, output_dir):
+    """Teste que le cache est ignoré quand le fichier source change."""
+    manager = CSVManager(str(sample_csv))
+    manager.read_inventory(use_cache=True)
+    with open(sample_csv, "a", encoding="utf-8") as file:
+        file.write("Product D,Category 3,2.0,1,\n")
+
+    assert BinaryCache(manager.fingerprint(), str(output_dir)).load() is None
+    assert len(manager.read_inventory(use_cache=True)) == 4
+
+
+def test_commerce_uses_cache(sample_csv, output_dir, capsys):
+    """Teste qu'une recherche et un rapport fonctionnent à partir du cache."""
+    commerce = Commerce(use_cache=True)
+    commerce.search_data(str(sample_csv), "Product", category="Category 1")
+    first = capsys.readouterr().out
+    commerce.search_data(str(sample_csv), "Product", category="Category 1")
+    assert capsys.readouterr().out == first
+    assert "Product C" in first and "Product B" not in first
+    assert isinstance(commerce.data.column("quantity"), memoryview)
+
+
+def test_inventory_from_columns():
+    """Teste la construction d'un inventaire à partir de colonnes existantes."""
+    inventory = Inventory.from_columns(["name"], {"name": ["A", "B"]}, 2)
+    assert list(inventory.rows()) == [{"name": "A"}, {"name": "B"}]
+
+
+def test_cache_does_not_change_consolidated_output(tmp_path, output_dir):
+    """Teste que la consolidation donne le même fichier avec et sans cache (« 10.50 », « 05 » conservés)."""
+    file_path = tmp_path / "inv.csv"
+    file_path.write_text("name,category,price,quantity\nA,Cat,10.50,05\nB,Cat,20,3\nC,Cat,1.0,1\n", encoding="utf-8")
+    CSVManager(str(file_path)).read_inventory(use_cache=True)  # Construit le cache
+
+    Commerce().consolidate_files([str(file_path)], "plain.csv")
+    Commerce(use_cache=True).consolidate_files([str(file_path)], "cached.csv")
+    expected = file_path.read_text(encoding="utf-8").splitlines()
+    assert (output_dir / "plain.csv").read_text(encoding="utf-8").splitlines() == expected
+    assert (output_dir / "cached.csv").read_text(encoding="utf-8").splitlines() == expected
+
+
+def test_cache_save_failure_does_not_abort_read(sample_csv, output_dir, monkeypatch):
+    """Teste qu'un échec d'écriture du cache n'interrompt pas la lecture."""
+    def failing(self, inventory):
+        raise ValueError("disque plein")
+
+    monkeypatch.setattr(BinaryCache, "save", failing)
+    assert len(CSVManager(str(sample_csv)).read_inventory(use_cache=True)) == 3
+
+
+def test_search_reuses_index_without_reparsing(sample_csv, output_dir, capsys, monkeypatch):
+    """Teste qu'avec le cache, une seconde recherche par nom répond depuis l'index et le cache, sans relire le CSV."""
+    Commerce().search_data(str(sample_csv), "product b", output_format="csv")
+    assert not list(output_dir.glob("*.inventory.cache"))  # Le cache binaire reste optionnel
+    assert list(output_dir.glob("*.trigram.idx"))
+    capsys.readouterr()
+    Commerce(use_cache=True).search_data(str(sample_csv), "product b", output_format="csv")
+    first = capsys.readouterr().out
+
+    def reparse(self, *args):
+        raise AssertionError("le fichier CSV ne doit pas être relu")
+
+    monkeypatch.setattr(CSVManager, "_iter_split", reparse)
+    commerce = Commerce(use_cache=True)
+    commerce.search_data(str(sample_csv), "product b", output_format="csv")
+    assert capsys.readouterr().out == first == "name,category,price,quantity,supplier\nProduct B,Category 2,20.0,3,Fournisseur B\n"
+    assert commerce._indexes.names._names is None  # Seuls les noms candidats ont été lus
@@ -0,0 +1,80 @@
+import csv
+import pytest
+from module_perso import chunked
+from module_perso.csv_manager import CSVManager
+
+
+@pytest.fixture
+def quoted_csv(tmp_path):
+    """Fichier CSV contenant des champs entre guillemets avec des sauts de ligne."""
+    file_path = tmp_path / "quoted.csv"
+    with open(file_path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["name", "category", "price", "quantity"])
+        for i in range(300):
+            name = f'Produit "{i}"\nsur deux lignes' if i % 7 == 0 else f"Produit {i}"
+            writer.writerow([name, f"Catégorie {i % 3}", f"{i}.5", str(i)])
+    return file_path
+
+
+def test_find_boundaries_respects_quotes(quoted_csv):
+    """Teste que les bornes ne coupent jamais un enregistrement."""
+    content = quoted_csv.read_bytes()
+    boundaries = chunked.find_boundaries(content, parts=10, min_chunk=1)
+    assert len(boundaries) > 5
+    assert boundaries[0][0] == content.index(b"\n") + 1
+    assert boundaries[-1][1] == len(content)
+    for (_, stop), (start, _) in zip(boundaries, boundaries[1:]):
+        assert stop == start
+    rows = [row for start, stop in boundaries for row in csv.reader(content[start:stop].decode("utf-8").splitlines(True))]
+    assert len(rows) == 300
+    assert rows[7][0] == 'Produit "7"\nsur deux lignes'
+
+
+def test_iter_chunks_preserves_order(quoted_csv):
+    """Teste que l'analyse parallèle restitue les lignes dans l'ordre d'origine."""
+    chunks = list(chunked.iter_chunks(str(quoted_csv), 3, min_chunk=256))
+    rows = [row for _, chunk in chunks for row in chunk]
+    with open(quoted_csv, encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        next(reader)
+        expected = list(chunked.numbered_rows(reader))
+    assert rows == [row for _, row in expected]
+    # Numéros de ligne physiques, identiques à ceux d'une lecture séquentielle
+    assert [line for lines, _ in chunks for line in lines] == [line for line, _ in expected]
+    assert expected[8][0] == 12  # En-tête, puis les produits 0 et 7 occupent deux lignes chacun
+
+
+def test_iter_csv_parallel(quoted_csv, monkeypatch):
+    """Teste que `iter_csv` produit les mêmes lignes en parallèle qu'en séquentiel."""
+    monkeypatch.setattr(chunked, "MIN_CHUNK_BYTES", 256)
+    manager = CSVManager(str(quoted_csv))
+    assert list(manager.iter_csv(jobs=3)) == list(manager.iter_csv())
+
+
+def test_consolidate_parallel_reads_bounded_chunks(quoted_csv, tmp_path, monkeypatch):
+    """Teste que la consolidation parallèle renvoie des morceaux bornés, dans l'ordre, fichiers compressés compris."""
+    import gzip
+    from module_perso.csv_manager import Commerce
+
+    monkeypatch.setattr(chunked, "MIN_CHUNK_BYTES", 256)
+    monkeypatch.setattr(CSVManager, "OUTPUT_DIR", str(tmp_path / "output"))
+    planned = []
+    plan = chunked.plan
+
+    def spy(*args, **kwargs):
+        chunks = plan(*args, **kwargs)
+        planned.extend(chunks)
+        return chunks
+
+    monkeypatch.setattr(chunked, "plan", spy)
+    compressed = tmp_path / "quoted.csv.gz"
+    compressed.write_bytes(gzip.compress(quoted_csv.read_bytes()))
+
+    Commerce().consolidate_files([str(quoted_csv), str(compressed), str(quoted_csv)], "out.csv", jobs=3)
+    assert len(planned) > 10
+    assert all(stop - start < 1024 for start, stop, _ in planned)
+    with open(quoted_csv, encoding="utf-8", newline="") as file:
+        expected = list(csv.reader(file))
+    with open(tmp_path / "output" / "out.csv", encoding="utf-8", newline="") as file:
+        assert list(csv.reader(file)) == expected + expected[1:] * 2
@@ -0,0 +1,88 @@
+import bz2
+import gzip
+import lzma
+import pytest
+from module_perso import compression
+from module_perso.csv_manager import Commerce, CSVManager, DataProcessingError
+
+CONTENT = "name,category,price,quantity\n" + "".join(f"Product {i},Category {i % 3},{i}.5,{i}\n" for i in range(2000))
+
+
+@pytest.fixture(params=[(".gz", gzip), (".bz2", bz2), (".xz", lzma)], ids=["gzip", "bz2", "xz"])
+def compressed_csv(request, tmp_path):
+    """Inventaire compressé dans chacun des formats reconnus."""
+    extension, module = request.param
+    file_path = tmp_path / f"inventory.csv{extension}"
+    with module.open(file_path, "wt", encoding="utf-8", newline="") as file:
+        file.write(CONTENT)
+    return file_path
+
+
+def test_detect_by_extension_and_magic(tmp_path):
+    """Teste la détection du format par l'extension, puis par les premiers octets."""
+    assert compression.detect("feed.csv.xz") == "lzma"
+    plain = tmp_path / "plain.csv"
+    plain.write_text(CONTENT, encoding="utf-8")
+    assert compression.detect(str(plain)) is None
+    renamed = tmp_path / "feed.csv"
+    renamed.write_bytes(gzip.compress(CONTENT.encode("utf-8")))
+    assert compression.detect(str(renamed)) == "gzip"
+
+
+def test_read_compressed(compressed_csv):
+    """Teste que les lignes d'un fichier compressé sont identiques à celles du texte d'origine."""
+    manager = CSVManager(str(compressed_csv))
+    assert manager.read_header() == ["name", "category", "price", "quantity"]
+    rows = manager.read_csv()
+    assert len(rows) == 2000
+    assert rows[1999] == {"name": "Product 1999", "category": "Category 1", "price": "1999.5", "quantity": "1999"}
+
+
+def test_read_stops_early(compressed_csv):
+    """Teste qu'une lecture abandonnée arrête le thread de décompression."""
+    with compression.open_text(str(compressed_csv)) as file:
+        assert file.readline() == "name,category,price,quantity\n"
+
+
+def test_consolidate_to_compressed_output(compressed_csv, tmp_path):
+    """Teste la consolidation d'entrées compressées vers une sortie compressée avec un niveau donné."""
+    output = tmp_path / "out"
+    output.mkdir()
+    Commerce().consolidate_files([str(compressed_csv)], str(output / "consolidated.csv.gz"), compress_level=1)
+    with gzip.open(output / "consolidated.csv.gz", "rt", encoding="utf-8", newline="") as file:
+        assert file.read() == CONTENT.replace("\n", "\r\n")
+
+
+def test_truncated_file(tmp_path):
+    """Teste qu'un fichier compressé tronqué lève une erreur de traitement."""
+    file_path = tmp_path / "truncated.csv.gz"
+    file_path.write_bytes(gzip.compress(CONTENT.encode("utf-8"))[:-100])
+    with pytest.raises(DataProcessingError):
+        list(CSVManager(str(file_path)).iter_csv())
+
+
+def test_load_compressed_inventory(compressed_csv):
+    """Teste le chargement d'un inventaire compressé."""
+    inventory = Commerce().load(str(compressed_csv))
+    assert len(inventory) == 2000
+    assert next(inventory.rows())["name"] == "Product 0"
+
+
+def test_invalid_level_rejected_before_reading(tmp_path):
+    """Teste que le niveau 0, refusé par bz2, est signalé avant toute lecture des fichiers d'entrée."""
+    with pytest.raises(DataProcessingError, match="bz2 : 1 à 9"):
+        Commerce().consolidate_files([str(tmp_path / "absent.csv")], str(tmp_path / "consolidated.csv.bz2"), compress_level=0)
+    compression.check_level("consolidated.csv.gz", 0)
+
+
+def test_lzma_extension_writes_lzma_alone(tmp_path):
+    """Teste que l'extension .lzma produit l'ancien format lzma-alone, relu y compris après un ajout."""
+    file_path = str(tmp_path / "consolidated.csv.lzma")
+    with compression.open_text(file_path, "w") as file:
+        file.write("a\n")
+    with compression.open_text(file_path, "a") as file:
+        file.write("b\n")
+    with open(file_path, "rb") as file:
+        assert lzma.LZMADecompressor(lzma.FORMAT_ALONE).decompress(file.read()) == b"a\n"
+    with compression.open_text(file_path) as file:
+        assert file.read() == "a\nb\n"
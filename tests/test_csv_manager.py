@@ -102,3 +102,42 @@ def test_csvmanager_output_dir():
 
     # Vérifier que le chemin est correct
     assert manager.file_path == expected_path, f"Le chemin attendu est {expected_path}, mais obtenu {manager.file_path}"
+
+
+def test_iter_csv_is_lazy(sample_csv_file):
+    """Teste que la lecture en flux produit les lignes une à une."""
+    manager = CSVManager(str(sample_csv_file))
+    rows = manager.iter_csv()
+    assert not isinstance(rows, list)
+    assert next(rows)["name"] == "Product A"
+    assert next(rows)["name"] == "Product B"
+
+
+def test_read_header(sample_csv_file):
+    """Teste la lecture de l'en-tête seul."""
+    manager = CSVManager(str(sample_csv_file))
+    assert manager.read_header() == ["name", "category", "price", "quantity"]
+
+
+def test_write_csv_from_iterator(setup_directories):
+    """Teste l'écriture d'un fichier CSV à partir d'un générateur."""
+    _, output_dir = setup_directories
+    fieldnames = ["name", "category", "price", "quantity"]
+    rows = ({"name": f"P{i}", "category": "C", "price": "1.0", "quantity": str(i)} for i in range(100))
+
+    count = CSVManager.write_csv("stream.csv", rows, fieldnames, output_dir=output_dir)
+
+    assert count == 100
+    with open(output_dir / "stream.csv", mode="r", encoding="utf-8") as file:
+        assert len(list(csv.DictReader(file))) == 100
+
+
+def test_write_csv_invalid_data_removes_partial_file(setup_directories):
+    """Teste qu'aucun fichier incomplet n'est laissé après une erreur d'écriture."""
+    _, output_dir = setup_directories
+    fieldnames = ["name", "category", "price", "quantity"]
+    rows = [{"name": "A", "category": "C", "price": "1.0", "quantity": "1"}, {"name": "Incomplete"}]
+
+    with pytest.raises(DataProcessingError):
+        CSVManager.write_csv("partial.csv", rows, fieldnames, output_dir=output_dir)
+    assert not (output_dir / "partial.csv").exists()
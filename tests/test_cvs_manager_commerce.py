@@ -1,16 +1,18 @@
 import pytest
 import os
 import csv
-from module_perso.csv_manager import Commerce, CSVManager
+import json
+from module_perso.csv_manager import Commerce, CSVManager, DataProcessingError
 
 
 @pytest.fixture
-def setup_directories(tmp_path):
-    """Crée des répertoires temporaires pour 'input' et 'output'."""
+def setup_directories(tmp_path, monkeypatch):
+    """Crée des répertoires temporaires pour 'input' et 'output' (où sont aussi écrits les index et les caches)."""
     input_dir = tmp_path / "input"
     output_dir = tmp_path / "output"
     input_dir.mkdir()
     output_dir.mkdir()
+    monkeypatch.setattr(CSVManager, "OUTPUT_DIR", str(output_dir))
     return input_dir, output_dir
 
 
@@ -69,6 +71,54 @@ def test_consolidate_files(setup_directories, sample_csv_files):
         assert rows[3]['name'] == "Product 2B"
 
 
+def test_consolidate_files_parallel(setup_directories, sample_csv_files):
+    """Teste que la consolidation parallèle conserve l'ordre des fichiers."""
+    input_dir, output_dir = setup_directories
+    output_file = output_dir / "consolidated_parallel.csv"
+    files = [str(f) for f in sample_csv_files] * 3
+
+    commerce = Commerce()
+    commerce.consolidate_files(files, str(output_file), jobs=2)
+
+    with open(output_file, "r", encoding="utf-8") as f:
+        names = [row["name"] for row in csv.DictReader(f)]
+    assert names == ["Product 1A", "Product 1B", "Product 2A", "Product 2B"] * 3
+
+
+@pytest.mark.parametrize("files, jobs, sort_by, parallel", [
+    (2, 4, None, True), (2, 1, None, False), (1, 4, None, False), (2, 2, "price", True),
+])
+def test_consolidate_files_parallel_path(setup_directories, sample_csv_files, monkeypatch, files, jobs, sort_by, parallel):
+    """
+    Teste que plusieurs petits fichiers sont analysés en parallèle même s'il y a plus de processus que de fichiers,
+    y compris avant un tri.
+    """
+    _, output_dir = setup_directories
+    calls = []
+    iter_parallel = Commerce._iter_parallel
+
+    def spy(*args, **kwargs):
+        calls.append(args)
+        return iter_parallel(*args, **kwargs)
+
+    monkeypatch.setattr(Commerce, "_iter_parallel", staticmethod(spy))
+    Commerce().consolidate_files([str(f) for f in sample_csv_files[:files]], str(output_dir / "out.csv"), jobs=jobs, sort_by=sort_by)
+    assert bool(calls) == parallel
+
+
+def test_consolidate_files_header_mismatch(setup_directories, sample_csv_files):
+    """Teste qu'un en-tête incompatible est détecté avant toute écriture."""
+    input_dir, output_dir = setup_directories
+    other = input_dir / "other.csv"
+    other.write_text("name,price\nProduct X,1.0\n", encoding="utf-8")
+    output_file = output_dir / "consolidated.csv"
+
+    commerce = Commerce()
+    with pytest.raises(DataProcessingError):
+        commerce.consolidate_files([str(sample_csv_files[0]), str(other)], str(output_file))
+    assert not output_file.exists()
+
+
 def test_search_data(setup_directories, sample_report_csv, capsys):
     """Teste la recherche dans un fichier CSV."""
     commerce = Commerce()
@@ -110,3 +160,159 @@ def test_generate_report(setup_directories, sample_report_csv):
         assert "Valeur totale : 110.00€" in content, "La valeur totale est incorrecte."
         assert "Product A" in content, "Les détails des produits sont manquants."
         assert "Product B" in content, "Les détails des produits sont manquants."
+
+
+def test_generate_report_group_by(setup_directories, sample_report_csv):
+    """Teste la génération d'un rapport avec détail par catégorie."""
+    output_file = "report_group_test.txt"
+
+    commerce = Commerce()
+    commerce.generate_report(str(sample_report_csv), output_file, group_by="category")
+
+    report_path = os.path.join(CSVManager.OUTPUT_DIR, "report", output_file)
+    with open(report_path, "r", encoding="utf-8") as f:
+        content = f.read()
+    os.remove(report_path)
+    assert "Valeur totale : 110.00€" in content
+    assert "Détail par category :" in content
+    assert "- Category 1 : 1 produits, quantité 5" in content
+    assert "valeur 60.00€" in content
+
+
+def test_search_batch(setup_directories, sample_report_csv, capsys):
+    """Teste la recherche groupée à partir d'un fichier de requêtes."""
+    input_dir, _ = setup_directories
+    queries = input_dir / "queries.txt"
+    queries.write_text("Product A\n\nproduct\nInconnu\nProduct A\n", encoding="utf-8")
+
+    commerce = Commerce()
+    commerce.search_batch(str(sample_report_csv), str(queries))
+    lines = capsys.readouterr().out.splitlines()
+
+    assert lines[0] == "=== Product A (1 résultat(s)) ==="
+    assert "Product A" in lines[1]
+    assert lines[2] == "=== product (2 résultat(s)) ==="
+    assert lines[5] == "=== Inconnu (0 résultat(s)) ==="
+    assert len(lines) == 6
+
+
+def test_search_data_format_and_limit(setup_directories, sample_report_csv, capsys):
+    """Teste la sortie csv/jsonl de la recherche et l'arrêt après `limit` résultats."""
+    commerce = Commerce()
+
+    commerce.search_data(str(sample_report_csv), query="Product", output_format="csv", limit=1)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "name,category,price,quantity"
+    assert len(lines) == 2 and lines[1].startswith("Product A,")
+
+    commerce.search_data(str(sample_report_csv), query="Product", output_format="jsonl")
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["Product A", "Product B"]
+
+    with pytest.raises(DataProcessingError, match="Limite invalide"):
+        commerce.search_data(str(sample_report_csv), query="Product", limit=-1)
+
+
+def test_search_batch_tsv(setup_directories, sample_report_csv, capsys):
+    """Teste la recherche groupée au format tsv, avec une colonne `query`."""
+    input_dir, _ = setup_directories
+    queries = input_dir / "queries.txt"
+    queries.write_text("product\nProduct B\n", encoding="utf-8")
+
+    Commerce().search_batch(str(sample_report_csv), str(queries), output_format="tsv", limit=1)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "query\tname\tcategory\tprice\tquantity"
+    assert [line.split("\t")[:2] for line in lines[1:]] == [["product", "Product A"], ["Product B", "Product B"]]
+
+
+def test_search_data_sorted_page(setup_directories, sample_report_csv, capsys):
+    """Teste le tri par valeur du stock, décroissant, avec pagination."""
+    commerce = Commerce()
+    commerce.search_data(str(sample_report_csv), query="Product", sort_by="value", descending=True, top=1, output_format="csv")
+    assert capsys.readouterr().out.splitlines()[1:] == ["Product B,Category 2,20.0,3"]
+
+    commerce.search_data(str(sample_report_csv), query="Product", sort_by="value", descending=True, top=1, offset=1, output_format="csv")
+    assert capsys.readouterr().out.splitlines()[1:] == ["Product A,Category 1,10.0,5"]
+
+    with pytest.raises(DataProcessingError, match="Décalage invalide"):
+        commerce.search_data(str(sample_report_csv), query="Product", offset=-1)
+
+
+def test_consolidate_files_with_key(setup_directories, sample_csv_files):
+    """Teste la consolidation avec fusion des lignes de même clé."""
+    _, output_dir = setup_directories
+    output_file = output_dir / "merged.csv"
+    files = [str(f) for f in sample_csv_files] * 2
+
+    commerce = Commerce()
+    commerce.consolidate_files(files, str(output_file), key="name,category", policy="sum")
+
+    with open(output_file, "r", encoding="utf-8") as f:
+        rows = [(row["name"], row["quantity"]) for row in csv.DictReader(f)]
+    assert rows == [("Product 1A", "10"), ("Product 1B", "6"), ("Product 2A", "10"), ("Product 2B", "6")]
+
+    with pytest.raises(DataProcessingError, match="Fusion par clé impossible"):
+        commerce.consolidate_files(files, str(output_file), key="sku")
+
+
+def test_consolidate_files_sorted(setup_directories, sample_csv_files):
+    """Teste la consolidation triée (fichiers déjà triés fusionnés directement)."""
+    _, output_dir = setup_directories
+    output_file = output_dir / "sorted.csv"
+
+    commerce = Commerce()
+    commerce.consolidate_files([str(f) for f in sample_csv_files], str(output_file), sort_by="category,name")
+
+    with open(output_file, "r", encoding="utf-8") as f:
+        names = [row["name"] for row in csv.DictReader(f)]
+    assert names == ["Product 1A", "Product 2A", "Product 1B", "Product 2B"]
+
+    commerce.consolidate_files([str(f) for f in sample_csv_files] * 2, str(output_file), key="name", sort_by="price,name")
+    with open(output_file, "r", encoding="utf-8") as f:
+        rows = [(row["name"], row["quantity"]) for row in csv.DictReader(f)]
+    assert rows == [("Product 1A", "10"), ("Product 2A", "10"), ("Product 1B", "6"), ("Product 2B", "6")]
+
+
+def test_search_files(setup_directories, sample_csv_files, capsys):
+    """Teste la recherche fédérée : colonne `source`, motif glob, pool de processus."""
+    input_dir, _ = setup_directories
+    files = [str(f) for f in sample_csv_files]
+    commerce = Commerce()
+
+    commerce.search_files(files, "Product", category="Category 1", jobs=1, output_format="csv")
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "source,name,category,price,quantity"
+    assert [line.split(",")[:2] for line in lines[1:]] == [[files[0], "Product 1A"], [files[1], "Product 2A"]]
+
+    commerce.search_files([str(input_dir / "file*.csv")], "Product", jobs=2, output_format="jsonl")
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(result["name"] for result in results) == ["Product 1A", "Product 1B", "Product 2A", "Product 2B"]
+    assert {os.path.basename(result["source"]) for result in results} == {"file1.csv", "file2.csv"}
+
+
+def test_search_files_sorted_and_limited(setup_directories, sample_csv_files, capsys):
+    """Teste le tri et la pagination appliqués à l'ensemble des fichiers."""
+    files = [str(f) for f in sample_csv_files]
+    commerce = Commerce()
+
+    commerce.search_files(files, "Product", sort_by="price", descending=True, top=2, offset=1, output_format="csv")
+    assert [line.split(",")[1] for line in capsys.readouterr().out.splitlines()[1:]] == ["Product 2B", "Product 1A"]
+
+    commerce.search_files(files, "Product", jobs=1, limit=3, output_format="csv")
+    assert len(capsys.readouterr().out.splitlines()) == 4
+
+    with pytest.raises(DataProcessingError, match="Critère de tri inconnu"):
+        commerce.search_files(files, "Product", sort_by="name")
+
+
+def test_search_files_sorted_ties_keep_file_order(setup_directories, sample_csv_files, capsys, monkeypatch):
+    """Teste qu'à prix égal l'ordre des résultats triés ne dépend pas de l'ordre de fin des recherches."""
+    files = [str(f) for f in sample_csv_files]
+    iter_search_files = Commerce._iter_search_files
+
+    def reversed_completion(paths, arguments, jobs, quarantine=None):
+        yield from list(iter_search_files(paths, arguments, jobs, quarantine))[::-1]
+
+    monkeypatch.setattr(Commerce, "_iter_search_files", staticmethod(reversed_completion))
+    Commerce().search_files(files, "Product", sort_by="price", top=3, output_format="csv")
+    assert [line.split(",")[1] for line in capsys.readouterr().out.splitlines()[1:]] == ["Product 1A", "Product 2A", "Product 1B"]
@@ -0,0 +1,111 @@
+import pytest
+from module_perso.external import ExternalSorter, KeyMerger
+
+FIELDNAMES = ["name", "category", "price", "quantity"]
+
+
+def rows(*values):
+    return [dict(zip(FIELDNAMES, row)) for row in values]
+
+
+SAMPLE = rows(
+    ("Apple", "Fruit", "0.5", "10"),
+    ("Pear", "Fruit", "0.7", "5"),
+    ("Apple", "Fruit", "0.4", "3"),
+    ("Apple", "Bio", "0.9", "1"),
+    ("Pear", "Fruit", "0.8", "2"),
+)
+
+
+def merged(policy, key=("name", "category"), data=SAMPLE, **kwargs):
+    return [tuple(row.values()) for row in KeyMerger(FIELDNAMES, list(key), policy, **kwargs).merge(data)]
+
+
+def test_merge_policies():
+    """Teste les politiques de fusion sum, last et min-price (ordre de première apparition des clés)."""
+    assert merged("sum") == [("Apple", "Fruit", "0.4", "13"), ("Pear", "Fruit", "0.8", "7"), ("Apple", "Bio", "0.9", "1")]
+    assert merged("last") == [("Apple", "Fruit", "0.4", "3"), ("Pear", "Fruit", "0.8", "2"), ("Apple", "Bio", "0.9", "1")]
+    assert merged("min-price") == [("Apple", "Fruit", "0.4", "13"), ("Pear", "Fruit", "0.7", "7"), ("Apple", "Bio", "0.9", "1")]
+    assert merged("sum", key=["name"])[0] == ("Apple", "Bio", "0.9", "14")
+
+
+def test_merge_spills_to_disk(tmp_path):
+    """Teste que la fusion sur disque (budget mémoire dépassé) donne le même résultat qu'en mémoire."""
+    data = rows(*[(f"Produit {i % 300}", f"Cat {i % 7}", str(i % 13), str(i % 5)) for i in range(3000)])
+    merger = KeyMerger(FIELDNAMES, ["name", "category"], "min-price", memory_limit=2000, tmp_dir=str(tmp_path))
+    spilled = list(merger.merge(data))
+
+    assert merger.spills > 1  # Plusieurs niveaux de partitions
+    assert spilled == list(KeyMerger(FIELDNAMES, ["name", "category"], "min-price").merge(data))
+    assert list(tmp_path.iterdir()) == []  # Fichiers temporaires supprimés
+
+
+def test_merge_default_memory_budget(tmp_path, monkeypatch):
+    """Teste que, sans budget explicite, la table de fusion est bornée par `MERGE_MEMORY`."""
+    monkeypatch.setattr("module_perso.external.MERGE_MEMORY", 2000)
+    data = rows(*[(f"Produit {i}", "Cat", "1", "1") for i in range(200)])
+    merger = KeyMerger(FIELDNAMES, ["name"], tmp_dir=str(tmp_path))
+    assert len(list(merger.merge(data))) == 200
+    assert merger.memory_limit == 2000 and merger.spills > 0
+
+
+def test_merge_errors():
+    """Teste les erreurs de configuration et de valeur."""
+    with pytest.raises(ValueError, match="Colonnes de clé introuvables"):
+        KeyMerger(FIELDNAMES, ["sku"])
+    with pytest.raises(ValueError, match="Politique de fusion inconnue"):
+        KeyMerger(FIELDNAMES, ["name"], "max")
+    with pytest.raises(ValueError, match="Valeur numérique invalide"):
+        merged("sum", data=rows(("Apple", "Fruit", "0.5", "x")))
+
+
+def test_external_sort_spills_runs(tmp_path):
+    """Teste le tri externe (runs sur disque, fusion par tas) : stable et comparant les nombres comme des nombres."""
+    data = rows(*[(f"Produit {i}", f"Cat {i % 4}", str((i * 7) % 50), str(i)) for i in range(500)])
+    sorter = ExternalSorter(FIELDNAMES, ["category", "price"], memory_limit=5000, tmp_dir=str(tmp_path))
+    result = list(sorter.sort(data))
+
+    assert sorter.runs > 1
+    assert result == sorted(data, key=lambda row: (row["category"], float(row["price"])))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_external_sort_keeps_presorted_runs(tmp_path, monkeypatch):
+    """Teste que les runs déjà dans l'ordre ne sont pas triés de nouveau, avec un nombre de runs fusionnés borné."""
+    monkeypatch.setattr("module_perso.external.MAX_FANIN", 2)
+    data = rows(*[(f"P{i:03d}", "x", "1", "1") for i in range(60)], ("A", "y", "1", "1"), ("P000", "z", "1", "1"))
+    sorter = ExternalSorter(FIELDNAMES, ["name"], memory_limit=2500, tmp_dir=str(tmp_path))
+    rows_read = []
+
+    def stream():
+        for row in data:
+            rows_read.append(row)
+            yield row
+
+    result = list(sorter.sort(stream()))
+
+    assert len(rows_read) == len(data)  # Une seule lecture du flux
+    assert sorter.runs > 2 and 0 < sorter.presorted < sorter.runs
+    assert [row["name"] for row in result] == sorted(row["name"] for row in data)
+    assert [row["category"] for row in result[:3]] == ["y", "x", "z"]  # Tri stable
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_external_sort_merges_sorted_inputs(tmp_path):
+    """Teste que deux entrées déjà triées (clés entrelacées, dont certaines communes) sont fusionnées sans être triées de nouveau."""
+    first = rows(*[(f"P{i:04d}", "a", "1", "1") for i in range(0, 400, 2)])
+    second = rows(*[(f"P{i:04d}", "b", "1", "1") for i in range(0, 400, 3)])
+    sorter = ExternalSorter(FIELDNAMES, ["name"], tmp_dir=str(tmp_path))
+    result = list(sorter.sort(first + second))
+
+    assert sorter.presorted == 2 and sorter.runs == 0  # Deux runs naturels, fusionnés en mémoire
+    assert [row["name"] for row in result] == sorted(row["name"] for row in first + second)
+    assert [row["category"] for row in result[:2]] == ["a", "b"]  # Tri stable
+
+
+def test_external_sort_errors():
+    """Teste les erreurs de colonne et de valeur."""
+    with pytest.raises(ValueError, match="Colonnes de tri introuvables"):
+        ExternalSorter(FIELDNAMES, ["sku"])
+    with pytest.raises(ValueError, match="Valeur invalide pour le tri"):
+        list(ExternalSorter(FIELDNAMES, ["price"]).sort(rows(("A", "x", "abc", "1"), ("B", "x", "2", "1"))))
@@ -0,0 +1,106 @@
+import pytest
+from module_perso import filters
+from module_perso.csv_manager import Commerce, CSVManager, DataProcessingError
+from module_perso.index import InventoryIndexes
+from module_perso.inventory import Inventory
+
+
+@pytest.fixture
+def inventory():
+    """Inventaire de 400 lignes : 4 catégories, prix et quantités variés."""
+    categories = ["Vêtements", "Maison", "Jardin", "Sport"]
+    return Inventory.from_rows(
+        {
+            "name": f"{'Pull' if i % 5 == 0 else 'Produit'} {i}",
+            "category": categories[i % 4],
+            "price": f"{i % 100}.5",
+            "quantity": str(i % 7),
+        }
+        for i in range(400)
+    )
+
+
+def brute_force(inventory, test):
+    return [row_id for row_id, row in enumerate(inventory.rows()) if test(row)]
+
+
+def test_parse_grammar():
+    """Teste l'analyse : AND implicite, priorités, alias français, IN et chaînes entre guillemets."""
+    assert filters.parse("catégorie=Vêtements prix<50") == (
+        "and", [("cmp", "catégorie", "=", "Vêtements"), ("cmp", "prix", "<", "50")]
+    )
+    assert filters.parse('a=1 OR b="x y" et non c IN (1, 2)') == (
+        "or", [("cmp", "a", "=", "1"), ("and", [("cmp", "b", "=", "x y"), ("not", ("cmp", "c", "in", ["1", "2"]))])]
+    )
+    assert filters.parse("(a=1 or a=2) b~et") == (
+        "and", [("or", [("cmp", "a", "=", "1"), ("cmp", "a", "=", "2")]), ("cmp", "b", "~", "et")]
+    )
+
+
+@pytest.mark.parametrize("text", ["", "prix<", "prix 50", "(prix<50", "prix<50)", "prix ! 3", "AND prix<3"])
+def test_parse_errors(text):
+    """Teste que les expressions invalides lèvent `ValueError`."""
+    with pytest.raises(ValueError):
+        filters.parse(text)
+
+
+def test_is_expression():
+    """Teste la distinction entre une expression et une simple recherche par nom."""
+    fieldnames = ["name", "category", "price", "quantity"]
+    assert filters.is_expression("catégorie=Vêtements prix<50", fieldnames)
+    assert not filters.is_expression("Product A", fieldnames)
+    assert not filters.is_expression("sku=12", fieldnames)
+
+
+@pytest.mark.parametrize("expression, test", [
+    ("catégorie=vêtements prix<50", lambda row: row["category"] == "Vêtements" and float(row["price"]) < 50),
+    ("nom^=pull OR quantité IN (0, 6)", lambda row: row["name"].startswith("Pull") or row["quantity"] in ("0", "6")),
+    ("NOT (category=Maison OR category=Sport) valeur>=300",
+     lambda row: row["category"] in ("Vêtements", "Jardin") and float(row["price"]) * int(row["quantity"]) >= 300),
+    ("name~'ll 1' price>=10 price<=20.5", lambda row: "ll 1" in row["name"].lower() and 10 <= float(row["price"]) <= 20.5),
+    ("category>=M category!=Sport", lambda row: row["category"].lower() >= "m" and row["category"] != "Sport"),
+])
+def test_filter_matches_brute_force(inventory, expression, test):
+    """Teste que le filtre compilé (avec et sans index) donne le même résultat qu'une évaluation directe."""
+    expected = brute_force(inventory, test)
+    compiled = filters.Filter(expression, inventory, allowed=())
+    assert [row_id for row_id in range(len(inventory)) if compiled.predicate(row_id)] == expected
+
+    commerce = Commerce()
+    commerce.data = inventory
+    assert commerce.find(None, where=expression) == expected
+
+
+def test_filter_reorders_and_pushes_down(inventory):
+    """Teste le report vers les index et l'ordre des conditions (la plus sélective et la moins coûteuse d'abord)."""
+    compiled = filters.Filter("nom~produit catégorie=Sport prix<=30", inventory, InventoryIndexes(inventory))
+    assert compiled.pushdown == {"query": "produit", "category": "Sport", "price_range": (float("-inf"), 30.0)}
+    assert compiled.source == "numbers0[i] <= number1"  # Seule la condition exacte sur le prix reste à vérifier
+
+    compiled = filters.Filter("nom~produit quantité=3 catégorie!=Sport", inventory, allowed=())
+    assert compiled.pushdown == {}
+    # La condition sur la catégorie (test d'appartenance d'un code) passe avant la recherche de sous-chaîne
+    assert compiled.source.index("codes") < compiled.source.index(".lower()")
+
+
+def test_filter_errors(inventory):
+    """Teste les erreurs de compilation : colonne inconnue, valeur non numérique, opérateur inadapté."""
+    for expression in ("sku=1", "prix<beaucoup", "prix~5"):
+        with pytest.raises(ValueError):
+            filters.Filter(expression, inventory)
+
+
+def test_search_data_readme_example(tmp_path, capsys, monkeypatch):
+    """Teste l'exemple du README : `--query` accepte une expression de filtre."""
+    monkeypatch.setattr(CSVManager, "OUTPUT_DIR", str(tmp_path / "output"))
+    file_path = tmp_path / "inventaire.csv"
+    file_path.write_text(
+        "name,category,price,quantity\n"
+        "Pull,Vêtements,45.0,3\nManteau,Vêtements,120.0,1\nLampe,Maison,30.0,2\n",
+        encoding="utf-8",
+    )
+    Commerce().search_data(str(file_path), "catégorie=Vêtements prix<50", output_format="csv")
+    assert capsys.readouterr().out.splitlines()[1:] == ["Pull,Vêtements,45.0,3"]
+
+    with pytest.raises(DataProcessingError, match="Filtre invalide"):
+        Commerce().search_data(str(file_path), None, where="prix<")
@@ -0,0 +1,54 @@
+import io
+import json
+import pytest
+from module_perso.formats import ResultWriter
+
+ROWS = [
+    {"name": "Apple", "category": "Fruit", "price": "0.5"},
+    {"name": "Pomme, rouge", "category": "Fruit", "price": "1.2"},
+]
+
+
+def write(output_format, rows=ROWS, **kwargs):
+    stream = io.StringIO()
+    with ResultWriter(["name", "category", "price"], output_format, stream, **kwargs) as writer:
+        for row in rows:
+            writer.write(row)
+    return stream.getvalue(), writer.count
+
+
+def test_text_format_matches_print():
+    """Teste que le format text reproduit l'affichage historique des dictionnaires."""
+    output, count = write("text")
+    assert output.splitlines() == [str(row) for row in ROWS]
+    assert count == 2
+
+
+def test_csv_and_tsv_formats():
+    """Teste les formats csv et tsv (en-tête puis une ligne par résultat)."""
+    output, _ = write("csv")
+    assert output.splitlines() == ["name,category,price", "Apple,Fruit,0.5", '"Pomme, rouge",Fruit,1.2']
+    output, _ = write("tsv")
+    assert output.splitlines()[2] == "Pomme, rouge\tFruit\t1.2"
+
+
+def test_jsonl_format():
+    """Teste le format jsonl (un objet JSON par ligne)."""
+    output, _ = write("jsonl")
+    assert [json.loads(line) for line in output.splitlines()] == ROWS
+
+
+def test_writer_flushes_by_blocks():
+    """Teste que le tampon est vidé dans le flux dès qu'il dépasse sa taille."""
+    stream = io.StringIO()
+    writer = ResultWriter(["name"], "text", stream, buffer_size=100)
+    writer.write(ROWS[0])
+    assert stream.getvalue() == ""
+    writer.write(ROWS[1])
+    assert stream.getvalue().count("\n") == 2
+
+
+def test_unknown_format():
+    """Teste le rejet d'un format inconnu."""
+    with pytest.raises(ValueError, match="Format de sortie inconnu"):
+        ResultWriter(["name"], "xml")
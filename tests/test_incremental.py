@@ -0,0 +1,96 @@
+import csv
+import os
+import pytest
+from module_perso.csv_manager import DataProcessingError
+from module_perso.incremental import ReportCache
+from module_perso.schema import Quarantine
+
+HEADER = "name,category,price,quantity\n"
+
+
+@pytest.fixture
+def feed(tmp_path):
+    """Fichier CSV alimenté en ajout seul."""
+    file_path = tmp_path / "feed.csv"
+    file_path.write_text(HEADER + "Product A,Category 1,10.0,5\nProduct B,Category 2,20.0,3\n", encoding="utf-8")
+    return file_path
+
+
+def append(file_path, text):
+    with open(file_path, "a", encoding="utf-8") as file:
+        file.write(text)
+
+
+def test_report_cache_full_then_incremental(tmp_path, feed):
+    """Teste qu'une seconde exécution n'analyse que les lignes ajoutées."""
+    cache = ReportCache(str(feed), "category", str(tmp_path))
+    totals = cache.aggregate().total()
+    assert totals["count"] == 2
+    assert os.path.exists(cache.cache_path)
+
+    append(feed, "Product C,Category 1,1.0,10\nProduct D,Cat")  # Dernière ligne incomplète
+    results = cache.aggregate().results()
+    assert results["Category 1"]["count"] == 2
+    assert sum(stats["count"] for stats in results.values()) == 3
+
+    append(feed, "egory 2,2.0,1\n")
+    totals = ReportCache(str(feed), "category", str(tmp_path)).aggregate().total()
+    assert totals["count"] == 4
+    assert totals["quantity"]["sum"] == 19
+    assert totals["value"]["sum"] == pytest.approx(50 + 60 + 10 + 2)
+
+
+def test_report_cache_rebuild_after_rewrite(tmp_path, feed):
+    """Teste la reconstruction complète quand le fichier a été réécrit."""
+    cache = ReportCache(str(feed), None, str(tmp_path))
+    assert cache.aggregate().total()["count"] == 2
+
+    feed.write_text(HEADER + "Product Z,Category 3,1.0,1\n", encoding="utf-8")
+    totals = cache.aggregate().total()
+    assert totals["count"] == 1
+    assert totals["quantity"]["sum"] == 1
+
+
+def test_report_cache_invalid_row(tmp_path, feed):
+    """Teste qu'une ligne invalide est signalée avec son numéro de ligne physique dans le fichier."""
+    cache = ReportCache(str(feed), None, str(tmp_path))
+    cache.aggregate()
+    append(feed, '"Product\nC",Category 1,1.0,1\n\nProduct D,Category 1,abc,1\n')
+    with pytest.raises(DataProcessingError, match="Ligne 7 invalide"):
+        cache.aggregate()
+
+
+def test_report_cache_quarantine(tmp_path, feed):
+    """Teste que les lignes ajoutées invalides vont en quarantaine, comme avec l'analyse complète."""
+    ReportCache(str(feed), None, str(tmp_path)).aggregate()
+    append(feed, "Product C,Category 1,abc,1\nProduct D,Category 2,2.0,1\n")
+    quarantine = Quarantine(str(tmp_path / "rejets.csv"))
+    totals = ReportCache(str(feed), None, str(tmp_path), quarantine).aggregate().total()
+    quarantine.close()
+    assert totals["count"] == 3
+    with open(quarantine.path, encoding="utf-8", newline="") as file:
+        assert [row[:2] for row in csv.reader(file)][1:] == [[os.path.abspath(feed), "4"]]
+
+    # L'état n'a pas été enregistré : la ligne est signalée de nouveau à l'exécution suivante
+    with pytest.raises(DataProcessingError, match="Ligne 4 invalide"):
+        ReportCache(str(feed), None, str(tmp_path)).aggregate()
+
+
+def test_report_cache_skips_incomplete_multiline_record(tmp_path, feed):
+    """Teste qu'un enregistrement multiligne en cours d'ajout n'est pas analysé à moitié."""
+    cache = ReportCache(str(feed), None, str(tmp_path))
+    append(feed, 'Product C,"Category\n')  # Champ entre guillemets pas encore refermé
+    assert cache.aggregate().total()["count"] == 2
+
+    append(feed, '1",1.0,10\n')
+    totals = cache.aggregate().total()
+    assert totals["count"] == 3
+    assert totals["quantity"]["sum"] == 18
+
+
+def test_report_cache_header_only(tmp_path):
+    """Teste qu'un fichier sans données est refusé, comme par l'analyse complète."""
+    file_path = tmp_path / "empty.csv"
+    file_path.write_text(HEADER, encoding="utf-8")
+    with pytest.raises(ValueError, match="vide"):
+        ReportCache(str(file_path), None, str(tmp_path)).aggregate()
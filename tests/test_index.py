@@ -0,0 +1,89 @@
+import os
+import pickle
+import pytest
+from module_perso.index import CategoryIndex, InventoryIndexes, PriceIndex, TrigramIndex, sidecar_path, trigrams
+from module_perso.inventory import Inventory
+
+
+@pytest.fixture
+def names():
+    return ["Apple Juice", "Pineapple", "Banana", "Grape", "apple pie"]
+
+
+def test_trigrams():
+    """Teste le découpage en trigrammes."""
+    assert trigrams("abcd") == {"abc", "bcd"}
+    assert trigrams("ab") == set()
+
+
+def test_trigram_search(names):
+    """Teste la recherche par sous-chaîne insensible à la casse."""
+    index = TrigramIndex(names)
+    assert index.search("APPLE") == [0, 1, 4]
+    assert index.search("nan") == [2]
+    assert index.search("xyz") == []
+    # Requête plus courte qu'un trigramme : toutes les lignes sont candidates
+    assert index.search("pl") == [0, 1, 4]
+
+
+def test_trigram_sidecar_reused_and_invalidated(tmp_path, names):
+    """Teste que l'index annexe est réutilisé puis invalidé quand le fichier change."""
+    fingerprint = (str(tmp_path / "products.csv"), 100, 1)
+    TrigramIndex.load_or_build(fingerprint, names, str(tmp_path))
+    path = sidecar_path(fingerprint, TrigramIndex.SUFFIX, str(tmp_path))
+    assert os.path.exists(path)
+
+    reused = TrigramIndex.load(path, fingerprint, names)
+    assert reused is not None and reused.search("apple") == [0, 1, 4]
+    with open(path, "rb") as file:
+        assert "names" not in pickle.load(file)  # Les noms ne sont pas dupliqués dans le fichier annexe
+
+    changed = (fingerprint[0], 120, 2)
+    rebuilt = TrigramIndex.load_or_build(changed, ["autre"], str(tmp_path))
+    assert rebuilt.search("apple") == []
+    assert rebuilt.search("autre") == [0]
+
+
+@pytest.fixture
+def inventory():
+    """Inventaire d'exemple de 200 lignes réparties sur 4 catégories."""
+    rows = [
+        {"name": f"Item {i}", "category": f"Cat {i % 4}", "price": str(float(i % 50)), "quantity": "1"}
+        for i in range(200)
+    ]
+    return Inventory.from_rows(rows)
+
+
+def test_category_index(inventory):
+    """Teste l'index de hachage des catégories."""
+    index = CategoryIndex(inventory.column("category"))
+    assert list(index.lookup("CAT 1")) == list(range(1, 200, 4))
+    assert len(index.lookup("inconnue")) == 0
+
+
+def test_price_index(inventory):
+    """Teste l'index trié des prix et sa recherche dichotomique."""
+    index = PriceIndex(inventory.column("price"))
+    assert index.count(10, 12) == 12
+    assert sorted(index.range(10, 12)) == [i for i in range(200) if 10 <= i % 50 <= 12]
+    assert index.count(100, 200) == 0
+
+
+def test_planner_starts_with_most_selective(inventory):
+    """Teste que le planificateur commence par le filtre le plus sélectif."""
+    indexes = InventoryIndexes(inventory)
+    steps = indexes.plan(query="Item 1", category="Cat 2", price_range=(10.0, 12.0))
+    assert [estimate for _, estimate in steps] == sorted(estimate for _, estimate in steps)
+    assert steps[0][0] == "category"
+
+
+def test_indexed_search_matches_scan(inventory):
+    """Teste que la recherche indexée donne le même résultat qu'un parcours complet."""
+    indexes = InventoryIndexes(inventory)
+    indexes.prices  # Index chaud
+    expected = [
+        i for i in range(200)
+        if "item 1" in f"item {i}" and i % 4 == 2 and 10 <= i % 50 <= 20
+    ]
+    assert indexes.search("Item 1", "cat 2", (10.0, 20.0)) == expected
+    assert indexes.search(None, None, (10.0, 20.0)) == [i for i in range(200) if 10 <= i % 50 <= 20]
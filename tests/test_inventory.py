@@ -0,0 +1,86 @@
+import pytest
+from array import array
+from module_perso.csv_manager import Commerce, CSVManager, DataProcessingError
+from module_perso.inventory import Inventory, DictionaryColumn
+
+
+@pytest.fixture
+def sample_rows():
+    """Lignes d'exemple telles que produites par `csv.DictReader`."""
+    return [
+        {"name": "Product A", "category": "Category 1", "price": "10.5", "quantity": "5"},
+        {"name": "Product B", "category": "Category 2", "price": "20.0", "quantity": "3"},
+        {"name": "Product C", "category": "Category 1", "price": "1.0", "quantity": "10"},
+    ]
+
+
+def test_inventory_typed_columns(sample_rows):
+    """Teste que les colonnes numériques sont converties une seule fois dans des tableaux typés."""
+    inventory = Inventory.from_rows(sample_rows)
+    assert len(inventory) == 3
+    assert isinstance(inventory.column("price"), array)
+    assert inventory.column("price").typecode == "d"
+    assert inventory.column("quantity").typecode == "q"
+    assert list(inventory.column("quantity")) == [5, 3, 10]
+
+
+def test_inventory_dictionary_encoding(sample_rows):
+    """Teste l'encodage par dictionnaire de la colonne catégorie."""
+    categories = Inventory.from_rows(sample_rows).column("category")
+    assert isinstance(categories, DictionaryColumn)
+    assert categories.values == ["Category 1", "Category 2"]
+    assert list(categories.codes) == [0, 1, 0]
+    assert categories[2] == "Category 1"
+    assert categories.codes_matching("category 1") == {0}
+
+
+def test_inventory_totals_and_rows(sample_rows):
+    """Teste les totaux et la reconstruction des lignes."""
+    inventory = Inventory.from_rows(sample_rows)
+    assert inventory.total_quantity() == 18
+    assert inventory.total_value() == pytest.approx(10.5 * 5 + 20.0 * 3 + 1.0 * 10)
+    assert inventory.row(0) == sample_rows[0]
+    assert list(inventory.rows([1])) == [sample_rows[1]]
+
+
+def test_inventory_invalid_value(sample_rows):
+    """Teste qu'une valeur numérique invalide est signalée avec son numéro de ligne."""
+    sample_rows[1]["price"] = "abc"
+    with pytest.raises(ValueError, match="ligne 3"):
+        Inventory.from_rows(sample_rows)
+
+
+def test_commerce_data_accepts_list(sample_rows):
+    """Teste que `Commerce.data` convertit une liste de dictionnaires en inventaire."""
+    commerce = Commerce()
+    commerce.data = sample_rows
+    assert isinstance(commerce.data, Inventory)
+    assert len(commerce.data) == 3
+    with pytest.raises(ValueError):
+        commerce.data = "invalide"
+
+
+def test_commerce_load_invalid_file(tmp_path):
+    """Teste qu'un fichier contenant une quantité invalide lève une erreur de traitement."""
+    file_path = tmp_path / "invalid.csv"
+    file_path.write_text("name,category,price,quantity\nProduct A,Category 1,1.0,beaucoup\n", encoding="utf-8")
+    with pytest.raises(DataProcessingError):
+        Commerce().load(str(file_path))
+
+
+def test_inventory_keeps_original_numeric_text(tmp_path, capsys, monkeypatch):
+    """Teste que les nombres non canoniques (« 10.50 », « 20 », « 05 ») sont restitués tels quels."""
+    row = {"name": "Pomme", "category": "Fruits", "price": "10.50", "quantity": "05"}
+    inventory = Inventory.from_rows([row, {**row, "price": "20", "quantity": "3"}])
+    assert list(inventory.column("price")) == [10.5, 20.0]
+    assert [(row["price"], row["quantity"]) for row in inventory.rows()] == [("10.50", "05"), ("20", "3")]
+
+    monkeypatch.setattr(CSVManager, "OUTPUT_DIR", str(tmp_path / "output"))
+    file_path = tmp_path / "inv.csv"
+    file_path.write_text("name,category,price,quantity\nPomme,Fruits,10.50,05\nPomme verte,Fruits,20,3\n", encoding="utf-8")
+    Commerce().search_data(str(file_path), "Pomme", output_format="csv")
+    assert capsys.readouterr().out.splitlines()[1:] == ["Pomme,Fruits,10.50,05", "Pomme verte,Fruits,20,3"]
+
+    Commerce().generate_report(str(file_path), "report.txt", summary=True)
+    report = (tmp_path / "output" / "report" / "report.txt").read_text(encoding="utf-8")
+    assert "Prix : 10.50€, Quantité : 05" in report
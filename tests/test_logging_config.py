@@ -0,0 +1,84 @@
+import logging
+import logging.handlers
+import pytest
+from module_perso import logging_config
+from module_perso.logging_config import PER_ROW, SamplingFilter, configure_logging, stop_listener
+
+
+@pytest.fixture
+def restore_logging():
+    """Restaure la configuration du logger racine après le test."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    for handler in root.handlers:
+        handler.close()
+    root.handlers, root.level = handlers, level
+
+
+def make_record(msg="Résultat trouvé : %s", sampled=True):
+    record = logging.LogRecord("test", logging.DEBUG, __file__, 1, msg, ("x",), None)
+    if sampled:
+        record.sampled = True
+    return record
+
+
+def test_sampling_filter_keeps_one_in_n():
+    """Teste qu'un seul message par ligne sur N est conservé."""
+    sampling = SamplingFilter(every=3)
+    kept = [sampling.filter(make_record()) for _ in range(9)]
+    assert kept == [True, False, False] * 3
+
+
+def test_sampling_filter_ignores_unmarked_records():
+    """Teste que les messages non marqués ne sont jamais échantillonnés."""
+    sampling = SamplingFilter(every=100, per_second=1)
+    assert all(sampling.filter(make_record(sampled=False)) for _ in range(10))
+
+
+def test_sampling_filter_rate_limit():
+    """Teste la limite de messages par seconde."""
+    sampling = SamplingFilter(per_second=2)
+    kept = [sampling.filter(make_record()) for _ in range(5)]
+    assert kept.count(True) in (2, 4)  # 4 si la seconde a changé entre deux messages
+
+
+def test_sampling_decision_is_shared_between_handlers():
+    """Teste que la décision est mémorisée sur l'enregistrement."""
+    sampling = SamplingFilter(every=2)
+    record = make_record()
+    assert sampling.filter(record) and sampling.filter(record)
+    record = make_record()
+    assert not sampling.filter(record) and not sampling.filter(record)
+
+
+def test_configure_logging_async(tmp_path, monkeypatch, restore_logging):
+    """Teste la journalisation asynchrone : les messages sont écrits par le thread d'écoute."""
+    log_file = tmp_path / "logs" / "application.log"
+    monkeypatch.setattr(logging_config, "LOG_FILE", str(log_file))
+
+    listener = configure_logging("INFO", async_logging=True, sample_every=2)
+    try:
+        root = logging.getLogger()
+        assert isinstance(root.handlers[0], logging.handlers.QueueHandler)
+        assert root.level == logging.INFO
+
+        logger = logging.getLogger("test_async")
+        for index in range(4):
+            logger.info("Ligne %s", index, extra=PER_ROW)
+        logger.info("Fin du traitement")
+    finally:
+        stop_listener()
+    assert logging_config._listener is None and listener is not None
+
+    content = log_file.read_text(encoding="utf-8")
+    assert "Ligne 0" in content and "Ligne 2" in content
+    assert "Ligne 1" not in content and "Ligne 3" not in content
+    assert "Fin du traitement" in content
+
+
+def test_configure_logging_sync(tmp_path, monkeypatch, restore_logging):
+    """Teste la configuration synchrone par défaut."""
+    monkeypatch.setattr(logging_config, "LOG_FILE", str(tmp_path / "logs" / "application.log"))
+    assert configure_logging() is None
+    assert not any(isinstance(h, logging.handlers.QueueHandler) for h in logging.getLogger().handlers)
@@ -2,6 +2,8 @@ import pytest
 from unittest.mock import patch, MagicMock
 from main import main
 from module_perso.csv_manager import CSVError
+from module_perso.metrics import metrics
+import json
 import sys
 
 
@@ -15,6 +17,16 @@ def test_main_no_command(capsys):
         assert "usage:" in captured.out
 
 
+def test_main_help_does_not_configure_logging(capsys):
+    """Teste que --help n'initialise pas la journalisation (aucun accès au disque)."""
+    with patch("main.configure_logging") as configure:
+        with patch.object(sys, 'argv', ["main.py", "--help"]):
+            with pytest.raises(SystemExit):
+                main()
+    configure.assert_not_called()
+    assert "usage:" in capsys.readouterr().out
+
+
 def test_main_consolidate_success():
     """Teste la commande consolidate avec des fichiers valides."""
     test_args = ["main.py", "consolidate", "--files", "file1.csv", "file2.csv", "--output", "output.csv"]
@@ -24,7 +36,41 @@ def test_main_consolidate_success():
         with patch.object(sys, 'argv', test_args):
             main()
 
-    mock_commerce.consolidate_files.assert_called_once_with(["file1.csv", "file2.csv"], "output.csv")
+    mock_commerce.consolidate_files.assert_called_once_with(
+        ["file1.csv", "file2.csv"], "output.csv", jobs=1, key=None, policy="sum", memory_limit=None, sort_by=None,
+        compress_level=None, incremental=False,
+    )
+
+
+def test_main_consolidate_with_jobs():
+    """Teste la commande consolidate avec un pool de processus."""
+    test_args = ["main.py", "consolidate", "--files", "file1.csv", "file2.csv", "--output", "output.csv", "--jobs", "4"]
+
+    mock_commerce = MagicMock()
+    with patch("main.Commerce", return_value=mock_commerce):
+        with patch.object(sys, 'argv', test_args):
+            main()
+
+    mock_commerce.consolidate_files.assert_called_once_with(
+        ["file1.csv", "file2.csv"], "output.csv", jobs=4, key=None, policy="sum", memory_limit=None, sort_by=None,
+        compress_level=None, incremental=False,
+    )
+
+
+def test_main_consolidate_input():
+    """Teste la commande consolidate sur un répertoire, en mode incrémental."""
+    test_args = ["main.py", "consolidate", "--input", "fournisseurs/*.csv", "--incremental"]
+
+    mock_commerce = MagicMock()
+    with patch("main.Commerce", return_value=mock_commerce):
+        with patch.object(sys, 'argv', test_args):
+            main()
+
+    mock_commerce.consolidate_input.assert_called_once_with(
+        "fournisseurs/*.csv", "consolidated.csv", jobs=1, key=None, policy="sum", memory_limit=None, sort_by=None,
+        compress_level=None, incremental=True,
+    )
+    mock_commerce.consolidate_files.assert_not_called()
 
 
 def test_main_search_success():
@@ -36,7 +82,25 @@ def test_main_search_success():
         with patch.object(sys, 'argv', test_args):
             main()
 
-    mock_commerce.search_data.assert_called_once_with("file.csv", "Product", None, None)
+    mock_commerce.search_data.assert_called_once_with(
+        "file.csv", "Product", None, None, jobs=1, output_format="text", limit=None,
+        sort_by=None, descending=False, top=None, offset=0, where=None,
+    )
+
+
+def test_main_search_files():
+    """Teste la commande search sur plusieurs fichiers."""
+    test_args = ["main.py", "search", "--files", "a.csv", "magasins/*.csv", "--query", "Product", "--format", "csv"]
+
+    mock_commerce = MagicMock()
+    with patch("main.Commerce", return_value=mock_commerce):
+        with patch.object(sys, 'argv', test_args):
+            main()
+
+    mock_commerce.search_files.assert_called_once_with(
+        ["a.csv", "magasins/*.csv"], "Product", None, None, jobs=None, output_format="csv", limit=None,
+        sort_by=None, descending=False, top=None, offset=0, where=None,
+    )
 
 
 def test_main_search_with_filters():
@@ -58,7 +122,26 @@ def test_main_search_with_filters():
         with patch.object(sys, 'argv', test_args):
             main()
 
-    mock_commerce.search_data.assert_called_once_with("file.csv", "Product", "Category1", "10,50")
+    mock_commerce.search_data.assert_called_once_with(
+        "file.csv", "Product", "Category1", "10,50", jobs=1, output_format="text", limit=None,
+        sort_by=None, descending=False, top=None, offset=0, where=None,
+    )
+
+
+def test_main_search_queries_file():
+    """Teste la commande search avec un fichier de requêtes."""
+    test_args = ["main.py", "search", "--file", "file.csv", "--queries-file", "queries.txt"]
+
+    mock_commerce = MagicMock()
+    with patch("main.Commerce", return_value=mock_commerce):
+        with patch.object(sys, 'argv', test_args):
+            main()
+
+    mock_commerce.search_batch.assert_called_once_with(
+        "file.csv", "queries.txt", None, None, jobs=1, output_format="text", limit=None,
+        sort_by=None, descending=False, top=None, offset=0,
+    )
+    mock_commerce.search_data.assert_not_called()
 
 
 def test_main_report_success():
@@ -70,7 +153,7 @@ def test_main_report_success():
         with patch.object(sys, 'argv', test_args):
             main()
 
-    mock_commerce.generate_report.assert_called_once_with("file.csv", "report.txt", False)
+    mock_commerce.generate_report.assert_called_once_with("file.csv", "report.txt", False, group_by=None, jobs=1, incremental=False)
 
 
 def test_main_report_with_summary():
@@ -82,7 +165,32 @@ def test_main_report_with_summary():
         with patch.object(sys, 'argv', test_args):
             main()
 
-    mock_commerce.generate_report.assert_called_once_with("file.csv", "report.txt", True)
+    mock_commerce.generate_report.assert_called_once_with("file.csv", "report.txt", True, group_by=None, jobs=1, incremental=False)
+
+
+def test_main_report_group_by():
+    """Teste la commande report avec un regroupement par catégorie."""
+    test_args = ["main.py", "report", "--file", "file.csv", "--group-by", "category", "--jobs", "2"]
+
+    mock_commerce = MagicMock()
+    with patch("main.Commerce", return_value=mock_commerce):
+        with patch.object(sys, 'argv', test_args):
+            main()
+
+    mock_commerce.generate_report.assert_called_once_with("file.csv", "report.txt", False, group_by="category", jobs=2, incremental=False)
+
+
+def test_main_serve():
+    """Teste la commande serve sur un socket Unix."""
+    test_args = ["main.py", "serve", "--files", "file1.csv", "file2.csv", "--socket", "/tmp/inventaire.sock"]
+
+    mock_server = MagicMock()
+    with patch("module_perso.server.InventoryServer", return_value=mock_server) as server_class:
+        with patch.object(sys, 'argv', test_args):
+            main()
+
+    server_class.assert_called_once_with(["file1.csv", "file2.csv"], use_cache=False)
+    mock_server.run.assert_called_once_with("/tmp/inventaire.sock")
 
 
 def test_main_csv_error(capsys):
@@ -98,6 +206,7 @@ def test_main_csv_error(capsys):
 
     captured = capsys.readouterr()
     assert "Erreur : Erreur simulée" in captured.err
+    mock_commerce.close.assert_called_once_with()  # Le fichier de quarantaine est fermé même après une erreur
 
 
 def test_main_unexpected_error(capsys):
@@ -113,3 +222,18 @@ def test_main_unexpected_error(capsys):
 
     captured = capsys.readouterr()
     assert "Erreur imprévue : Erreur inattendue" in captured.err
+
+
+def test_main_metrics_file(tmp_path):
+    """Teste l'enregistrement des mesures avec --metrics-file."""
+    metrics_file = tmp_path / "metrics.json"
+    test_args = ["main.py", "--metrics-file", str(metrics_file), "report", "--file", "file.csv"]
+
+    try:
+        with patch("main.Commerce", return_value=MagicMock()):
+            with patch.object(sys, 'argv', test_args):
+                main()
+    finally:
+        metrics.reset()
+
+    assert set(json.loads(metrics_file.read_text(encoding="utf-8"))) == {"wall_s", "stages_s", "counters"}
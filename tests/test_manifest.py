@@ -0,0 +1,76 @@
+import csv
+import gzip
+import os
+import pytest
+from module_perso.csv_manager import Commerce, CSVManager, CSV_FileNotFoundError, DataProcessingError
+from module_perso.manifest import Manifest, scan
+
+HEADER = "name,category,price,quantity\n"
+
+
+@pytest.fixture
+def drop(tmp_path, monkeypatch):
+    """Répertoire de dépôt contenant deux fichiers, et répertoire de sortie isolé."""
+    monkeypatch.setattr(CSVManager, "OUTPUT_DIR", str(tmp_path / "output"))
+    folder = tmp_path / "drop"
+    folder.mkdir()
+    for index in range(2):
+        (folder / f"store{index}.csv").write_text(HEADER + f"Product {index},Category 1,1.0,{index}\n", encoding="utf-8")
+    (folder / "notes.txt").write_text("ignoré", encoding="utf-8")
+    return folder
+
+
+def consolidated(tmp_path):
+    with open(tmp_path / "output" / "consolidated.csv", encoding="utf-8", newline="") as file:
+        return [row["name"] for row in csv.DictReader(file)]
+
+
+def test_scan_directory_and_glob(drop):
+    """Teste le parcours d'un répertoire (fichiers CSV seulement) et d'un motif glob."""
+    with gzip.open(drop / "store2.csv.gz", "wt", encoding="utf-8") as file:
+        file.write(HEADER)
+    (drop / ".tmp-123-store3.csv").write_text(HEADER, encoding="utf-8")  # Laissé par un processus interrompu
+    assert [os.path.basename(path) for path in scan(str(drop))] == ["store0.csv", "store1.csv", "store2.csv.gz"]
+    assert [os.path.basename(path) for path in scan(str(drop / "*1.csv"))] == ["store1.csv"]
+    assert [os.path.basename(path) for path in scan(str(drop / "*store*.csv"))] == ["store0.csv", "store1.csv"]
+    with pytest.raises(FileNotFoundError):
+        scan(str(drop / "absent" / "*.csv"))
+
+
+def test_consolidate_input_appends_new_files(drop, tmp_path):
+    """Teste qu'une nouvelle consolidation n'ajoute que les nouveaux fichiers."""
+    commerce = Commerce()
+    commerce.consolidate_input(str(drop), "consolidated.csv", incremental=True)
+    assert consolidated(tmp_path) == ["Product 0", "Product 1"]
+
+    (drop / "store2.csv").write_text(HEADER + "Product 2,Category 2,2.0,2\n", encoding="utf-8")
+    os.utime(drop / "store0.csv")  # Date modifiée, contenu identique : pas de reconstruction
+    commerce.consolidate_input(str(drop), "consolidated.csv", incremental=True)
+    assert consolidated(tmp_path) == ["Product 0", "Product 1", "Product 2"]
+
+    manifest = Manifest(str(tmp_path / "output" / "consolidated.csv")).load()
+    assert len(manifest.files) == 3
+    # Aucun nouveau fichier : le fichier consolidé n'est pas réécrit
+    commerce.consolidate_input(str(drop), "consolidated.csv", incremental=True)
+    assert consolidated(tmp_path) == ["Product 0", "Product 1", "Product 2"]
+
+
+def test_consolidate_input_rebuilds_on_change(drop, tmp_path):
+    """Teste qu'un fichier modifié ou supprimé entraîne une reconstruction complète."""
+    commerce = Commerce()
+    commerce.consolidate_input(str(drop), "consolidated.csv", incremental=True)
+    (drop / "store0.csv").write_text(HEADER + "Product 0 bis,Category 1,1.0,0\n", encoding="utf-8")
+    commerce.consolidate_input(str(drop), "consolidated.csv", incremental=True)
+    assert consolidated(tmp_path) == ["Product 0 bis", "Product 1"]
+
+    os.remove(drop / "store1.csv")
+    commerce.consolidate_input(str(drop), "consolidated.csv", incremental=True)
+    assert consolidated(tmp_path) == ["Product 0 bis"]
+
+
+def test_consolidate_input_errors(drop):
+    """Teste les erreurs : répertoire introuvable, mode incrémental avec tri."""
+    with pytest.raises(CSV_FileNotFoundError):
+        Commerce().consolidate_input(str(drop / "absent"), "consolidated.csv")
+    with pytest.raises(DataProcessingError, match="incompatible"):
+        Commerce().consolidate_input(str(drop), "consolidated.csv", incremental=True, sort_by="name")
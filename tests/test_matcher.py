@@ -0,0 +1,18 @@
+from module_perso.matcher import AhoCorasick
+
+
+def test_aho_corasick_multiple_patterns():
+    """Teste la détection simultanée de plusieurs motifs, y compris imbriqués."""
+    matcher = AhoCorasick(["he", "She", "his", "hers"])
+    assert matcher.find("ushers") == {0, 1, 3}
+    assert matcher.find("this") == {2}
+    assert matcher.find("xyz") == set()
+
+
+def test_aho_corasick_matches_substring_semantics():
+    """Teste que le résultat équivaut à `motif in texte` pour chaque motif."""
+    patterns = ["apple", "app", "pie", "le p", "e"]
+    matcher = AhoCorasick(patterns)
+    for text in ["apple pie", "pineapple", "grape", "banana", ""]:
+        expected = {i for i, pattern in enumerate(patterns) if pattern in text}
+        assert matcher.find(text) == expected
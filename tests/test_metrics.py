@@ -0,0 +1,75 @@
+import io
+import json
+import pstats
+import time
+import pytest
+from module_perso.csv_manager import Commerce, CSVManager
+from module_perso.metrics import Metrics, instrument, metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Désactive et vide les mesures globales après chaque test."""
+    yield
+    metrics.reset()
+
+
+def test_disabled_metrics_cost_nothing():
+    """Teste que les mesures désactivées laissent les itérables intacts et n'enregistrent rien."""
+    recorder = Metrics()
+    rows = iter([1, 2])
+    assert recorder.timed("parse", rows, "rows_parsed") is rows
+    with recorder.stage("write"):
+        recorder.add("rows_written", 2)
+    assert recorder.timings == {} and recorder.counters == {}
+
+
+def test_nested_stages_record_own_time():
+    """Teste que le temps d'une étape imbriquée (ou d'un itérateur chronométré) est retiré de l'étape englobante."""
+    recorder = Metrics()
+    recorder.enable()
+
+    def slow_rows():
+        for row in range(3):
+            time.sleep(0.01)
+            yield row
+
+    with recorder.stage("write"):
+        for _ in recorder.timed("parse", slow_rows(), "rows_parsed"):
+            pass
+    assert recorder.counters["rows_parsed"] == 3
+    assert recorder.timings["parse"] >= 0.03
+    assert recorder.timings["write"] < recorder.timings["parse"]
+
+
+def test_commerce_search_metrics(tmp_path, monkeypatch, capsys):
+    """Teste les compteurs et étapes relevés lors d'une recherche."""
+    monkeypatch.setattr(CSVManager, "OUTPUT_DIR", str(tmp_path / "output"))
+    file_path = tmp_path / "products.csv"
+    file_path.write_text("name,category,price,quantity\nApple,Fruit,0.5,10\nPear,Fruit,0.7,5\nLeek,Vegetable,1.0,3\n", encoding="utf-8")
+
+    metrics.enable()
+    Commerce().search_data(str(file_path), "pe", category="Fruit")
+    capsys.readouterr()
+
+    data = metrics.as_dict()
+    assert data["counters"] == {"bytes_read": file_path.stat().st_size, "rows_parsed": 3, "rows_matched": 1, "rows_written": 1}
+    assert {"resolve", "parse", "convert", "filter", "output"} <= set(data["stages_s"])
+
+
+def test_instrument_outputs(tmp_path):
+    """Teste le résumé sur la sortie d'erreur, le fichier JSON, le profil cProfile et le suivi mémoire."""
+    stream = io.StringIO()
+    metrics_file = tmp_path / "metrics.json"
+    profile = tmp_path / "run.prof"
+    with instrument(stats=True, metrics_file=str(metrics_file), profile=str(profile), trace_memory=3, stream=stream):
+        metrics.add("rows_parsed", 5)
+        with metrics.stage("parse"):
+            sorted(range(1000), reverse=True)
+
+    report = stream.getvalue()
+    assert "Statistiques d'exécution" in report and "rows_parsed" in report
+    assert "Mémoire allouée (pic)" in report
+    data = json.loads(metrics_file.read_text(encoding="utf-8"))
+    assert data["counters"]["rows_parsed"] == 5 and "parse" in data["stages_s"]
+    assert pstats.Stats(str(profile)).total_calls > 0
@@ -0,0 +1,23 @@
+import argparse
+import pytest
+from module_perso.parser import parse_size, secluded_parser
+
+
+def test_parse_size():
+    """Teste la conversion des tailles avec unité en octets."""
+    assert parse_size("1024") == 1024
+    assert parse_size("512M") == 512 * 1024 ** 2
+    assert parse_size("1.5g") == int(1.5 * 1024 ** 3)
+    assert parse_size("64KB") == 64 * 1024
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_size("beaucoup")
+
+
+def test_consolidate_key_options():
+    """Teste les options de fusion par clé de la commande consolidate."""
+    args = secluded_parser().parse_args(
+        ["consolidate", "--files", "a.csv", "--key", "name,category", "--merge-policy", "min-price", "--memory-limit", "1M"]
+    )
+    assert args.key == "name,category"
+    assert args.merge_policy == "min-price"
+    assert args.memory_limit == 1024 ** 2
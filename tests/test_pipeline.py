@@ -0,0 +1,62 @@
+import io
+import os
+import pytest
+from module_perso import pipeline
+from module_perso.csv_manager import CSVManager, DataProcessingError
+
+FIELDNAMES = ["name", "price"]
+
+
+def test_writer_thread_keeps_order():
+    """Teste que les lots sont écrits dans l'ordre, depuis le thread d'écriture."""
+    buffer = io.StringIO(newline="")
+    with pipeline.WriterThread(buffer, depth=2) as writer:
+        for start in range(0, 100, 10):
+            writer.put([[str(i), "1.0"] for i in range(start, start + 10)])
+    assert buffer.getvalue().splitlines()[::33] == ["0,1.0", "33,1.0", "66,1.0", "99,1.0"]
+
+
+def test_writer_thread_reports_errors():
+    """Teste qu'une erreur d'écriture est relancée dans le thread appelant."""
+    buffer = io.StringIO()
+    buffer.close()
+    writer = pipeline.WriterThread(buffer)
+    writer.put([["a", "1"]])
+    with pytest.raises(ValueError):
+        writer.close()
+
+
+def test_writer_thread_keeps_caller_exception():
+    """Teste que l'exception du thread appelant n'est pas remplacée par l'erreur d'écriture."""
+    buffer = io.StringIO()
+    buffer.close()
+    with pytest.raises(KeyError):
+        with pipeline.WriterThread(buffer) as writer:
+            writer.put([["a", "1"]])
+            raise KeyError("appelant")
+
+
+def test_write_csv_is_atomic(tmp_path):
+    """Teste que l'ancien fichier reste intact après une erreur et qu'aucun fichier temporaire ne subsiste."""
+    rows = [{"name": f"Product {i}", "price": "1.0"} for i in range(5000)]
+    assert CSVManager.write_csv("out.csv", rows, FIELDNAMES, output_dir=str(tmp_path)) == 5000
+    before = (tmp_path / "out.csv").read_bytes()
+
+    def failing():
+        yield from rows
+        yield {"name": "Incomplete"}
+
+    with pytest.raises(DataProcessingError, match="Colonnes manquantes"):
+        CSVManager.write_csv("out.csv", failing(), FIELDNAMES, output_dir=str(tmp_path))
+    assert (tmp_path / "out.csv").read_bytes() == before
+    assert os.listdir(tmp_path) == ["out.csv"]
+
+
+def test_write_csv_append_rolls_back(tmp_path):
+    """Teste qu'un ajout interrompu ramène le fichier à sa taille initiale."""
+    CSVManager.write_csv("out.csv", [{"name": "A", "price": "1.0"}], FIELDNAMES, output_dir=str(tmp_path))
+    before = (tmp_path / "out.csv").read_bytes()
+    rows = [{"name": "B", "price": "2.0"}] * 5000 + [{"name": "C"}]
+    with pytest.raises(DataProcessingError):
+        CSVManager.write_csv("out.csv", rows, FIELDNAMES, output_dir=str(tmp_path), append=True)
+    assert (tmp_path / "out.csv").read_bytes() == before
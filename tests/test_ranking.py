@@ -0,0 +1,54 @@
+import random
+import pytest
+from module_perso.inventory import Inventory
+from module_perso.ranking import select, sort_key
+
+
+@pytest.fixture
+def inventory():
+    rows = [
+        {"name": f"Produit {i}", "category": "C", "price": str(price), "quantity": str(quantity)}
+        for i, (price, quantity) in enumerate([(5.0, 2), (1.0, 50), (5.0, 1), (3.0, 4), (9.0, 1)])
+    ]
+    return Inventory.from_rows(rows)
+
+
+def test_select_without_key_keeps_order():
+    """Teste la pagination sans tri : l'ordre d'entrée est conservé et la lecture s'arrête à la page."""
+    consumed = []
+
+    def row_ids():
+        for row_id in range(100):
+            consumed.append(row_id)
+            yield row_id
+
+    assert list(select(row_ids(), top=3, offset=2)) == [2, 3, 4]
+    assert len(consumed) == 5
+
+
+def test_select_top_k_is_stable(inventory):
+    """Teste le top-k croissant et décroissant, les égalités étant départagées par l'identifiant."""
+    key = sort_key(inventory, "price")
+    assert list(select(range(5), key, top=3)) == [1, 3, 0]
+    assert list(select(range(5), key, descending=True, top=3)) == [4, 0, 2]
+    assert list(select(range(5), key, descending=True, top=2, offset=1)) == [0, 2]
+    assert list(select(range(5), key)) == [1, 3, 0, 2, 4]
+
+
+def test_select_value_key(inventory):
+    """Teste le tri par valeur du stock (prix × quantité)."""
+    assert list(select(range(5), sort_key(inventory, "value"), descending=True, top=2)) == [1, 3]
+
+
+def test_select_matches_full_sort():
+    """Teste que les pages du tas borné correspondent au tri complet."""
+    values = [random.randint(0, 20) for _ in range(500)]
+    expected = sorted(range(500), key=lambda row_id: (values[row_id], row_id))
+    for offset in (0, 17, 490):
+        assert list(select(range(500), values.__getitem__, top=25, offset=offset)) == expected[offset:offset + 25]
+
+
+def test_sort_key_unknown(inventory):
+    """Teste le rejet d'un critère de tri inconnu."""
+    with pytest.raises(ValueError, match="Critère de tri inconnu"):
+        sort_key(inventory, "name")
@@ -0,0 +1,145 @@
+import csv
+import pytest
+from module_perso.csv_manager import Commerce, CSVManager, DataProcessingError
+from module_perso.schema import Quarantine, Schema
+
+FIELDNAMES = ["name", "category", "price", "quantity"]
+
+
+@pytest.fixture
+def feed(tmp_path):
+    """Fichier d'inventaire contenant deux lignes invalides (lignes 3 et 5)."""
+    file_path = tmp_path / "feed.csv"
+    file_path.write_text(
+        "name,category,price,quantity\n"
+        "Product A,Category 1,10.5,5\n"
+        "Product B,Category 2,n/a,3\n"
+        "Product C,Category 1,1.0,10\n"
+        "Product D,Category 2,2.0\n",
+        encoding="utf-8",
+    )
+    return file_path
+
+
+def read_quarantine(path):
+    with open(path, encoding="utf-8", newline="") as file:
+        return list(csv.reader(file))
+
+
+def test_schema_parse_converts_once():
+    """Teste que le convertisseur compilé convertit les colonnes numériques et garde les autres."""
+    schema = Schema(FIELDNAMES)
+    assert schema.parse(["A", "Cat", "10.5", "5"]) == ["A", "Cat", 10.5, 5]
+    assert schema.check(["A", "Cat", "10.5", "5"]) == ["A", "Cat", "10.5", "5"]
+
+
+def test_schema_parse_errors():
+    """Teste que les erreurs nomment la colonne fautive ou le nombre de colonnes."""
+    schema = Schema(FIELDNAMES)
+    with pytest.raises(ValueError, match="'quantity' : 'beaucoup'"):
+        schema.parse(["A", "Cat", "10.5", "beaucoup"])
+    with pytest.raises(ValueError, match="3 colonne"):
+        schema.parse(["A", "Cat", "10.5"])
+
+
+def test_schema_rejects_out_of_range_quantity(tmp_path):
+    """Teste qu'une quantité hors de la plage 64 bits est rejetée par le schéma (et mise en quarantaine)."""
+    schema = Schema(FIELDNAMES)
+    assert schema.parse(["A", "Cat", "1", str(2 ** 63 - 1)])[3] == 2 ** 63 - 1
+    with pytest.raises(ValueError, match="'quantity' : '99999999999999999999'"):
+        schema.parse(["A", "Cat", "1", "99999999999999999999"])
+
+    file_path = tmp_path / "feed.csv"
+    file_path.write_text("name,category,price,quantity\nA,Cat,1.0,99999999999999999999\nB,Cat,2.0,3\n", encoding="utf-8")
+    with pytest.raises(DataProcessingError, match="Ligne 2"):
+        Commerce().load(str(file_path))
+    path = tmp_path / "rejets.csv"
+    commerce = Commerce(quarantine=str(path))
+    assert len(commerce.load(str(file_path))) == 1
+    commerce.close()
+    assert read_quarantine(path)[1][:2] == [str(file_path), "2"]
+
+
+def test_quarantine_records_each_line_once(tmp_path):
+    """Teste que le fichier de quarantaine n'est créé qu'au premier rejet et sans doublon."""
+    path = tmp_path / "rejets.csv"
+    quarantine = Quarantine(str(path))
+    assert not path.exists()
+    quarantine.add("feed.csv", 3, "valeur invalide", ["A", "Cat", "x", "1"])
+    quarantine.add("feed.csv", 3, "valeur invalide", ["A", "Cat", "x", "1"])
+    quarantine.close()
+    assert quarantine.count == 1
+    assert read_quarantine(path) == [Quarantine.HEADER, ["feed.csv", "3", "valeur invalide", "A", "Cat", "x", "1"]]
+
+
+def test_strict_load_names_line(feed):
+    """Teste que, sans quarantaine, la première ligne invalide interrompt le chargement avec son numéro."""
+    with pytest.raises(DataProcessingError, match="Ligne 3"):
+        Commerce().load(str(feed))
+
+
+def test_load_with_quarantine(feed, tmp_path):
+    """Teste que les lignes invalides sont mises en quarantaine et que le chargement se poursuit."""
+    path = tmp_path / "rejets.csv"
+    inventory = Commerce(quarantine=str(path)).load(str(feed))
+    assert [row["name"] for row in inventory.rows()] == ["Product A", "Product C"]
+    rows = read_quarantine(path)
+    assert [row[1] for row in rows[1:]] == ["3", "5"]
+    assert "price" in rows[1][2]
+
+
+def test_consolidate_with_quarantine(feed, tmp_path):
+    """Teste que la consolidation écrit les lignes valides et met les autres en quarantaine."""
+    output = tmp_path / "out"
+    output.mkdir()
+    path = tmp_path / "rejets.csv"
+    Commerce(quarantine=str(path)).consolidate_files([str(feed)], str(output / "consolidated.csv"), sort_by="price")
+    with open(output / "consolidated.csv", encoding="utf-8", newline="") as file:
+        assert [row["name"] for row in csv.DictReader(file)] == ["Product C", "Product A"]
+    assert len(read_quarantine(path)) == 3
+
+
+def test_write_csv_rejects_extra_columns(tmp_path):
+    """Teste qu'une colonne inattendue est signalée et que le fichier incomplet est supprimé."""
+    data = [{"name": "A", "price": "1.0"}, {"name": "B", "price": "2.0", "note": "?"}]
+    with pytest.raises(DataProcessingError, match="Colonnes inattendues"):
+        CSVManager.write_csv("out.csv", data, ["name", "price"], output_dir=str(tmp_path))
+    assert not (tmp_path / "out.csv").exists()
+
+
+def test_line_numbers_count_blank_and_multiline_lines(tmp_path):
+    """Teste que le numéro signalé est celui de la ligne physique (lignes vides et champs multilignes compris)."""
+    file_path = tmp_path / "feed.csv"
+    file_path.write_text(
+        "name,category,price,quantity\n"
+        "Product A,Category 1,10.5,5\n"
+        "\n"
+        '"Product\nB",Category 2,1.0,3\n'
+        "\n"
+        "Product C,Category 1,n/a,10\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(DataProcessingError, match="Ligne 7"):
+        Commerce().load(str(file_path))
+
+    path = tmp_path / "rejets.csv"
+    commerce = Commerce(quarantine=str(path))
+    assert len(commerce.load(str(file_path))) == 2
+    commerce.close()
+    assert read_quarantine(path)[1][1] == "7"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_search_files_with_quarantine(feed, tmp_path, capsys, monkeypatch, jobs):
+    """Teste que la recherche fédérée écarte les lignes invalides de chaque fichier dans la quarantaine."""
+    monkeypatch.setattr(CSVManager, "OUTPUT_DIR", str(tmp_path / "output"))
+    other = tmp_path / "feed2.csv"
+    other.write_text(feed.read_text(encoding="utf-8"), encoding="utf-8")
+    path = tmp_path / "rejets.csv"
+    commerce = Commerce(quarantine=str(path))
+    commerce.search_files([str(feed), str(other)], "Product", jobs=jobs, output_format="csv")
+    commerce.close()
+    assert len(capsys.readouterr().out.splitlines()) == 5
+    assert sorted((row[0], row[1]) for row in read_quarantine(path)[1:]) == [
+        (str(feed), "3"), (str(feed), "5"), (str(other), "3"), (str(other), "5"),
+    ]
@@ -0,0 +1,127 @@
+import asyncio
+import io
+import json
+import os
+import pytest
+from module_perso.csv_manager import CSVManager
+from module_perso.server import InventoryServer
+
+
+@pytest.fixture
+def sample_csv(tmp_path, monkeypatch):
+    """Crée un fichier CSV d'exemple et redirige le répertoire de sortie."""
+    monkeypatch.setattr(CSVManager, "OUTPUT_DIR", str(tmp_path / "output"))
+    file_path = tmp_path / "products.csv"
+    file_path.write_text(
+        "name,category,price,quantity\n"
+        "Product A,Category 1,10.0,5\n"
+        "Product B,Category 2,20.0,3\n",
+        encoding="utf-8",
+    )
+    return file_path
+
+
+def test_server_search_and_report(sample_csv):
+    """Teste les requêtes search et report sur un inventaire chargé une seule fois."""
+    server = InventoryServer([str(sample_csv)])
+
+    response = server.handle({"id": 1, "command": "search", "file": str(sample_csv), "query": "product", "price_range": "15,25"})
+    assert response["ok"] and response["id"] == 1
+    assert [row["name"] for row in response["results"]] == ["Product B"]
+
+    response = server.handle({"command": "report", "file": str(sample_csv), "group_by": "category"})
+    assert response["totals"]["value"]["sum"] == pytest.approx(110.0)
+    assert set(response["groups"]) == {"Category 1", "Category 2"}
+
+
+def test_server_search_pagination(sample_csv):
+    """Teste le tri et la pagination des recherches."""
+    server = InventoryServer([str(sample_csv)])
+    request = {"command": "search", "file": str(sample_csv), "query": "product", "sort_by": "price", "desc": True, "limit": 1}
+    assert [row["name"] for row in server.handle(request)["results"]] == ["Product B"]
+    request["offset"] = 1
+    assert [row["name"] for row in server.handle(request)["results"]] == ["Product A"]
+    request["sort_by"] = "inconnu"
+    assert not server.handle(request)["ok"]
+
+
+def test_server_errors(sample_csv):
+    """Teste les réponses d'erreur sans arrêt du serveur."""
+    server = InventoryServer([str(sample_csv)])
+    assert not server.handle({"command": "inconnue"})["ok"]
+    assert not server.handle({"command": "search", "file": "autre.csv", "query": "x"})["ok"]
+    assert not json.loads(server.handle_line("pas du json"))["ok"]
+
+
+def test_server_reloads_changed_file(sample_csv):
+    """Teste le rechargement automatique d'un fichier modifié sur le disque."""
+    server = InventoryServer([str(sample_csv)])
+    with open(sample_csv, "a", encoding="utf-8") as file:
+        file.write("Product C,Category 1,1.0,1\n")
+    stat = os.stat(sample_csv)
+    os.utime(sample_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    response = server.handle({"command": "search", "file": str(sample_csv), "query": "Product C"})
+    assert [row["name"] for row in response["results"]] == ["Product C"]
+
+
+def test_server_stdio(sample_csv):
+    """Teste le mode JSON par ligne sur l'entrée et la sortie standard."""
+    server = InventoryServer([str(sample_csv)])
+    stdin = io.StringIO(json.dumps({"id": 7, "command": "search", "file": str(sample_csv), "query": "A"}) + "\n")
+    stdout = io.StringIO()
+    asyncio.run(server.serve_stdio(stdin, stdout))
+    response = json.loads(stdout.getvalue())
+    assert response["id"] == 7
+    assert [row["name"] for row in response["results"]] == ["Product A"]
+
+
+def test_server_unix_socket(sample_csv, tmp_path):
+    """Teste deux clients simultanés sur le socket Unix."""
+    server = InventoryServer([str(sample_csv)])
+    socket_path = str(tmp_path / "inventaire.sock")
+
+    async def client(query):
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        writer.write((json.dumps({"command": "search", "file": str(sample_csv), "query": query}) + "\n").encode())
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        writer.close()
+        return [row["name"] for row in response["results"]]
+
+    async def scenario():
+        task = asyncio.create_task(server.serve_unix(socket_path))
+        while not os.path.exists(socket_path):
+            await asyncio.sleep(0.01)
+        results = await asyncio.gather(client("A"), client("B"))
+        task.cancel()
+        return results
+
+    assert asyncio.run(scenario()) == [["Product A"], ["Product B"]]
+
+
+@pytest.mark.parametrize("fields", [
+    {"limit": "5"}, {"offset": 1.5}, {"query": 123}, {"category": ["a"]}, {"price_range": [1]}, {"price_range": ["a", 2]},
+    {"sort_by": 1}, {"file": None},
+])
+def test_server_rejects_invalid_fields(sample_csv, fields):
+    """Teste que les champs de type incorrect produisent une réponse d'erreur, sans exception."""
+    server = InventoryServer([str(sample_csv)])
+    response = server.handle({"command": "search", "file": str(sample_csv), "query": "product", **fields})
+    assert response["ok"] is False and response["error"]
+
+
+def test_server_survives_unexpected_errors(sample_csv, monkeypatch):
+    """Teste qu'un fichier supprimé ou une erreur imprévue n'interrompt pas le serveur."""
+    server = InventoryServer([str(sample_csv)])
+    os.remove(sample_csv)
+    response = server.handle({"command": "search", "file": str(sample_csv), "query": "product"})
+    assert not response["ok"] and "introuvable" in response["error"]
+
+    monkeypatch.setattr(InventoryServer, "_get", lambda self, file_name: 1 / 0)
+    stdin = io.StringIO(json.dumps({"id": 3, "command": "report", "file": "x"}) + "\n" + json.dumps({"command": "files"}) + "\n")
+    stdout = io.StringIO()
+    asyncio.run(server.serve_stdio(stdin, stdout))
+    first, second = map(json.loads, stdout.getvalue().splitlines())
+    assert first == {"id": 3, "ok": False, "error": "Erreur inattendue : division by zero"}
+    assert second["ok"]
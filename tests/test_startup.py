@@ -0,0 +1,26 @@
+import io
+import sys
+from module_perso.startup import StartupProfiler
+
+
+def test_startup_profiler_records_imports_and_phases():
+    """Teste la mesure des imports et des étapes d'initialisation."""
+    sys.modules.pop("colorsys", None)
+    profiler = StartupProfiler()
+    profiler.start()
+    try:
+        import colorsys  # noqa: F401
+        with profiler.phase("initialisation"):
+            pass
+    finally:
+        profiler.stop()
+
+    assert "colorsys" in [name for name, _, _ in profiler.imports]
+    assert [name for name, _ in profiler.phases] == ["initialisation"]
+
+    stream = io.StringIO()
+    profiler.report(stream)
+    report = stream.getvalue()
+    assert "colorsys" in report
+    assert "étape initialisation" in report
+    assert "total" in report